@@ -8,7 +8,11 @@ import time
 import json
 import queue
 import io
-import re
+
+# Share the backend's stdout matcher, tail buffer and callback descriptions
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+from output_capture import TailBuffer, compile_activity_matcher
+from progress import describe_step, task_output_text
 
 # Import your existing CrewAI code
 from langchain_openai import ChatOpenAI
@@ -38,21 +42,30 @@ llm = ChatOpenAI(
 # Global queue for real-time updates
 update_queue = queue.Queue()
 
+# Where agent progress comes from: 'callbacks' (CrewAI step/task callbacks)
+# or 'stdout' (legacy scraping of verbose output via CrewAIOutputCapture)
+PROGRESS_SOURCE = os.getenv('PROGRESS_SOURCE', 'callbacks').lower()
+
+# Keep only the tail of captured output instead of the whole run
+MAX_CAPTURE_BUFFER = 64 * 1024
+
 class CrewAIOutputCapture:
     """Captures and parses CrewAI output to track agent progress in real-time"""
     
     def __init__(self, original_stdout, agent_names):
         self.original_stdout = original_stdout
         self.agent_names = agent_names
-        self.buffer = ""
+        self.buffer = TailBuffer(MAX_CAPTURE_BUFFER)
+        # One precompiled scan per write for all markers and agent names
+        self._matcher, self._agent_keywords = compile_activity_matcher(agent_names)
         
     def write(self, text):
         # Write to original stdout so we still see the output
         self.original_stdout.write(text)
         self.original_stdout.flush()
         
-        # Add to buffer for parsing
-        self.buffer += text
+        # Keep a bounded tail for parsing/debugging
+        self.buffer.append(text)
         
         # Parse for agent activity
         self._parse_agent_activity(text)
@@ -65,27 +78,35 @@ class CrewAIOutputCapture:
         global processing_status
         
         try:
-            # Look for agent start marker
-            if "🤖 Agent Started" in text or "Agent:" in text:
-                for i, agent_name in enumerate(self.agent_names):
-                    if agent_name in text:
-                        processing_status['current_step'] = i
-                        processing_status['current_agent'] = agent_name
-                        processing_status['current_thought'] = f"{agent_name} is working..."
-                        
-                        send_update({
-                            'current_step': i,
-                            'current_agent': agent_name,
-                            'current_thought': f"{agent_name} is working...",
-                            'agent_thoughts': processing_status['agent_thoughts'],
-                            'is_processing': True
-                        })
-                        
-                        print(f"🎯 Detected {agent_name} started working")
-                        break
+            start_seen = done_seen = False
+            agent_index = None
+            for match in self._matcher.finditer(text):
+                if match.lastgroup == 'start':
+                    start_seen = True
+                elif match.lastgroup == 'done':
+                    done_seen = True
+                elif match.lastgroup == 'agent' and agent_index is None:
+                    agent_index = self._agent_keywords[match.group()]
+            
+            # Agent start marker naming one of the agents
+            if start_seen and agent_index is not None:
+                agent_name = self.agent_names[agent_index]
+                processing_status['current_step'] = agent_index
+                processing_status['current_agent'] = agent_name
+                processing_status['current_thought'] = f"{agent_name} is working..."
+                
+                send_update({
+                    'current_step': agent_index,
+                    'current_agent': agent_name,
+                    'current_thought': f"{agent_name} is working...",
+                    'agent_thoughts': processing_status['agent_thoughts'],
+                    'is_processing': True
+                })
+                
+                print(f"🎯 Detected {agent_name} started working")
             
             # Look for agent completion marker
-            elif "✅ Agent Final Answer" in text or "Final Answer:" in text:
+            elif done_seen:
                 # Get the current agent that just completed
                 current_agent = processing_status.get('current_agent')
                 if current_agent:
@@ -128,6 +149,60 @@ def send_update(update_data):
     except Exception as e:
         print(f"Error sending update: {e}")
 
+def on_agent_step(step_output):
+    """Agent step callback: surface the agent's latest reasoning step"""
+    current_agent = processing_status.get('current_agent')
+    if not current_agent:
+        return
+    
+    thought_text = describe_step(step_output)
+    if not thought_text:
+        return
+    
+    processing_status['current_thought'] = f"{current_agent}: {thought_text}"
+    send_update({
+        'current_step': processing_status['current_step'],
+        'current_agent': current_agent,
+        'current_thought': processing_status['current_thought'],
+        'agent_thoughts': processing_status['agent_thoughts'],
+        'is_processing': True,
+        'event': 'agent_step'
+    })
+
+def on_task_complete(task_output):
+    """Task callback: record the finished agent and announce the next one"""
+    agent_names = ['Research Analyst', 'Article Writer', 'Editor', 'Social Media Strategist']
+    step = processing_status['current_step']
+    agent_name = agent_names[step] if step < len(agent_names) else None
+    if not agent_name:
+        return
+    
+    timestamp = time.strftime("%H:%M:%S")
+    processing_status['agent_thoughts'][agent_name] = f"[{timestamp}] {task_output_text(task_output)}"
+    
+    next_step = step + 1
+    if next_step < len(agent_names):
+        processing_status['current_step'] = next_step
+        processing_status['current_agent'] = agent_names[next_step]
+        processing_status['current_thought'] = f"{agent_names[next_step]} is working..."
+    else:
+        processing_status['current_thought'] = f"{agent_name} completed successfully!"
+    
+    send_update({
+        'current_step': processing_status['current_step'],
+        'current_agent': processing_status['current_agent'],
+        'current_thought': processing_status['current_thought'],
+        'agent_thoughts': processing_status['agent_thoughts'],
+        'is_processing': True,
+        'event': 'stage_completed'
+    })
+
+def progress_kwargs(name):
+    """Callback keyword for an Agent ('step_callback') or Task ('callback')"""
+    if PROGRESS_SOURCE != 'callbacks':
+        return {}
+    return {name: on_agent_step if name == 'step_callback' else on_task_complete}
+
 def process_crew_ai(topic):
     """Process the CrewAI workflow in a separate thread"""
     global processing_status
@@ -164,7 +239,8 @@ def process_crew_ai(topic):
             goal="Research a given topic deeply and provide clear findings",
             backstory="You're a seasoned researcher known for producing accurate and concise insights.",
             verbose=True,
-            llm=llm
+            llm=llm,
+            **progress_kwargs('step_callback')
         )
 
         print(f"🔧 Creating Article Writer with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'gpt-4o-mini')}")
@@ -173,7 +249,8 @@ def process_crew_ai(topic):
             goal="Write a short, compelling article based on the research",
             backstory="You're a skilled writer who turns insights into engaging prose.",
             verbose=True,
-            llm=llm
+            llm=llm,
+            **progress_kwargs('step_callback')
         )
 
         print(f"🔧 Creating Editor with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'gpt-4o-mini')}")
@@ -182,7 +259,8 @@ def process_crew_ai(topic):
             goal="Polish the article for tone, flow, and clarity",
             backstory="You're a language expert who makes content shine.",
             verbose=True,
-            llm=llm
+            llm=llm,
+            **progress_kwargs('step_callback')
         )
 
         print(f"🔧 Creating Social Media Strategist with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'gpt-4o-mini')}")
@@ -191,32 +269,37 @@ def process_crew_ai(topic):
             goal="Summarise the article into a tweet for engagement",
             backstory="You're great at distilling ideas into bite-sized, high-impact tweets.",
             verbose=True,
-            llm=llm
+            llm=llm,
+            **progress_kwargs('step_callback')
         )
 
         # Define tasks with expected outputs
         task1 = Task(
             description=f"Research the topic: {topic}",
             expected_output="A list of 3–5 key insights about the topic.",
-            agent=researcher
+            agent=researcher,
+            **progress_kwargs('callback')
         )
 
         task2 = Task(
             description="Write a 400-word article based on the research",
             expected_output="A complete article, written in natural language, based on the research insights.",
-            agent=writer
+            agent=writer,
+            **progress_kwargs('callback')
         )
 
         task3 = Task(
             description="Edit the article for tone, clarity, and structure",
             expected_output="A refined version of the article with improved tone and readability.",
-            agent=editor
+            agent=editor,
+            **progress_kwargs('callback')
         )
 
         task4 = Task(
             description="Summarise the article in a single tweet (max 280 characters)",
             expected_output="A concise, engaging tweet that captures the article's core idea.",
-            agent=tweeter
+            agent=tweeter,
+            **progress_kwargs('callback')
         )
 
         # Create the Crew
@@ -232,12 +315,12 @@ def process_crew_ai(topic):
         # Set up real-time output monitoring
         agent_names = ['Research Analyst', 'Article Writer', 'Editor', 'Social Media Strategist']
         original_stdout = sys.stdout
-        output_capture = CrewAIOutputCapture(original_stdout, agent_names)
         
         # Execute the full crew workflow with real-time monitoring
         try:
-            # Redirect stdout to capture CrewAI output
-            sys.stdout = output_capture
+            if PROGRESS_SOURCE == 'stdout':
+                # Legacy fallback: scrape CrewAI's verbose output
+                sys.stdout = CrewAIOutputCapture(original_stdout, agent_names)
             
             # Execute CrewAI
             result = crew.kickoff()
@@ -1,18 +1,42 @@
 from flask import Flask, request, jsonify, session
 from flask_cors import CORS
 from flask_session import Session
+from werkzeug.test import EnvironBuilder
 import os
 import sys
-import asyncio
-from threading import Thread
+from threading import Lock, Thread
+from contextlib import contextmanager
 import time
-import json
 import queue
-import io
-import re
 import uuid
 from datetime import datetime
 
+from scheduler import JobScheduler, QueueFullError, QUEUED, RUNNING, DONE, FAILED
+from stages import (EDITORIAL_STAGES, AGENT_NAMES, SEQUENTIAL, DAG, SPECULATIVE, PIPELINE_MODES,
+                    STANDARD, LONG_FORM, ARTICLE_MODES, task_description, prompts_fingerprint,
+                    stage_cache_key, stage_graph, stage_inputs, stage_upstream, speculative_stages,
+                    plan_stage, handoff_stage, map_reduce_step, map_reduce_stage, long_form_step, long_form_stage)
+from taskgraph import run_task_graph, run_each
+from speculation import SpeculationStats, draft_similarity, latency_saved
+from handoff import StreamedHandoff, list_items
+from research import (SINGLE, MAP_REDUCE, RESEARCH_MODES, ResearchTimings, parse_subquestions,
+                      research_concurrently, merge_input)
+from result_cache import ResultCache, result_cache_key, normalize_topic
+from singleflight import SingleFlight
+from topic_index import TopicIndex
+from progress import CrewProgressReporter, STAGE_STARTED, AGENT_STEP, TOKEN
+from output_capture import CrewAIOutputCapture
+from streaming import TokenStreamRouter
+from async_sse import AsyncSSEApp
+from broker import create_broker
+from replay import ReplayLog
+from fanout import StreamHub, StreamView
+from coalesce import UpdateCoalescer
+from notify import Mailbox, TimerWheel, HEARTBEAT, CLOSED, HEARTBEAT_COMMENT, start_wheel_thread
+from sessions import SessionRegistry, STATUS_FIELDS, OPTIONAL_FIELDS
+from session_store import SQLiteSessionInterface
+from logs import configure as configure_logging, get_logger, log_context, DEBUG
+
 # Add the parent directory to the path to import main.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -21,16 +45,23 @@ from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
 # Import CrewAI after environment setup
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task, Crew, LLM
 
 # Load environment variables
 load_dotenv()
 
+# LOG_LEVEL (default INFO) and LOG_FORMAT (text or json) may come from .env
+configure_logging()
+log = get_logger('app')
+session_log = get_logger('session')
+sse_log = get_logger('sse')
+job_log = get_logger('jobs')
+
 # Create sessions directory for Flask-Session
 sessions_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'flask_session')
 if not os.path.exists(sessions_dir):
     os.makedirs(sessions_dir)
-    print(f"📁 Created sessions directory: {sessions_dir}")
+    log.info("📁 Created sessions directory", path=sessions_dir)
 
 # Secure API key management - ensure OPENAI_API_KEY is set
 api_key = os.getenv("OPENAI_API_KEY")
@@ -45,8 +76,8 @@ os.environ["OPENAI_API_KEY"] = api_key
 model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 api_key = os.getenv("OPENAI_API_KEY")
 
-print(f"🔧 Using model: {model_name}")
-print(f"🔧 API key set: {'Yes' if api_key else 'No'}")
+log.info("🔧 Using model", model=model_name)
+log.info("🔧 API key set", api_key_set=bool(api_key))
 
 # Simple LLM configuration using standard ChatOpenAI
 llm = ChatOpenAI(
@@ -58,319 +89,460 @@ llm = ChatOpenAI(
 # LLM Integration Testing - verify LLM functionality during startup
 try:
     test_response = llm.invoke("Test connection - respond with 'OK'")
-    print(f"✅ LLM test successful: {test_response.content[:50]}...")
+    log.info("✅ LLM test successful", reply=test_response.content[:50])
 except Exception as e:
-    print(f"❌ LLM test failed: {e}")
+    log.error("❌ LLM test failed", error=e)
     raise RuntimeError(f"LLM initialization failed: {e}")
 
-# User session management
-user_sessions = {}  # Store user-specific processing status
-session_queues = {}  # Store user-specific update queues
+# How stages are scheduled: 'sequential' (each reads the stage before it), 'dag'
+# (each reads its declared inputs, and independent stages run at the same time) or
+# 'speculative' (the tweet starts from the draft and is redone if the edit strays from it)
+PIPELINE_MODE = os.getenv('PIPELINE_MODE', SEQUENTIAL).lower()
+if PIPELINE_MODE not in PIPELINE_MODES:
+    raise ValueError(f"PIPELINE_MODE must be one of {', '.join(PIPELINE_MODES)}, not {PIPELINE_MODE!r}")
+log.info("🔀 Pipeline mode", mode=PIPELINE_MODE)
+
+# Minimum draft/edit similarity for a speculative stage's output to be kept
+SPECULATION_THRESHOLD = float(os.getenv('SPECULATION_THRESHOLD', 0.5))
+speculation_stats = SpeculationStats()
+
+# 'single' researches the topic in one conversation; 'map_reduce' splits it into
+# RESEARCH_SUBQUESTIONS questions researched RESEARCH_WORKERS at a time, then merges the findings
+RESEARCH_MODE = os.getenv('RESEARCH_MODE', SINGLE).lower()
+if RESEARCH_MODE not in RESEARCH_MODES:
+    raise ValueError(f"RESEARCH_MODE must be one of {', '.join(RESEARCH_MODES)}, not {RESEARCH_MODE!r}")
+RESEARCH_SUBQUESTIONS = int(os.getenv('RESEARCH_SUBQUESTIONS', 4))
+RESEARCH_WORKERS = int(os.getenv('RESEARCH_WORKERS', 4))
+# Single-agent research seconds to compare map-reduce against until a single-agent run is measured
+RESEARCH_BASELINE_SECONDS = float(os.getenv('RESEARCH_BASELINE_SECONDS', 0)) or None
+research_timings = ResearchTimings(baseline_seconds=RESEARCH_BASELINE_SECONDS)
+log.info("🔬 Research mode", mode=RESEARCH_MODE)
+
+# 'standard' writes a 400-word article in one pass; 'long_form' outlines a LONG_FORM_WORDS
+# article, drafts its LONG_FORM_SECTIONS sections in parallel and has the Editor stitch them
+ARTICLE_MODE = os.getenv('ARTICLE_MODE', STANDARD).lower()
+if ARTICLE_MODE not in ARTICLE_MODES:
+    raise ValueError(f"ARTICLE_MODE must be one of {', '.join(ARTICLE_MODES)}, not {ARTICLE_MODE!r}")
+LONG_FORM_WORDS = int(os.getenv('LONG_FORM_WORDS', 2000))
+LONG_FORM_SECTIONS = int(os.getenv('LONG_FORM_SECTIONS', 5))
+LONG_FORM_WORKERS = int(os.getenv('LONG_FORM_WORKERS', LONG_FORM_SECTIONS))
+log.info("📰 Article mode", mode=ARTICLE_MODE)
+
+# Stream each agent's tokens to /api/stream as they are generated
+STREAM_TOKENS = os.getenv('STREAM_TOKENS', 'true').lower() == 'true'
+token_router = TokenStreamRouter()
+if STREAM_TOKENS:
+    token_router.install()
+
+# Let a stage with a planning step start it from the first items its input streams
+PIPELINED_HANDOFF = os.getenv('PIPELINED_HANDOFF', 'false').lower() == 'true'
+if PIPELINED_HANDOFF and not STREAM_TOKENS:
+    log.warning("⚠️ PIPELINED_HANDOFF needs STREAM_TOKENS; stages will hand off whole outputs")
+
+def cache_stage(stage):
+    """The stage as the caches see it, including the research, article and hand-off modes' own prompts"""
+    if RESEARCH_MODE == MAP_REDUCE and stage.get('map_reduce'):
+        stage = map_reduce_stage(stage, RESEARCH_SUBQUESTIONS)
+    if ARTICLE_MODE == LONG_FORM and stage.get('long_form'):
+        stage = long_form_stage(stage, LONG_FORM_WORDS, LONG_FORM_SECTIONS)
+    if PIPELINED_HANDOFF and token_router.installed and stage.get('plan'):
+        # The stage may also work from its own plan, so its output is cached apart
+        stage = handoff_stage(stage)
+    return stage
+
+def stage_key(stage, topic, upstream=None):
+    """Stage cache key for a stage's output on a topic, as run under the current modes"""
+    return stage_cache_key(cache_stage(stage), model_name, normalize_topic(topic), upstream)
+
+# Cache of finished runs keyed by normalized topic, model, prompt definitions and topology
+PROMPTS_HASH = prompts_fingerprint([cache_stage(stage) for stage in EDITORIAL_STAGES], PIPELINE_MODE)
+result_cache = ResultCache(
+    max_entries=int(os.getenv('RESULT_CACHE_SIZE', 256)),
+    ttl=float(os.getenv('RESULT_CACHE_TTL', 86400)),
+    db_path=os.getenv('RESULT_CACHE_DB') or None
+)
+
+# Per-stage memo so a prompt change only re-runs the stages downstream of it
+stage_cache = ResultCache(
+    max_entries=int(os.getenv('STAGE_CACHE_SIZE', 1024)),
+    ttl=float(os.getenv('RESULT_CACHE_TTL', 86400)),
+    db_path=os.getenv('RESULT_CACHE_DB') or None,
+    table='stage_results'
+)
+
+# Index of researched topics for near-duplicate research reuse
+topic_index = TopicIndex(
+    threshold=float(os.getenv('TOPIC_SIMILARITY_THRESHOLD', 0.8)),
+    max_topics=int(os.getenv('TOPIC_INDEX_SIZE', 10000))
+)
+REUSE_SIMILAR_RESEARCH = os.getenv('REUSE_SIMILAR_RESEARCH', 'true').lower() == 'true'
+
+# Requests for an equivalent topic share one in-flight crew run
+inflight_topics = SingleFlight()
+
+# Status fields copied from a run's leading job to jobs coalesced onto it
+MIRRORED_STATUS_FIELDS = ('current_step', 'current_agent', 'current_thought',
+                          'agent_thoughts', 'is_processing')
+
+# Status fields stored in the broker so other processes can serve a user's or job's status
+SHARED_STATUS_FIELDS = MIRRORED_STATUS_FIELDS + ('job_id', 'job_state', 'queue_position', 'topic',
+                                                 'error', 'final_result', 'speculation', 'owner')
+
+# Every open stream (WSGI or ASGI) subscribes here; each update is encoded once for all of them
+stream_hub = StreamHub()
+SSE_BACKLOG_LIMIT = int(os.getenv('SSE_BACKLOG_LIMIT', 1000))  # Queued updates before a slow stream is dropped
+
+# One timer wheel wakes every open WSGI stream for its heartbeat
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', 5))
+SSE_IDLE_HEARTBEATS = 2  # Heartbeats with nothing processing before a stream closes
+heartbeat_wheel = TimerWheel(interval=SSE_HEARTBEAT_SECONDS)
+start_wheel_thread(heartbeat_wheel)
+
+# Recent numbered events per user so reconnecting streams can resume
+replay_log = ReplayLog(capacity=int(os.getenv('REPLAY_BUFFER_SIZE', 1000)))
+
+# Seconds of inactivity before a user's state is dropped
+SESSION_TTL = 3600
+
+# User session management: processing status per user, safe to use from any thread.
+# Each job also keeps its own record here under job_key(job_id), with its own stream.
+user_sessions = SessionRegistry(shards=int(os.getenv('SESSION_SHARDS', 16)), ttl=SESSION_TTL)
+
+# Jobs one user may have queued or running at once
+MAX_JOBS_PER_USER = int(os.getenv('MAX_JOBS_PER_USER', 3))
+
+# A user's own status mirrors these fields from their latest job
+OWNER_MIRRORED_FIELDS = STATUS_FIELDS + OPTIONAL_FIELDS
+
+# Jobs accepted by this process; any other job's status comes from the broker's shared state
+accepted_jobs = set()
+
+def load_shared_state(key):
+    """A user's or job's status as last shared through the broker; None in a single process"""
+    if not event_broker.shared:
+        return None
+    try:
+        return event_broker.get_state(key)
+    except Exception as e:
+        session_log.error("❌ Broker: Could not load shared state", key=key, error=e)
+        return None
+
+def share_status(key):
+    """Store a user's or job's status in the broker so other processes can serve it"""
+    if not event_broker.shared:
+        return
+    try:
+        event_broker.set_state(key, shared_status_snapshot(key, {}), ttl=SESSION_TTL)
+    except Exception as e:
+        session_log.error("❌ Broker: Could not share state", key=key, error=e)
+
+def ensure_user_state(user_id):
+    """Create processing status for a user if missing"""
+    user_status, created = user_sessions.get_or_create(user_id)
+    if created:
+        session_log.info("🆕 USER DATA: Creating user session", user_id=user_id)
+        
+        # The job may be running in another process; start from its shared state
+        shared_status = load_shared_state(user_id)
+        if shared_status:
+            user_status.update(shared_status)
+    else:
+        session_log.debug("✅ USER DATA: Found existing user session", user_id=user_id)
+    
+    return user_status
 
 def get_or_create_user_session():
     """Get or create a user session"""
     if 'user_id' not in session:
         session['user_id'] = str(uuid.uuid4())
         session['created_at'] = datetime.now().isoformat()
-        print(f"🆔 NEW USER SESSION: Created user_id {session['user_id']}")
+        session_log.info("🆔 NEW USER SESSION: Created user_id", user_id=session['user_id'])
     
     user_id = session['user_id']
-    print(f"🔍 SESSION DEBUG: Using user_id {user_id}")
     
     # Initialize user session if it doesn't exist
-    if user_id not in user_sessions:
-        print(f"🆕 USER DATA: Creating user_sessions for {user_id}")
-        user_sessions[user_id] = {
-            'is_processing': False,
-            'current_step': 0,
-            'total_steps': 4,
-            'topic': '',
-            'result': None,
-            'error': None,
-            'agent_thoughts': {},
-            'current_agent': None,
-            'current_thought': None,
-            'created_at': datetime.now().isoformat(),
-            'last_activity': datetime.now().isoformat()
-        }
-        
-        # Create user-specific queue
-        session_queues[user_id] = queue.Queue()
-        print(f"📥 QUEUE: Created session_queues for {user_id}")
-    else:
-        print(f"✅ USER DATA: Found existing user_sessions for {user_id}")
+    ensure_user_state(user_id)
     
     # Update last activity
-    user_sessions[user_id]['last_activity'] = datetime.now().isoformat()
+    user_sessions.touch(user_id)
     
-    print(f"📊 SESSION SUMMARY: user_sessions has {len(user_sessions)} users, session_queues has {len(session_queues)} queues")
+    if session_log.enabled(DEBUG):
+        session_log.debug("📊 SESSION SUMMARY", user_id=user_id, users=len(user_sessions),
+                          open_streams=stream_hub.subscriber_count())
     
     return user_id
 
 def get_user_processing_status(user_id):
     """Get processing status for a specific user"""
-    if user_id not in user_sessions:
+    return user_sessions.get(user_id)
+
+def job_key(job_id):
+    """Key of a job's own status record and stream"""
+    return f"job:{job_id}"
+
+def user_jobs_key(user_id):
+    """Key of the broker's shared list of a user's job IDs"""
+    return f"jobs:{user_id}"
+
+def create_job_state(user_id, topic):
+    """Create status for a new job of the user's and make it their latest job"""
+    job_id = str(uuid.uuid4())
+    status_key = job_key(job_id)
+    job_status, _ = user_sessions.get_or_create(status_key)
+    job_status['owner'] = user_id
+    job_status['job_id'] = job_id
+    job_status['topic'] = topic
+    accepted_jobs.add(job_id)
+    
+    # Replaced rather than appended to so readers never see the list change under them
+    user_status = get_user_processing_status(user_id)
+    user_status['jobs'] = (user_status.get('jobs') or []) + [job_id]
+    user_status['job_id'] = job_id
+    
+    # Any process can then list the job, check its owner and serve its stream
+    share_status(status_key)
+    if event_broker.shared:
+        try:
+            event_broker.add_to_list(user_jobs_key(user_id), job_id, ttl=SESSION_TTL)
+        except Exception as e:
+            session_log.error("❌ Broker: Could not share job", user_id=user_id, job_id=job_id, error=e)
+    return job_id, job_status
+
+def get_job_state(job_id):
+    """A job's status; one accepted by another process is refreshed from the broker's shared state"""
+    status_key = job_key(job_id)
+    job_status = user_sessions.get(status_key)
+    if job_id in accepted_jobs:
+        return job_status
+    shared_status = load_shared_state(status_key)
+    if shared_status:
+        if job_status is None:
+            job_status, _ = user_sessions.get_or_create(status_key)
+        job_status.update(shared_status)
+    return job_status
+
+def get_user_job_ids(user_id):
+    """IDs of the user's jobs, oldest first, wherever they were accepted"""
+    if event_broker.shared:
+        try:
+            return event_broker.get_list(user_jobs_key(user_id))
+        except Exception as e:
+            session_log.error("❌ Broker: Could not load the user's jobs", user_id=user_id, error=e)
+    user_status = get_user_processing_status(user_id)
+    return (user_status.get('jobs') or []) if user_status else []
+
+def get_user_jobs(user_id):
+    """The user's jobs that have not expired, oldest first"""
+    job_ids = get_user_job_ids(user_id)
+    jobs = [job_status for job_status in map(get_job_state, job_ids) if job_status]
+    if len(jobs) < len(job_ids):
+        live = {job_status['job_id'] for job_status in jobs}
+        user_status = get_user_processing_status(user_id)
+        if user_status:
+            user_status['jobs'] = [job_id for job_id in (user_status.get('jobs') or []) if job_id in live]
+        if event_broker.shared:
+            try:
+                for job_id in job_ids:
+                    if job_id not in live:
+                        event_broker.remove_from_list(user_jobs_key(user_id), job_id)
+            except Exception as e:
+                session_log.error("❌ Broker: Could not prune the user's jobs", user_id=user_id, error=e)
+    return jobs
+
+def get_user_job(user_id, job_id):
+    """A job's status, only if it belongs to the user"""
+    job_status = get_job_state(job_id)
+    if job_status is None or job_status.get('owner') != user_id:
         return None
-    return user_sessions[user_id]
+    return job_status
 
-def get_user_queue(user_id):
-    """Get update queue for a specific user"""
-    if user_id not in session_queues:
+def mirror_to_owner(status_key):
+    """Copy a job's status to its owner while it is their latest job; returns the owner's ID"""
+    job_status = get_user_processing_status(status_key)
+    owner_id = job_status.get('owner') if job_status else None
+    owner_status = get_user_processing_status(owner_id) if owner_id else None
+    if not owner_status or owner_status.get('job_id') != job_status['job_id']:
         return None
-    return session_queues[user_id]
+    for field in OWNER_MIRRORED_FIELDS:
+        owner_status[field] = job_status[field]
+    return owner_id
 
 def send_user_update(user_id, update_data):
-    """Send update to a specific user's queue"""
+    """Send an update to a user's stream, merging bursts of routine progress"""
+    update_coalescer.submit(user_id, update_data)
+
+def send_job_update(status_key, update_data):
+    """Send an update to a job's stream, and to its owner's while it is their latest job"""
+    send_user_update(status_key, update_data)
+    owner_id = mirror_to_owner(status_key)
+    if owner_id:
+        send_user_update(owner_id, update_data)
+
+def publish_user_update(user_id, update_data):
+    """Publish an update for a user to whichever process is serving their stream"""
     try:
-        print(f"🔍 SSE DEBUG: Looking for user_id {user_id}")
-        print(f"📊 SSE DEBUG: Available session_queues: {list(session_queues.keys())}")
-        print(f"📊 SSE DEBUG: Available user_sessions: {list(user_sessions.keys())}")
+        if sse_log.enabled(DEBUG):
+            sse_log.sampled('update', DEBUG, "🔄 SSE: Sending update", user_id=user_id,
+                            agent=update_data.get('current_agent'),
+                            thought=(update_data.get('current_thought') or '')[:50])
+        event_id = replay_log.append(user_id, update_data)
+        event_broker.publish(user_id, update_data, event_id)
         
-        if user_id in session_queues:
-            print(f"🔄 SSE: Sending update to user {user_id}: {update_data.get('current_agent', 'Unknown')} - {update_data.get('current_thought', 'No thought')[:50]}...")
-            session_queues[user_id].put(update_data)
-        else:
-            print(f"❌ SSE: User {user_id} not found in session_queues")
-            print(f"❌ SSE: session_queues has these users: {list(session_queues.keys())}")
+        # Let other processes greet a new stream with the latest state
+        if 'current_thought' in update_data:
+            share_status(user_id)
     except Exception as e:
-        print(f"❌ SSE: Error sending update to user {user_id}: {e}")
+        sse_log.error("❌ SSE: Error sending update", user_id=user_id, error=e)
 
-# Clean up old sessions (older than 1 hour)
-def cleanup_old_sessions():
-    """Remove old user sessions to prevent memory leaks"""
-    current_time = datetime.now()
-    users_to_remove = []
+def shared_status_snapshot(user_id, update_data):
+    """Status fields worth sharing with other processes for a user or job"""
+    source = get_user_processing_status(user_id) or update_data
+    return {field: source.get(field) for field in SHARED_STATUS_FIELDS if field in source}
+
+def deliver_user_update(user_id, update_data, local, event_id=None):
+    """Broker listener: hand an update to this process's stream for the user"""
+    if not local:
+        replay_log.record(user_id, event_id, update_data)
     
-    for user_id, user_data in user_sessions.items():
-        last_activity = datetime.fromisoformat(user_data['last_activity'])
-        if (current_time - last_activity).total_seconds() > 3600:  # 1 hour
-            users_to_remove.append(user_id)
+    user_status = user_sessions.get(user_id)
+    if user_status is None:
+        if local and not event_broker.shared:
+            sse_log.error("❌ SSE: User not found in user_sessions", user_id=user_id)
+        return
     
-    for user_id in users_to_remove:
-        del user_sessions[user_id]
-        if user_id in session_queues:
-            del session_queues[user_id]
-        print(f"🧹 Cleaned up old session for user {user_id}")
+    if not local:
+        # Keep this process's copy current for heartbeats and the final status
+        for field in MIRRORED_STATUS_FIELDS:
+            if field in update_data:
+                user_status[field] = update_data[field]
+    
+    # Encoded once and handed to every stream watching this user; none open means nothing to do
+    stream_hub.publish(user_id, event_id, update_data)
+
+# Carries updates between processes when EVENT_BROKER_URL points at Redis
+event_broker = create_broker(os.getenv('EVENT_BROKER_URL'))
+event_broker.listen(deliver_user_update)
+
+# Routine updates within this window are merged; transitions go out at once
+update_coalescer = UpdateCoalescer(publish_user_update, window=float(os.getenv('UPDATE_COALESCE_MS', 100)) / 1000)
+update_coalescer.start()
+
+# Clean up old sessions (idle for over an hour)
+def cleanup_old_sessions():
+    """Remove expired user sessions, their open streams and buffered events"""
+    # Only sessions whose expiry has come due are visited, not every session
+    for user_id, record in user_sessions.expire():
+        closed_streams = stream_hub.close(user_id)
+        replay_log.discard(user_id)
+        update_coalescer.discard(user_id)
+        if record['owner']:
+            accepted_jobs.discard(record['job_id'])
+        session_log.info("🧹 Cleaned up old session", user_id=user_id, closed_streams=closed_streams)
+
+# Where agent progress comes from: 'callbacks' (CrewAI step/task callbacks)
+# or 'stdout' (legacy scraping of verbose output via CrewAIOutputCapture)
+PROGRESS_SOURCE = os.getenv('PROGRESS_SOURCE', 'callbacks').lower()
 
 # Global queue for real-time updates (keeping for backward compatibility)
 update_queue = queue.Queue()
 
-class CrewAIOutputCapture:
-    """Captures and parses CrewAI output to track agent progress in real-time"""
-    
-    def __init__(self, original_stdout, agent_names, user_id):
-        self.original_stdout = original_stdout
-        self.agent_names = agent_names
-        self.user_id = user_id
-        self.buffer = ""
-        
-    def write(self, text):
-        # Write to original stdout so we still see the output
-        self.original_stdout.write(text)
-        self.original_stdout.flush()
-        
-        # Add to buffer for parsing
-        self.buffer += text
-        
-        # Parse for agent activity
-        self._parse_agent_activity(text)
-    
-    def flush(self):
-        self.original_stdout.flush()
-    
-    def _parse_agent_activity(self, text):
-        """Parse CrewAI output for agent start/completion markers"""
-        user_status = get_user_processing_status(self.user_id)
-        if not user_status:
-            return
-        
-        try:
-            # Clean up the text for better parsing
-            clean_text = text.strip()
-            
-            # Look for agent start indicators - more comprehensive patterns
-            agent_start_patterns = [
-                "Working Agent:",
-                "Agent:", 
-                "🤖 Agent Started",
-                "Starting agent:",
-                "# Agent:",
-                "[Agent]",
-                ">>> Agent"
-            ]
-            
-            # Look for agent thinking patterns
-            thinking_patterns = [
-                "Thought:",
-                "I need to",
-                "Let me",
-                "I will",
-                "I should",
-                "First,",
-                "Next,",
-                "Now I",
-                "Action:",
-                "Observation:",
-                "Reasoning:",
-                "Analysis:"
-            ]
-            
-            # Check for agent start or transition
-            for pattern in agent_start_patterns:
-                if pattern in clean_text:
-                    for i, agent_name in enumerate(self.agent_names):
-                        # Look for both full name and last word (e.g., "Analyst", "Writer")
-                        agent_keywords = [agent_name, agent_name.split()[-1]]
-                        if any(keyword in clean_text for keyword in agent_keywords):
-                            # Only update if this is a new agent or step progression
-                            if user_status['current_agent'] != agent_name or user_status['current_step'] != i:
-                                user_status['current_step'] = i
-                                user_status['current_agent'] = agent_name
-                                user_status['current_thought'] = f"{agent_name} is beginning their task..."
-                                
-                                send_user_update(self.user_id, {
-                                    'current_step': i,
-                                    'current_agent': agent_name,
-                                    'current_thought': f"{agent_name} is beginning their task...",
-                                    'agent_thoughts': user_status['agent_thoughts'],
-                                    'is_processing': True
-                                })
-                                
-                                print(f"🎯 User {self.user_id}: Detected {agent_name} started (step {i})")
-                            break
-                    break
-            
-            # Check for thinking patterns to show real-time thoughts
-            for pattern in thinking_patterns:
-                if pattern in clean_text:
-                    current_agent = user_status.get('current_agent')
-                    if current_agent:
-                        # Extract the thought content
-                        thought_start = clean_text.find(pattern)
-                        if thought_start != -1:
-                            # Get a meaningful portion of the thought
-                            thought_text = clean_text[thought_start:thought_start + 150].split('\n')[0]
-                            user_status['current_thought'] = f"{current_agent}: {thought_text}"
-                            
-                            send_user_update(self.user_id, {
-                                'current_step': user_status['current_step'],
-                                'current_agent': current_agent,
-                                'current_thought': f"{current_agent}: {thought_text}",
-                                'agent_thoughts': user_status['agent_thoughts'],
-                                'is_processing': True
-                            })
-                            
-                            print(f"💭 User {self.user_id}: {current_agent} thinking: {thought_text[:50]}...")
-                    break
-            
-            # Look for final answer/completion indicators - be more selective
-            completion_patterns = [
-                "Final Answer:",
-                "Task completed successfully",
-                "Finished working on",
-                "Agent execution complete",
-                "OUTPUT:",
-                "RESULT:"
-            ]
-            
-            for pattern in completion_patterns:
-                if pattern in clean_text:
-                    current_agent = user_status.get('current_agent')
-                    if current_agent and current_agent not in user_status['agent_thoughts']:
-                        timestamp = time.strftime("%H:%M:%S")
-                        
-                        # Try to extract the actual result
-                        result_start = clean_text.find(pattern)
-                        if result_start != -1:
-                            result_text = clean_text[result_start + len(pattern):result_start + len(pattern) + 300]
-                            result_text = result_text.split('\n')[0].strip()
-                            if result_text and len(result_text) > 20:  # Only capture substantial outputs
-                                user_status['agent_thoughts'][current_agent] = f"[{timestamp}] {result_text[:200]}..."
-                                completion_msg = f"{current_agent} has completed their task"
-                                user_status['current_thought'] = completion_msg
-                                
-                                send_user_update(self.user_id, {
-                                    'current_step': user_status['current_step'],
-                                    'current_agent': current_agent,
-                                    'current_thought': completion_msg,
-                                    'agent_thoughts': user_status['agent_thoughts'],
-                                    'is_processing': True
-                                })
-                                
-                                print(f"✅ User {self.user_id}: {current_agent} completed with output: {result_text[:50]}...")
-                    break
-        
-        except Exception as e:
-            print(f"Error parsing CrewAI output for user {self.user_id}: {e}")
-
-def create_crew(topic):
-    """Create a CrewAI crew for the given topic"""
-    # Define your agents with custom thought capture
-    researcher = Agent(
-        role="Research Analyst",
-        goal="Research a given topic deeply and provide clear findings",
-        backstory="You're a seasoned researcher known for producing accurate and concise insights.",
+def build_agent(stage, **kwargs):
+    """Create the CrewAI agent described by a pipeline stage"""
+    kwargs.setdefault('llm', llm)
+    return Agent(
+        role=stage['agent']['role'],
+        goal=stage['agent']['goal'],
+        backstory=stage['agent']['backstory'],
         verbose=True,
-        llm=llm,
-        allow_delegation=False
+        **kwargs
     )
 
-    writer = Agent(
-        role="Article Writer",
-        goal="Write a short, compelling article based on the research",
-        backstory="You're a skilled writer who turns insights into engaging prose.",
-        verbose=True,
-        llm=llm,
-        allow_delegation=False
+def build_task(stage, topic, agent, upstream=None, **kwargs):
+    """Create the CrewAI task described by a pipeline stage"""
+    description = task_description(stage, topic)
+    if upstream:
+        # Stages run as separate crews, so hand over the upstream output explicitly
+        description += f"\n\nWork from this output of the previous step:\n\n{upstream}"
+    return Task(
+        description=description,
+        expected_output=stage['task']['expected_output'],
+        agent=agent,
+        **kwargs
     )
 
-    editor = Agent(
-        role="Editor",
-        goal="Polish the article for tone, flow, and clarity",
-        backstory="You're a language expert who makes content shine.",
-        verbose=True,
-        llm=llm,
-        allow_delegation=False
-    )
+def crew_output_text(crew_result):
+    """Plain text of a crew's final output across CrewAI versions"""
+    raw = getattr(crew_result, 'raw', None)
+    return str(raw if raw else crew_result)
 
-    tweeter = Agent(
-        role="Social Media Strategist",
-        goal="Summarise the article into a tweet for engagement",
-        backstory="You're great at distilling ideas into bite-sized, high-impact tweets.",
-        verbose=True,
-        llm=llm,
-        allow_delegation=False
-    )
+def make_streaming_llm():
+    """A fresh streaming LLM so its chunks can be attributed to a single stage"""
+    return LLM(model=model_name, api_key=api_key, temperature=0.7, stream=True)
 
-    # Define tasks with expected outputs
-    task1 = Task(
-        description=f"Research the topic: {topic}",
-        expected_output="A list of 3–5 key insights about the topic.",
-        agent=researcher
-    )
+def run_stage(stage, topic, context=None, reporter=None):
+    """Run a single pipeline stage as its own one-task crew and return its text"""
+    agent_kwargs = {}
+    task_kwargs = {}
+    if reporter and PROGRESS_SOURCE == 'callbacks':
+        # Progress comes from the crew's own callbacks, bound to this job
+        agent_kwargs['step_callback'] = reporter.step_callback
+        task_kwargs['callback'] = reporter.task_callback
+    if reporter and STREAM_TOKENS and token_router.installed:
+        agent_kwargs['llm'] = make_streaming_llm()
+    
+    agent = build_agent(stage, **agent_kwargs)
+    task = build_task(stage, topic, agent, context, **task_kwargs)
+    crew = Crew(agents=[agent], tasks=[task], verbose=True)
+    
+    stage_llm = agent_kwargs.get('llm')
+    if stage_llm is not None:
+        token_router.register(reporter.token_callback, stage_llm, agent)
+    
+    try:
+        return crew_output_text(crew.kickoff())
+    finally:
+        if stage_llm is not None:
+            token_router.unregister(stage_llm, agent)
 
-    task2 = Task(
-        description="Write a 400-word article based on the research",
-        expected_output="A complete article, written in natural language, based on the research insights.",
-        agent=writer
-    )
+@contextmanager
+def stdout_progress(status_key):
+    """With PROGRESS_SOURCE=stdout, scrape the verbose output of everything run inside for the job's progress.
 
-    task3 = Task(
-        description="Edit the article so it's twice as clear in terms of tone and structure",
-        expected_output="A refined version of the article with improved tone and readability.",
-        agent=editor
-    )
+    stdout is process-wide, so it is swapped once around the whole job: stages
+    running side by side (dag and speculative modes) would otherwise restore
+    each other's capture out of order and leave a stale one installed. Still
+    only reliable with a single worker (MAX_CONCURRENT_JOBS=1).
+    """
+    if PROGRESS_SOURCE != 'stdout':
+        yield
+        return
+    original_stdout = sys.stdout
+    sys.stdout = CrewAIOutputCapture(original_stdout, AGENT_NAMES, status_key,
+                                     get_user_processing_status, send_flight_update)
+    try:
+        yield
+    finally:
+        sys.stdout = original_stdout
 
-    task4 = Task(
-        description="Summarise the article in a single tweet (max 280 characters)",
-        expected_output="A concise, engaging tweet that captures the article's core idea.",
-        agent=tweeter
-    )
+def create_crew(topic):
+    """Create a CrewAI crew for the given topic.
+
+    A crew runs its tasks one after another; in the dag mode each task reads
+    its declared inputs, but the concurrency comes from process_crew_ai's
+    task graph, not from this crew.
+    """
+    agents = [build_agent(stage, allow_delegation=False) for stage in EDITORIAL_STAGES]
+    tasks = {}
+    for stage, agent in zip(EDITORIAL_STAGES, agents):
+        task_kwargs = {}
+        if PIPELINE_MODE == DAG:
+            task_kwargs['context'] = [tasks[key] for key in stage_inputs(stage, DAG)]
+        tasks[stage['key']] = build_task(stage, topic, agent, **task_kwargs)
 
     # Create the Crew
     crew = Crew(
-        agents=[researcher, writer, editor, tweeter],
-        tasks=[task1, task2, task3, task4],
+        agents=agents,
+        tasks=list(tasks.values()),
         verbose=True
     )
     
@@ -391,6 +563,10 @@ CORS(app,
      allow_headers=['Content-Type', 'Authorization', 'Cache-Control', 'Accept', 'Origin'],
      methods=['GET', 'POST', 'OPTIONS', 'PUT', 'DELETE'])  # Enable CORS with full EventSource support
 
+# Origins allowed to open the SSE stream (anything else gets the production frontend)
+SSE_ALLOWED_ORIGINS = ['http://localhost:5173', 'https://ai-editorial-team.vercel.app']
+SSE_DEFAULT_ORIGIN = 'https://ai-editorial-team.vercel.app'
+
 # Configure Flask-Session with SECRET_KEY for session management
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['SESSION_TYPE'] = 'filesystem'
@@ -399,7 +575,18 @@ app.config['SESSION_COOKIE_SECURE'] = False # Set to True in production
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['PERMANENT_SESSION_LIFETIME'] = 3600 # Session expires after 1 hour
-Session(app)
+
+# Where the session (just a user_id) lives: 'filesystem' (Flask-Session files),
+# 'cookie' (Flask's signed cookie, no server-side storage) or 'sqlite' (one WAL-mode table)
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'filesystem').lower()
+if SESSION_BACKEND == 'sqlite':
+    app.session_interface = SQLiteSessionInterface(
+        os.getenv('SESSION_DB_PATH', os.path.join(sessions_dir, 'sessions.db')),
+        ttl=app.config['PERMANENT_SESSION_LIFETIME']
+    )
+elif SESSION_BACKEND != 'cookie':
+    Session(app)
+log.info("🍪 Sessions: Using session backend", backend=SESSION_BACKEND)
 
 # Store processing status
 processing_status = {
@@ -419,13 +606,204 @@ def send_update(update_data):
     try:
         update_queue.put(update_data)
     except Exception as e:
-        print(f"Error sending update: {e}")
+        log.error("Error sending update", error=e)
 
-def process_crew_ai(topic, user_id):
-    """Process the CrewAI workflow in a separate thread for a specific user"""
-    user_status = get_user_processing_status(user_id)
+def publish_progress(status_key, event):
+    """Apply a ProgressEvent to the user's status and stream it to the job's viewers"""
+    user_status = get_user_processing_status(status_key)
+    if not user_status:
+        return
+    
+    if event.kind == TOKEN:
+        # Token chunks are appended client-side; skip the full status snapshot
+        send_flight_update(status_key, {
+            'current_step': event.step,
+            'current_agent': event.agent,
+            'is_processing': True,
+            'event': event.kind,
+            'job_id': event.job_id,
+            'token': event.text
+        })
+        return
+    
+    if event.kind == STAGE_STARTED:
+        thought = event.text
+    elif event.kind == AGENT_STEP:
+        thought = f"{event.agent}: {event.text}"
+    else:
+        timestamp = time.strftime("%H:%M:%S", time.localtime(event.timestamp))
+        user_status['agent_thoughts'][event.agent] = f"[{timestamp}] {event.text}"
+        thought = f"{event.agent} has completed their task"
+    
+    user_status['current_step'] = event.step
+    user_status['current_agent'] = event.agent
+    user_status['current_thought'] = thought
+    send_flight_update(status_key, {
+        'current_step': event.step,
+        'current_agent': event.agent,
+        'current_thought': thought,
+        'agent_thoughts': user_status['agent_thoughts'],
+        'is_processing': True,
+        'event': event.kind,
+        'job_id': event.job_id
+    })
+
+def find_similar_research(status_key, stage, topic):
+    """Look for cached research on a near-duplicate topic.
+
+    The closest match is always offered to the client; its research is only
+    returned for reuse when REUSE_SIMILAR_RESEARCH is enabled.
+    """
+    for similar_topic, similarity in topic_index.similar(normalize_topic(topic)):
+        # Looked up under the same key the research was stored under, research mode included
+        research = stage_cache.get(stage_key(stage, similar_topic))
+        if research is None:
+            continue
+        
+        reused = REUSE_SIMILAR_RESEARCH
+        thought = (f"Research Analyst is reusing research on a similar topic: \"{similar_topic}\""
+                   if reused else f"Found earlier research on a similar topic: \"{similar_topic}\"")
+        send_flight_update(status_key, {
+            'current_step': 0,
+            'current_agent': stage['agent']['role'],
+            'current_thought': thought,
+            'agent_thoughts': {},
+            'is_processing': True,
+            'similar_topic': similar_topic,
+            'similarity': similarity,
+            'reused_research': reused
+        })
+        job_log.info("🔁 Similar topic found", similar_topic=similar_topic,
+                     similarity=round(similarity, 2), topic=topic, reused=reused)
+        return research if reused else None
+    return None
+
+def run_map_reduce_research(stage, topic, reporter):
+    """Research ``topic`` as parallel sub-questions merged into one set of insights"""
+    start = time.time()
+    split_output = run_stage(map_reduce_step(stage, 'split', count=RESEARCH_SUBQUESTIONS), topic)
+    questions = parse_subquestions(split_output, RESEARCH_SUBQUESTIONS)
+    split_seconds = time.time() - start
+    if len(questions) < 2:
+        job_log.warning("⚠️ Could not split the topic; researching it in one pass", questions=len(questions))
+        single_start = time.time()
+        research = run_stage(stage, topic, None, reporter)
+        # A one-pass run is a single-agent sample, which map-reduce deployments otherwise never see
+        research_timings.record(SINGLE, time.time() - single_start)
+        return research
+    
+    reporter.note(f"Researching {len(questions)} questions in parallel")
+    job_log.info("🔬 Researching sub-questions", questions=len(questions), workers=RESEARCH_WORKERS)
+    
+    def research(question):
+        finding = run_stage(map_reduce_step(stage, 'map', question=question), topic)
+        reporter.note(f"Answered: {question}")
+        return finding
+    
+    findings = research_concurrently(questions, research, RESEARCH_WORKERS)
+    for finding in findings:
+        if finding.error:
+            job_log.warning("⚠️ Sub-question failed", question=finding.question, error=finding.error)
+    if not any(finding.text for finding in findings):
+        raise RuntimeError(f"Every research sub-question failed: {findings[0].error}")
+    map_seconds = time.time() - start - split_seconds
+    
+    # The merge streams its tokens and fires the stage callbacks like a normal research run
+    merged = run_stage(map_reduce_step(stage, 'reduce'), topic, merge_input(findings), reporter)
+    
+    seconds = time.time() - start
+    question_seconds = sum(finding.seconds for finding in findings)
+    research_timings.record(MAP_REDUCE, seconds, len(questions), question_seconds)
+    baseline = research_timings.baseline()
+    job_log.info("🔬 Map-reduce research finished", seconds=round(seconds, 1), split_seconds=round(split_seconds, 1),
+                 map_seconds=round(map_seconds, 1), reduce_seconds=round(seconds - split_seconds - map_seconds, 1),
+                 question_seconds=round(question_seconds, 1),
+                 baseline_seconds=round(baseline, 1) if baseline else None)
+    return merged
+
+def run_long_form_draft(stage, topic, upstream, reporter):
+    """Draft a long article as an outline plus sections written in parallel"""
+    start = time.time()
+    outline = run_stage(long_form_step(stage, 'outline', words=LONG_FORM_WORDS, sections=LONG_FORM_SECTIONS),
+                        topic, upstream)
+    sections = list_items(outline, LONG_FORM_SECTIONS)
+    outline_seconds = time.time() - start
+    if len(sections) < 2:
+        job_log.warning("⚠️ Could not outline the article; writing it in one pass", sections=len(sections))
+        return run_stage(stage, topic, upstream, reporter)
+    
+    reporter.note(f"Drafting {len(sections)} sections in parallel")
+    job_log.info("📰 Drafting sections", sections=len(sections), workers=LONG_FORM_WORKERS)
+    section_words = LONG_FORM_WORDS // len(sections)
+    
+    def draft(numbered):
+        index, section = numbered
+        section_start = time.time()
+        text = run_stage(long_form_step(stage, 'section', index=index + 1, count=len(sections), section=section,
+                                        words=LONG_FORM_WORDS, section_words=section_words, outline=outline),
+                         topic, upstream)
+        reporter.note(f"Drafted section {index + 1} of {len(sections)}")
+        return text, time.time() - section_start
+    
+    drafted = run_each(enumerate(sections), draft, LONG_FORM_WORKERS)
+    section_seconds = [seconds for _, seconds in drafted]
+    job_log.info("📰 Long-form draft finished", seconds=round(time.time() - start, 1),
+                 outline_seconds=round(outline_seconds, 1),
+                 sections_seconds=round(time.time() - start - outline_seconds, 1),
+                 longest_section_seconds=round(max(section_seconds), 1),
+                 total_section_seconds=round(sum(section_seconds), 1))
+    return '\n\n'.join(text for text, _ in drafted)
+
+def start_planning(stage, topic):
+    """Hand-off that runs ``stage``'s planning step once enough upstream items have streamed in"""
+    def plan(items):
+        job_log.info("🧩 Planning from streamed items", agent=stage['agent']['role'], items=len(items))
+        return run_stage(plan_stage(stage), topic, '\n'.join(items))
+    return StreamedHandoff(stage['plan']['after'], plan)
+
+def with_plan(upstream, handoff):
+    """Upstream text for a stage, plus the plan it drafted while that text was streaming"""
+    plan = handoff.result() if handoff else None
+    if handoff and handoff.error:
+        job_log.warning("⚠️ Planning step failed; writing from the full input only", error=handoff.error)
+    if not plan:
+        return upstream
+    job_log.info("🧩 Planning overlapped the previous stage", lead_seconds=round(handoff.lead_seconds or 0, 1))
+    return f"{upstream}\n\nYour outline, drafted while these insights were still arriving:\n\n{plan}"
+
+def reconcile_speculation(outputs, stage_times, cached_stages, run_pipeline_stage):
+    """Keep or redo each speculative stage now that its real input exists; returns the outcomes"""
+    outcomes = {}
+    for stage in speculative_stages():
+        key_name = stage['key']
+        real_input = stage_inputs(stage, SEQUENTIAL)[0]
+        similarity = draft_similarity(outputs[stage['speculate_from']], outputs[real_input])
+        started, finished = stage_times[key_name]
+        hit = similarity >= SPECULATION_THRESHOLD
+        if hit:
+            saved, wasted = latency_saved(stage_times[real_input][1], started, finished), 0.0
+        else:
+            # The edit moved too far from the draft: redo the stage from the edited text
+            saved, wasted = 0.0, finished - started
+            outputs[key_name] = run_pipeline_stage(key_name, {real_input: outputs[real_input]})
+        # A stage served from the cache saved or wasted nothing, so it would only dilute the stats
+        if key_name not in cached_stages and real_input not in cached_stages:
+            speculation_stats.record(hit, saved, wasted)
+        outcomes[key_name] = {
+            'hit': hit,
+            'similarity': round(similarity, 3),
+            'saved_seconds': round(saved, 1),
+            'wasted_seconds': round(wasted, 1),
+        }
+        job_log.info("🎲 Speculative stage kept" if hit else "🎲 Speculative stage redone",
+                     stage=key_name, **outcomes[key_name])
+    return outcomes
+
+def process_crew_ai(topic, status_key):
+    """Process the CrewAI workflow on a worker thread, reporting to the job's status"""
+    user_status = get_user_processing_status(status_key)
     if not user_status:
-        print(f"❌ User {user_id} not found for processing")
+        job_log.error("❌ Job status not found for processing", status_key=status_key)
         return
     
     try:
@@ -434,7 +812,7 @@ def process_crew_ai(topic, user_id):
         user_status['current_thought'] = 'Setting up AI agents and preparing to analyze the topic...'
         
         # Send initial detailed update
-        send_user_update(user_id, {
+        send_flight_update(status_key, {
             'current_step': 0,
             'current_agent': 'AI Team',
             'current_thought': 'Setting up AI agents and preparing to analyze the topic...',
@@ -442,12 +820,12 @@ def process_crew_ai(topic, user_id):
             'is_processing': True
         })
         
-        print(f"🤖 User {user_id}: Starting CrewAI processing for topic: {topic}")
+        job_log.info("🤖 Starting CrewAI processing", topic=topic)
         
         # Send setup update after a short delay
         time.sleep(1)
         user_status['current_thought'] = 'Your AI Editorial team is ready. Starting research phase...'
-        send_user_update(user_id, {
+        send_flight_update(status_key, {
             'current_step': 0,
             'current_agent': 'Research Analyst',
             'current_thought': 'Your AI Editorial team is ready. Starting research phase...',
@@ -455,167 +833,85 @@ def process_crew_ai(topic, user_id):
             'is_processing': True
         })
         
-        # Create custom agents that capture their thoughts
-        print(f"🔧 Creating Research Analyst with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'openai/gpt-5-nano')}")
-        researcher = Agent(
-            role="Research Analyst",
-            goal="Research a given topic deeply and provide clear findings",
-            backstory="You're a seasoned researcher known for producing accurate and concise insights.",
-            verbose=True,
-            llm=llm
-        )
-
-        print(f"🔧 Creating Article Writer with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'openai/gpt-5-nano')}")
-        writer = Agent(
-            role="Article Writer",
-            goal="Write a short, compelling article based on the research",
-            backstory="You're a skilled writer who turns insights into engaging prose.",
-            verbose=True,
-            llm=llm
-        )
-
-        print(f"🔧 Creating Editor with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'openai/gpt-5-nano')}")
-        editor = Agent(
-            role="Editor",
-            goal="Polish the article for tone, flow, and clarity",
-            backstory="You're a language expert who makes content shine.",
-            verbose=True,
-            llm=llm
-        )
-
-        print(f"🔧 Creating Social Media Strategist with LLM: {type(llm).__name__} - {getattr(llm, 'model', 'openai/gpt-5-nano')}")
-        tweeter = Agent(
-            role="Social Media Strategist",
-            goal="Summarise the article into a tweet for engagement",
-            backstory="You're great at distilling ideas into bite-sized, high-impact tweets.",
-            verbose=True,
-            llm=llm
-        )
-
-        # Define tasks with expected outputs
-        task1 = Task(
-            description=f"Research the topic: {topic}",
-            expected_output="A list of 3–5 key insights about the topic.",
-            agent=researcher
-        )
-
-        task2 = Task(
-            description="Write a 400-word article based on the research",
-            expected_output="A complete article, written in natural language, based on the research insights.",
-            agent=writer
-        )
-
-        task3 = Task(
-            description="Edit the article so it's twice as clear in terms of tone and structure",
-            expected_output="A refined version of the article with improved tone and readability.",
-            agent=editor
-        )
-
-        task4 = Task(
-            description="Summarise the article in a single tweet (max 280 characters)",
-            expected_output="A concise, engaging tweet that captures the article's core idea.",
-            agent=tweeter
-        )
-
-        # Create the Crew
-        crew = Crew(
-            agents=[researcher, writer, editor, tweeter],
-            tasks=[task1, task2, task3, task4],
-            verbose=True
-        )
-        
-        # Run the crew with systematic agent progress tracking
-        print("🚀 Starting CrewAI execution with systematic progress tracking...")
-        
-        # Set up systematic agent monitoring
-        agent_names = ['Research Analyst', 'Article Writer', 'Editor', 'Social Media Strategist']
-        agent_tasks = [task1, task2, task3, task4]
-        
-        # Create the full crew for execution
-        full_crew = Crew(
-            agents=[researcher, writer, editor, tweeter],
-            tasks=[task1, task2, task3, task4],
-            verbose=True
-        )
-        
-        # Execute with honest timing - all agents work simultaneously
-        print(f"🚀 User {user_id}: Starting honest CrewAI execution - all agents working simultaneously")
-        
-        # Send honest start notification
-        send_user_update(user_id, {
-            'current_step': 0,
-            'current_agent': 'AI Team',
-            'current_thought': 'All AI agents are now working simultaneously on your topic...',
-            'agent_thoughts': {},
-            'is_processing': True
-        })
-        
-        # Record actual start time
+        # Each stage starts once its inputs exist and is memoized on them; in the
+        # dag pipeline mode independent stages run at the same time
+        job_log.info("🚀 Starting staged CrewAI execution", mode=PIPELINE_MODE)
+        agent_names = AGENT_NAMES
         start_time = time.time()
-        start_timestamp = time.strftime("%H:%M:%S")
+        stages_from_cache = []
+        stage_times = {}
         
-        # Execute the complete crew workflow (all agents with proper context flow)
-        print(f"🚀 User {user_id}: Executing full crew with proper context passing")
-        crew_result = full_crew.kickoff()
-        print(f"✅ User {user_id}: Full crew execution completed")
+        job_id = user_status.get('job_id')
+        stage_positions = {stage['key']: (i, stage) for i, stage in enumerate(EDITORIAL_STAGES)}
+        graph = stage_graph(PIPELINE_MODE)
+        handoffs = {}
         
-        # Record actual completion time
-        end_time = time.time()
-        end_timestamp = time.strftime("%H:%M:%S")
-        actual_duration = end_time - start_time
-        
-        # Access individual task outputs using official CrewAI output structure
-        individual_results = []
-        if hasattr(crew_result, 'output') and crew_result.output:
-            print(f"📝 User {user_id}: Found {len(crew_result.output)} task outputs")
-            # CrewAI provides output as a list of results
-            for idx, task_output in enumerate(crew_result.output):
-                individual_results.append(str(task_output))
-                print(f"✅ User {user_id}: Captured output for task {idx}: {str(task_output)[:100]}...")
-        elif hasattr(crew_result, 'tasks_output') and crew_result.tasks_output:
-            print(f"📝 User {user_id}: Found {len(crew_result.tasks_output)} task outputs")
-            # CrewAI provides tasks_output as a list of TaskOutput objects
-            for idx, task_output in enumerate(crew_result.tasks_output):
-                # Each TaskOutput has a 'raw' attribute containing the actual output
-                if hasattr(task_output, 'raw') and task_output.raw:
-                    individual_results.append(str(task_output.raw))
-                    print(f"✅ User {user_id}: Captured output for task {idx}: {str(task_output.raw)[:100]}...")
-                elif hasattr(task_output, 'result') and task_output.result:
-                    individual_results.append(str(task_output.result))
-                    print(f"✅ User {user_id}: Captured result for task {idx}: {str(task_output.result)[:100]}...")
+        def run_pipeline_stage(key_name, inputs):
+            i, stage = stage_positions[key_name]
+            agent_name = stage['agent']['role']
+            upstream = stage_upstream(list(inputs), inputs)
+            key = stage_key(stage, topic, upstream)
+            
+            # Stages that plan from this one's first items watch its token stream
+            watchers = [handoffs.setdefault(other['key'], start_planning(other, topic))
+                        for other in EDITORIAL_STAGES
+                        if PIPELINED_HANDOFF and other.get('plan') and graph[other['key']] == [key_name]]
+            
+            def emit(event):
+                if event.kind == TOKEN:
+                    for handoff in watchers:
+                        handoff.feed(event.text)
+                publish_progress(status_key, event)
+            
+            reporter = CrewProgressReporter(job_id, i, agent_name, emit)
+            stage_start = time.time()
+            
+            agent_output = stage_cache.get(key)
+            if agent_output is None and upstream is None:
+                agent_output = find_similar_research(status_key, stage, topic)
+            
+            if agent_output is not None:
+                stages_from_cache.append(key_name)
+                job_log.info("⚡ Reusing cached stage output", agent=agent_name)
+            else:
+                reporter.started()
+                if RESEARCH_MODE == MAP_REDUCE and stage.get('map_reduce'):
+                    agent_output = run_map_reduce_research(stage, topic, reporter)
+                elif ARTICLE_MODE == LONG_FORM and 'outline' in stage.get('long_form', {}):
+                    agent_output = run_long_form_draft(stage, topic, with_plan(upstream, handoffs.get(key_name)),
+                                                       reporter)
+                elif ARTICLE_MODE == LONG_FORM and 'stitch' in stage.get('long_form', {}):
+                    # One Editor pass over the whole draft joins the separately written sections
+                    agent_output = run_stage(long_form_step(stage, 'stitch', words=LONG_FORM_WORDS), topic,
+                                             upstream, reporter)
                 else:
-                    print(f"⚠️ User {user_id}: Task {idx} output has no accessible content")
-        else:
-            print(f"⚠️ User {user_id}: No output found in crew_result, available attributes: {dir(crew_result) if crew_result else 'None'}")
-        
-        # Store results for later use
-        task_results = [crew_result] if crew_result else []
-        agent_outputs = individual_results if individual_results else []
+                    agent_output = run_stage(stage, topic, with_plan(upstream, handoffs.get(key_name)), reporter)
+                    if stage.get('map_reduce'):
+                        research_timings.record(SINGLE, time.time() - stage_start)
+                stage_cache.set(key, agent_output)
+                if upstream is None:
+                    topic_index.add(normalize_topic(topic))
+                job_log.info("✅ Stage finished", agent=agent_name,
+                             seconds=round(time.time() - stage_start, 1), output=agent_output[:100])
+            
+            # Cached stages never fire the task callback, so report them here
+            reporter.complete(agent_output)
+            stage_times[key_name] = (stage_start, time.time())
+            for handoff in watchers:
+                handoff.close()
+            return agent_output
         
-        # Send honest completion notification with real timing
-        send_user_update(user_id, {
-            'current_step': 4,
-            'current_agent': 'AI Team',
-            'current_thought': f'All AI agents completed successfully in {actual_duration:.1f} seconds!',
-            'agent_thoughts': {},
-            'is_processing': True
-        })
+        with stdout_progress(status_key):
+            outputs = run_task_graph(stage_graph(PIPELINE_MODE), run_pipeline_stage)
+            if PIPELINE_MODE == SPECULATIVE:
+                user_status['speculation'] = reconcile_speculation(outputs, stage_times, set(stages_from_cache),
+                                                                   run_pipeline_stage)
+        stage_outputs = [outputs[stage['key']] for stage in EDITORIAL_STAGES]
         
-        # Store all agent outputs with honest timestamps
-        for i, agent_name in enumerate(agent_names):
-            timestamp = end_timestamp  # All agents completed at the same time
-            if i < len(agent_outputs):
-                # Use the actual agent output from CrewAI
-                agent_output = agent_outputs[i]
-                user_status['agent_thoughts'][agent_name] = f"[{timestamp}] {agent_output}"
-                print(f"📝 User {user_id}: Stored actual output for {agent_name}: {agent_output[:100]}...")
-            else:
-                # Fallback message when individual outputs aren't available
-                user_status['agent_thoughts'][agent_name] = f"[{timestamp}] Task completed successfully with proper context flow"
-                print(f"📝 User {user_id}: Using fallback message for {agent_name}")
+        actual_duration = time.time() - start_time
         
         # Send final update with all agent outputs
-        send_user_update(user_id, {
+        send_flight_update(status_key, {
             'current_step': 4,
             'current_agent': None,
             'current_thought': f'AI Team completed in {actual_duration:.1f} seconds',
@@ -623,28 +919,35 @@ def process_crew_ai(topic, user_id):
             'is_processing': True
         })
         
-        # Combine all task results using the crew result
-        result = "\n\n".join([str(r) for r in task_results if r])
+        # The crew's final output is the last stage's output
+        result = stage_outputs[-1]
         
-        # Log the final combined result
-        print(f"📝 User {user_id}: Final combined result: {result[:200] if result else 'No result'}...")
-        print(f"📊 User {user_id}: Individual agent outputs captured: {len(agent_outputs)} out of {len(agent_names)}")
+        job_log.info("📝 Final result", result=result[:200] if result else None)
+        job_log.info("📊 Stages served from the stage cache",
+                     cached=len(stages_from_cache), total=len(agent_names))
         
         # Store the final result
         user_status['final_result'] = result
         
+        # Only cache complete runs so a hit always has every agent's output
+        if len(stage_outputs) == len(agent_names):
+            result_cache.set(result_cache_key(topic, model_name, PROMPTS_HASH), {
+                'agent_thoughts': dict(user_status['agent_thoughts']),
+                'final_result': result
+            })
+        
     except Exception as e:
         error_msg = f"Error in systematic CrewAI execution: {str(e)}"
-        print(f"❌ {error_msg}")
+        job_log.error("❌ CrewAI execution failed", error=e)
         timestamp = time.strftime("%H:%M:%S")
         
         # Store error for any incomplete agents
-        for agent_name in agent_names:
+        for agent_name in AGENT_NAMES:
             if agent_name not in user_status['agent_thoughts']:
                 user_status['agent_thoughts'][agent_name] = f"[{timestamp}] Error: {error_msg}"
         
         # Send error update
-        send_user_update(user_id, {
+        send_flight_update(status_key, {
             'current_step': user_status['current_step'],
             'current_agent': None,
             'current_thought': f"Error: {error_msg}",
@@ -671,7 +974,7 @@ def process_crew_ai(topic, user_id):
         completion_message = f"CrewAI processing finished with {agents_with_outputs} agent outputs"
     
     # Send final completion update
-    send_user_update(user_id, {
+    send_flight_update(status_key, {
         'current_step': 4,
         'current_agent': None,
         'current_thought': completion_message,
@@ -679,18 +982,178 @@ def process_crew_ai(topic, user_id):
         'is_processing': False
     })
     
-    print(f"✅ User {user_id}: CrewAI processing completed for topic: {topic}")
-    print(f"📊 Final results: {len(user_status['agent_thoughts'])} agents completed their tasks")
+    job_log.info("✅ CrewAI processing completed", topic=topic,
+                 agents_completed=len(user_status['agent_thoughts']))
+
+def send_flight_update(status_key, update_data):
+    """Send a job update to its own stream and to every job coalesced onto it"""
+    send_job_update(status_key, update_data)
+    
+    user_status = get_user_processing_status(status_key)
+    flight_key = user_status.get('flight_key') if user_status else None
+    if not flight_key:
+        return
+    
+    for follower_id in inflight_topics.followers(flight_key):
+        follower_status = get_user_processing_status(follower_id)
+        if follower_status:
+            for field in MIRRORED_STATUS_FIELDS:
+                if field in update_data:
+                    follower_status[field] = update_data[field]
+        send_job_update(follower_id, update_data)
+
+def finish_flight(status_key):
+    """Close the job's in-flight run and hand its final state to any followers"""
+    user_status = get_user_processing_status(status_key)
+    flight_key = user_status.pop('flight_key', None) if user_status else None
+    if not flight_key:
+        return
+    
+    flight = inflight_topics.finish(flight_key)
+    if not flight:
+        return
+    
+    for follower_id in flight.followers:
+        follower_status = get_user_processing_status(follower_id)
+        if not follower_status:
+            continue
+        for field in MIRRORED_STATUS_FIELDS + ('final_result', 'error', 'job_state'):
+            if field in user_status:
+                follower_status[field] = user_status[field]
+        mirror_to_owner(follower_id)
+    
+    if flight.followers:
+        job_log.info("🔗 Delivered result to coalesced requests", job_id=flight.job_id, followers=len(flight.followers))
+
+def run_scheduled_job(job):
+    """Scheduler runner: execute a queued job on a worker thread"""
+    status_key = job_key(job.job_id)
+    job_status = get_user_processing_status(status_key)
+    if job_status:
+        job_status['job_state'] = RUNNING
+        job_status['queue_position'] = 0
+    
+    # Everything logged while the job runs carries its job_id
+    with log_context(job_id=job.job_id, user_id=job.user_id):
+        try:
+            process_crew_ai(job.topic, status_key)
+        except Exception as e:
+            if job_status:
+                job_status['is_processing'] = False
+                job_status['error'] = str(e)
+                job_status['job_state'] = FAILED
+            raise
+        else:
+            if job_status:
+                job_status['job_state'] = DONE
+        finally:
+            finish_flight(status_key)
+            mirror_to_owner(status_key)
+            share_status(status_key)
+
+def on_job_queue_change(job, position):
+    """Report a waiting job's queue position over its SSE stream"""
+    status_key = job_key(job.job_id)
+    job_status = get_user_processing_status(status_key)
+    if not job_status:
+        return
+    
+    thought = f'Waiting for a free AI team... you are number {position} in the queue'
+    job_status['queue_position'] = position
+    job_status['current_thought'] = thought
+    send_flight_update(status_key, {
+        'current_step': 0,
+        'current_agent': 'AI Team',
+        'current_thought': thought,
+        'agent_thoughts': {},
+        'is_processing': True,
+        'job_id': job.job_id,
+        'job_state': QUEUED,
+        'queue_position': position
+    })
+
+# Bounded worker pool so bursts of requests queue instead of spawning unlimited crews
+job_scheduler = JobScheduler(
+    run_scheduled_job,
+    workers=int(os.getenv('MAX_CONCURRENT_JOBS', 2)),
+    max_queued=int(os.getenv('MAX_QUEUED_JOBS', 100)),
+    on_queue_change=on_job_queue_change
+)
+job_scheduler.start()
+
+def complete_from_cache(status_key, topic, cached):
+    """Finish a job with a cached run via the normal SSE completion path"""
+    job_status = get_user_processing_status(status_key)
+    completion_message = "All CrewAI tasks completed successfully! (served from cache)"
+    
+    job_status['is_processing'] = False
+    job_status['topic'] = topic
+    job_status['current_step'] = 4
+    job_status['current_agent'] = None
+    job_status['current_thought'] = completion_message
+    job_status['agent_thoughts'] = dict(cached['agent_thoughts'])
+    job_status['final_result'] = cached['final_result']
+    job_status['job_state'] = DONE
+    job_status['queue_position'] = 0
+    
+    send_job_update(status_key, {
+        'current_step': 4,
+        'current_agent': None,
+        'current_thought': completion_message,
+        'agent_thoughts': job_status['agent_thoughts'],
+        'is_processing': False,
+        'cached': True
+    })
+
+def follow_flight(user_id, status_key, topic, flight):
+    """Attach a job to an in-flight run for the same topic and report its progress"""
+    job_status = get_user_processing_status(status_key)
+    leader_status = get_user_processing_status(flight.leader) or {}
+    
+    job_status['job_state'] = leader_status.get('job_state', QUEUED)
+    job_status['queue_position'] = leader_status.get('queue_position', 0)
+    for field in MIRRORED_STATUS_FIELDS:
+        if field in leader_status:
+            job_status[field] = leader_status[field]
+    job_status['agent_thoughts'] = dict(job_status['agent_thoughts'])
+    
+    # Catch the new viewer up with the run's current state
+    send_job_update(status_key, {
+        'current_step': job_status['current_step'],
+        'current_agent': job_status['current_agent'],
+        'current_thought': job_status['current_thought'],
+        'agent_thoughts': job_status['agent_thoughts'],
+        'is_processing': job_status['is_processing'],
+        'job_id': job_status['job_id'],
+        'coalesced': True
+    })
+    
+    job_log.info("🔗 Joined in-flight job", user_id=user_id, job_id=job_status['job_id'],
+                 leader_job_id=flight.job_id, topic=topic)
+    
+    return jsonify({
+        'message': 'Content generation started',
+        'topic': topic,
+        'user_id': user_id,
+        'job_id': job_status['job_id'],
+        'job_state': job_status['job_state'],
+        'queue_position': job_status['queue_position'],
+        'coalesced': True
+    })
 
 @app.route('/api/generate-content', methods=['POST'])
 def generate_content():
     """Start the AI content generation process"""
     # Get or create user session
     user_id = get_or_create_user_session()
-    user_status = get_user_processing_status(user_id)
     
-    if user_status['is_processing']:
-        return jsonify({'error': 'You already have a request processing'}), 400
+    active_jobs = [job_status['job_id'] for job_status in get_user_jobs(user_id) if job_status['is_processing']]
+    if len(active_jobs) >= MAX_JOBS_PER_USER:
+        return jsonify({
+            'error': f'You already have {len(active_jobs)} requests processing',
+            'max_jobs': MAX_JOBS_PER_USER,
+            'active_jobs': active_jobs
+        }), 429
     
     data = request.get_json()
     topic = data.get('topic', 'How AI is transforming creative industries')
@@ -698,39 +1161,82 @@ def generate_content():
     if not topic:
         return jsonify({'error': 'Topic is required'}), 400
     
-    # Reset status for this user
-    user_status['error'] = None
+    # Every request is its own job with its own status and stream
+    job_id, job_status = create_job_state(user_id, topic)
+    status_key = job_key(job_id)
+    
+    # The user's stream now follows this job; IDs from their last job no longer replay
+    replay_log.reset(user_id)
+    
+    # Repeated topics are answered from the result cache without running the crew
+    cached = None if data.get('refresh') else result_cache.get(result_cache_key(topic, model_name, PROMPTS_HASH))
+    if cached:
+        complete_from_cache(status_key, topic, cached)
+        job_log.info("⚡ Served topic from result cache", user_id=user_id, job_id=job_id, topic=topic)
+        return jsonify({
+            'message': 'Content generation started',
+            'topic': topic,
+            'user_id': user_id,
+            'job_id': job_id,
+            'job_state': DONE,
+            'queue_position': 0,
+            'cached': True
+        })
     
-    # Immediately set processing to true to prevent race condition
-    user_status['is_processing'] = True
-    user_status['current_step'] = 0
-    user_status['current_agent'] = 'AI Team'
-    user_status['current_thought'] = 'Initializing AI Editorial team and preparing to analyze your topic...' 
-    user_status['topic'] = topic
-    user_status['agent_thoughts'] = {}
+    # Immediately mark the job processing so it counts against the user's limit
+    job_status['is_processing'] = True
+    job_status['current_step'] = 0
+    job_status['current_agent'] = 'AI Team'
+    job_status['current_thought'] = 'Initializing AI Editorial team and preparing to analyze your topic...'
+    job_status['agent_thoughts'] = {}
+    job_status['job_state'] = QUEUED
     
-    # Send immediate feedback to the user's queue
-    send_user_update(user_id, {
+    # Send immediate feedback to the job's stream
+    send_job_update(status_key, {
         'current_step': 0,
         'current_agent': 'AI Team',
         'current_thought': 'Initializing AI Editorial team and preparing to analyze your topic...',
         'agent_thoughts': {},
-        'is_processing': True
+        'is_processing': True,
+        'job_id': job_id
     })
     
-    print(f"🚀 User {user_id}: Set processing=True, starting thread for topic: {topic}")
+    # An identical topic already being processed: follow that run instead of starting another
+    flight_key = result_cache_key(topic, model_name, PROMPTS_HASH)
+    flight, is_leader = inflight_topics.join(flight_key, status_key, job_id)
+    if not is_leader:
+        return follow_flight(user_id, status_key, topic, flight)
     
-    # Start processing in a separate thread for this user
-    thread = Thread(target=process_crew_ai, args=(topic, user_id))
-    thread.daemon = True
-    thread.start()
+    job_log.info("🚀 Queueing job", user_id=user_id, job_id=job_id, topic=topic)
     
-    print(f"🔄 User {user_id}: Thread started, returning success response")
+    # Hand the run to the worker pool; it starts as soon as a worker is free
+    job_status['flight_key'] = flight_key
+    try:
+        job = job_scheduler.submit(user_id, topic, job_id=job_id)
+    except QueueFullError as e:
+        job_status['is_processing'] = False
+        job_status['job_state'] = None
+        job_status['current_thought'] = None
+        # Anyone who already joined this run is told it will not start
+        send_flight_update(status_key, {
+            'current_step': 0,
+            'current_agent': None,
+            'current_thought': 'The AI team is at capacity, please try again shortly',
+            'agent_thoughts': {},
+            'is_processing': False
+        })
+        finish_flight(status_key)
+        return jsonify({'error': 'The AI team is at capacity, please try again shortly', 'details': str(e)}), 503
+    
+    job_log.debug("🔄 Job queued, returning success response", user_id=user_id, job_id=job.job_id)
     
     return jsonify({
         'message': 'Content generation started',
         'topic': topic,
-        'user_id': user_id
+        'user_id': user_id,
+        'job_id': job.job_id,
+        'job_state': job.state,
+        'queue_position': job_scheduler.position(job.job_id)
     })
 
 @app.route('/api/status', methods=['GET'])
@@ -738,79 +1244,64 @@ def get_status():
     """Get the current processing status for the current user"""
     user_id = get_or_create_user_session()
     user_status = get_user_processing_status(user_id)
-    return jsonify(user_status)
+    return jsonify(user_status.to_dict())
 
 @app.route('/api/stream', methods=['GET', 'OPTIONS'])
 def stream_updates():
     """Stream real-time updates to the frontend for the current user"""
     # Handle preflight OPTIONS request
     if request.method == 'OPTIONS':
-        response = app.make_default_options_response()
-        headers = response.headers
-        if request.headers.get('Origin') in ['http://localhost:5173', 'https://ai-editorial-team.vercel.app']:
-            headers['Access-Control-Allow-Origin'] = request.headers.get('Origin')
-        else:
-            headers['Access-Control-Allow-Origin'] = 'https://ai-editorial-team.vercel.app'
-        headers['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
-        headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Cache-Control'
-        headers['Access-Control-Allow-Credentials'] = 'true'
-        return response
+        return stream_preflight_response()
     
     # Get user_id from query parameter or session
     user_id_param = request.args.get('user_id')
     if user_id_param:
         user_id = user_id_param
-        print(f"🔗 SSE: Using user_id from URL parameter: {user_id}")
+        sse_log.debug("🔗 SSE: Using user_id from URL parameter", user_id=user_id)
         
         # Initialize user session if it doesn't exist but was provided in URL
-        if user_id not in user_sessions:
-            print(f"🆕 USER DATA: Creating user_sessions for URL-provided {user_id}")
-            user_sessions[user_id] = {
-                'is_processing': False,
-                'current_step': 0,
-                'total_steps': 4,
-                'topic': '',
-                'result': None,
-                'error': None,
-                'agent_thoughts': {},
-                'current_agent': None,
-                'current_thought': None,
-                'created_at': datetime.now().isoformat(),
-                'last_activity': datetime.now().isoformat()
-            }
-            
-            # Create user-specific queue
-            session_queues[user_id] = queue.Queue()
-            print(f"📥 QUEUE: Created session_queues for URL-provided {user_id}")
+        ensure_user_state(user_id)
     else:
         user_id = get_or_create_user_session()
-        print(f"🔗 SSE: Using user_id from session: {user_id}")
+        sse_log.debug("🔗 SSE: Using user_id from session", user_id=user_id)
     
-    user_queue = get_user_queue(user_id)
     user_status = get_user_processing_status(user_id)
     
-    print(f"🔍 SSE: Looking for user_id {user_id}")
-    print(f"📊 SSE: user_queue exists: {user_queue is not None}")
-    print(f"📊 SSE: user_status exists: {user_status is not None}")
-    
-    if not user_queue:
-        print(f"❌ SSE: User session not found for {user_id}")
-        return jsonify({'error': 'User session not found'}), 400
+    if sse_log.enabled(DEBUG):
+        sse_log.debug("🔍 SSE: Opening stream", user_id=user_id, status_found=user_status is not None,
+                      already_watching=stream_hub.subscriber_count(user_id))
     
     if not user_status:
-        print(f"❌ SSE: User status not found for {user_id}")
+        sse_log.error("❌ SSE: User status not found", user_id=user_id)
         return jsonify({'error': 'User status not found'}), 400
     
+    return stream_response(user_id, user_status)
+
+def stream_preflight_response():
+    """CORS preflight response for the SSE endpoints"""
+    response = app.make_default_options_response()
+    headers = response.headers
+    if request.headers.get('Origin') in SSE_ALLOWED_ORIGINS:
+        headers['Access-Control-Allow-Origin'] = request.headers.get('Origin')
+    else:
+        headers['Access-Control-Allow-Origin'] = SSE_DEFAULT_ORIGIN
+    headers['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+    headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Cache-Control, Last-Event-ID'
+    headers['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+def stream_response(stream_key, stream_status):
+    """SSE response streaming a user's or a job's updates"""
     # Set CORS headers for SSE response
     origin = request.headers.get('Origin')
-    if origin in ['http://localhost:5173', 'https://ai-editorial-team.vercel.app']:
+    if origin in SSE_ALLOWED_ORIGINS:
         response_headers = {
             'Content-Type': 'text/event-stream',
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
             'Access-Control-Allow-Origin': origin,
             'Access-Control-Allow-Credentials': 'true',
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization, Cache-Control',
+            'Access-Control-Allow-Headers': 'Content-Type, Authorization, Cache-Control, Last-Event-ID',
             'Access-Control-Allow-Methods': 'GET, OPTIONS',
             'X-Accel-Buffering': 'no'  # Disable proxy buffering for real-time streaming
         }
@@ -820,79 +1311,64 @@ def stream_updates():
             'Content-Type': 'text/event-stream',
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
-            'Access-Control-Allow-Origin': 'https://ai-editorial-team.vercel.app',
+            'Access-Control-Allow-Origin': SSE_DEFAULT_ORIGIN,
             'Access-Control-Allow-Credentials': 'true',
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization, Cache-Control',
+            'Access-Control-Allow-Headers': 'Content-Type, Authorization, Cache-Control, Last-Event-ID',
             'Access-Control-Allow-Methods': 'GET, OPTIONS',
             'X-Accel-Buffering': 'no'  # Disable proxy buffering for real-time streaming
         }
     
     # Log the origin we're using for CORS
-    print(f"🔗 SSE: Using Access-Control-Allow-Origin: {response_headers['Access-Control-Allow-Origin']}")
+    sse_log.debug("🔗 SSE: Using Access-Control-Allow-Origin", origin=response_headers['Access-Control-Allow-Origin'])
+    
+    # EventSource sends Last-Event-ID when it reconnects on its own
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    
+    # Opt-in delta protocol: one snapshot, then only what changed (see delta.py)
+    delta = request.args.get('delta', '').lower() in ('1', 'true')
     
     def generate():
-        timeout_count = 0
-        max_empty_timeouts = 5  # Allow 5 seconds of no updates before sending heartbeat
-        
-        # Send an initial message to establish the connection
-        initial_data = {
-            'current_step': user_status['current_step'],
-            'current_agent': user_status['current_agent'],
-            'current_thought': user_status['current_thought'] or 'Connection established',
-            'agent_thoughts': user_status['agent_thoughts'],
-            'is_processing': user_status['is_processing'],
-            'connected': True
-        }
-        yield f"data: {json.dumps(initial_data)}\n\n"
-        
-        while True:
-            try:
-                # Wait for updates from the user's queue
-                update_data = user_queue.get(timeout=1)
-                
-                # Reset timeout counter when we get data
-                timeout_count = 0
+        # Sleep until the publisher or the heartbeat wheel wakes this stream
+        mailbox = Mailbox(limit=SSE_BACKLOG_LIMIT)
+        view = StreamView(stream_status, delta, stream_hub.subscribe(stream_key, mailbox))
+        heartbeat_wheel.add(mailbox.heartbeat)
+        try:
+            missed = replay_log.since(stream_key, last_event_id) if last_event_id else None
+            if missed is not None:
+                # Resume: send exactly the events the client has not seen
+                sse_log.info("🔁 SSE: Replaying missed events", stream_key=stream_key, missed=len(missed), after=last_event_id)
+            yield from view.opening(missed, last_event_id, replay_log.latest_id(stream_key))
+            
+            idle_heartbeats = 0
+            while not view.finished:
+                item = mailbox.get()
                 
-                # Send the update
-                yield f"data: {json.dumps(update_data)}\n\n"
+                if item is CLOSED:
+                    # Too far behind; the client reconnects and resumes via Last-Event-ID
+                    return
                 
-                # If not processing, stop the stream
-                if not update_data.get('is_processing', False):
-                    break
+                if item is HEARTBEAT:
+                    yield HEARTBEAT_COMMENT
                     
-            except queue.Empty:
-                timeout_count += 1
+                    # Nothing is processing and nothing has arrived for a while: end the stream
+                    if not stream_status['is_processing']:
+                        idle_heartbeats += 1
+                        if idle_heartbeats >= SSE_IDLE_HEARTBEATS:
+                            break
+                    continue
                 
-                # Only send heartbeat after some timeouts and if actually processing
-                if timeout_count >= max_empty_timeouts and user_status['is_processing']:
-                    # Send current user status as heartbeat
-                    status_data = {
-                        'current_step': user_status['current_step'],
-                        'current_agent': user_status['current_agent'],
-                        'current_thought': user_status['current_thought'],
-                        'agent_thoughts': user_status['agent_thoughts'],
-                        'is_processing': user_status['is_processing'],
-                        'heartbeat': True
-                    }
-                    yield f"data: {json.dumps(status_data)}\n\n"
-                    timeout_count = 0
+                idle_heartbeats = 0
                 
-                # If we've waited too long with no updates and not processing, end the stream
-                if timeout_count > 10 and not user_status['is_processing']:
-                    break
-        
-        # Prepare final status to send before closing
-        final_status = {
-            'current_step': user_status['current_step'],
-            'current_agent': user_status['current_agent'],
-            'current_thought': user_status['current_thought'],
-            'agent_thoughts': user_status['agent_thoughts'],
-            'is_processing': user_status['is_processing'],
-            'final': True
-        }
-        
-        # Send the final status before closing the stream
-        yield f"data: {json.dumps(final_status)}\n\n"
+                # Send the update (already encoded for every connection watching this stream)
+                body = view.render(item)
+                if body is not None:
+                    yield body
+            
+            # Send the final status before closing the stream
+            yield view.closing()
+        finally:
+            heartbeat_wheel.remove(mailbox.heartbeat)
+            stream_hub.unsubscribe(stream_key, mailbox)
     
     # Create response with the generator
     response = app.response_class(
@@ -906,6 +1382,62 @@ def stream_updates():
     
     return response
 
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """The current user's jobs, oldest first"""
+    user_id = get_or_create_user_session()
+    return jsonify({
+        'user_id': user_id,
+        'max_jobs': MAX_JOBS_PER_USER,
+        'jobs': [job_status.to_dict() for job_status in get_user_jobs(user_id)]
+    })
+
+@app.route('/api/jobs/<job_id>/status', methods=['GET'])
+def get_job_status(job_id):
+    """Processing status of one of the current user's jobs"""
+    user_id = get_or_create_user_session()
+    job_status = get_user_job(user_id, job_id)
+    if not job_status:
+        return jsonify({'error': 'Job not found'}), 404
+    user_sessions.touch(job_key(job_id))
+    return jsonify(job_status.to_dict())
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET', 'OPTIONS'])
+def stream_job_updates(job_id):
+    """Stream real-time updates for one of the current user's jobs"""
+    if request.method == 'OPTIONS':
+        return stream_preflight_response()
+    
+    stream_key, job_status = session_stream_target(job_id)
+    if not job_status:
+        return jsonify({'error': 'Job not found'}), 404
+    return stream_response(stream_key, job_status)
+
+def session_stream_target(job_id=None):
+    """Stream key and status for the session's own stream or one of its jobs; no status for other jobs"""
+    user_id = get_or_create_user_session()
+    if job_id is None:
+        return user_id, get_user_processing_status(user_id)
+    job_status = get_user_job(user_id, job_id)
+    if not job_status:
+        return None, None
+    user_sessions.touch(job_key(job_id))
+    return job_key(job_id), job_status
+
+def open_session_stream(path, query_string, headers):
+    """ASGI server: resolve a cookie-session or job stream with Flask's session handling.
+
+    Returns the stream key, its status and the Set-Cookie headers of a
+    session created on the way.
+    """
+    environ = EnvironBuilder(path=path, query_string=query_string, headers=headers).get_environ()
+    with app.request_context(environ):
+        stream_key, stream_status = session_stream_target((request.view_args or {}).get('job_id'))
+        response = app.response_class()
+        app.session_interface.save_session(app, session, response)
+        cookies = [(name, value) for name, value in response.headers.items() if name.lower() == 'set-cookie']
+        return stream_key, stream_status, cookies
+
 @app.route('/api/test-simple-crew', methods=['POST'])
 def test_simple_crew_execution():
     """Test a simple single-agent crew execution"""
@@ -1039,33 +1571,53 @@ def debug_status():
     
     return jsonify({
         'user_id': user_id,
-        'user_status': user_status,
+        'user_status': user_status.to_dict(),
         'current_time': time.time(),
         'total_active_users': len(user_sessions),
-        'all_user_ids': list(user_sessions.keys())
+        'all_user_ids': user_sessions.ids()
     })
 
 @app.route('/api/test-process', methods=['GET'])
 def test_process():
     """Test endpoint to manually trigger processing for debugging"""
     user_id = get_or_create_user_session()
-    user_status = get_user_processing_status(user_id)
     
-    if user_status['is_processing']:
+    if any(job_status['is_processing'] for job_status in get_user_jobs(user_id)):
         return jsonify({'error': 'You already have a process running'})
     
-    # Start a test process for this user
-    thread = Thread(target=process_crew_ai, args=('Test Topic', user_id))
-    thread.daemon = True
-    thread.start()
+    # Queue a test process for this user on the shared worker pool
+    job_id, job_status = create_job_state(user_id, 'Test Topic')
+    replay_log.reset(user_id)
+    try:
+        job = job_scheduler.submit(user_id, 'Test Topic', job_id=job_id)
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    job_status['job_state'] = job.state
     
-    return jsonify({'message': 'Test process started', 'user_id': user_id})
+    return jsonify({'message': 'Test process started', 'user_id': user_id, 'job_id': job.job_id})
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Result cache hit rate and size"""
+    return jsonify({
+        'results': result_cache.stats(),
+        'stages': stage_cache.stats()
+    })
+
+@app.route('/api/jobs/stats', methods=['GET'])
+def job_stats():
+    """Worker pool and queue utilisation"""
+    return jsonify(dict(job_scheduler.stats(), updates=update_coalescer.stats(), streams=stream_hub.stats(),
+                        speculation=speculation_stats.stats(), research=research_timings.stats()))
 
 @app.route('/api/users', methods=['GET'])
 def get_active_users():
     """Get all active users and their processing status (for debugging)"""
     active_users = {}
-    for user_id, user_data in user_sessions.items():
+    for user_id, user_record in user_sessions.items():
+        if user_record.get('owner'):
+            continue  # A job's own record, listed under /api/jobs
+        user_data = user_record.to_dict()
         active_users[user_id] = {
             'is_processing': user_data['is_processing'],
             'topic': user_data['topic'],
@@ -1080,6 +1632,47 @@ def get_active_users():
         'users': active_users
     })
 
+def cleanup_task():
+    """Periodically expire sessions (with their streams and buffered events) and cached results"""
+    while True:
+        cleanup_old_sessions()
+        if isinstance(app.session_interface, SQLiteSessionInterface):
+            app.session_interface.purge_expired()
+        result_cache.purge_expired()
+        stage_cache.purge_expired()
+        time.sleep(300) # Check every 5 minutes
+
+cleanup_thread = None
+cleanup_lock = Lock()
+
+def start_cleanup_thread():
+    """Start the cleanup sweeper once per process, however the app is served"""
+    global cleanup_thread
+    with cleanup_lock:
+        if cleanup_thread is None:
+            cleanup_thread = Thread(target=cleanup_task, name='session-cleanup', daemon=True)
+            cleanup_thread.start()
+
+# Started on import so gunicorn (app:app), uvicorn (asgi:application) and python app.py all sweep
+start_cleanup_thread()
+
+def create_asgi_app():
+    """ASGI entry point: async /api/stream and job streams, everything else served by Flask"""
+    from asgiref.wsgi import WsgiToAsgi
+    return AsyncSSEApp(
+        hub=stream_hub,
+        get_status=get_user_processing_status,
+        ensure_user=ensure_user_state,
+        fallback=WsgiToAsgi(app),
+        replay_log=replay_log,
+        backlog_limit=SSE_BACKLOG_LIMIT,
+        heartbeat_interval=SSE_HEARTBEAT_SECONDS,
+        idle_heartbeats=SSE_IDLE_HEARTBEATS,
+        open_session_stream=open_session_stream,
+        allowed_origins=SSE_ALLOWED_ORIGINS,
+        default_origin=SSE_DEFAULT_ORIGIN
+    )
+
 if __name__ == '__main__':
     print("🚀 Starting AI Editorial Team Backend...")
     print("📝 This backend integrates with your existing CrewAI Python code")
@@ -1088,15 +1681,10 @@ if __name__ == '__main__':
     
     # Get port from environment variable (Render provides PORT)
     port = int(os.getenv('PORT', 5001))
-    
-    # Set up a periodic task to clean up old sessions
-    def cleanup_task():
-        while True:
-            cleanup_old_sessions()
-            time.sleep(300) # Check every 5 minutes
-    
-    cleanup_thread = Thread(target=cleanup_task)
-    cleanup_thread.daemon = True
-    cleanup_thread.start()
 
-    app.run(debug=False, host='0.0.0.0', port=port)
+    if os.getenv('SERVER_MODE', 'wsgi').lower() == 'asgi':
+        # Async SSE streams: idle clients cost a coroutine instead of a thread
+        import uvicorn
+        uvicorn.run(create_asgi_app(), host='0.0.0.0', port=port)
+    else:
+        app.run(debug=False, host='0.0.0.0', port=port)
@@ -0,0 +1,7 @@
+"""ASGI entry point for async SSE serving.
+
+    uvicorn asgi:application --host 0.0.0.0 --port $PORT
+"""
+from app import create_asgi_app
+
+application = create_asgi_app()
@@ -0,0 +1,211 @@
+"""Async (ASGI) serving of the SSE stream endpoint.
+
+Under WSGI every connected ``/api/stream`` client pins a worker thread for
+the whole run. ``AsyncSSEApp`` serves that endpoint and the per-job
+streams natively on asyncio so an idle client costs a coroutine and a
+queue, and hands every other request to the regular Flask app (wrapped
+for ASGI).
+
+Updates are still published from worker threads into the shared
+``StreamHub`` (see fanout.py); each stream's ``AsyncMailbox`` forwards them
+onto the event loop with ``call_soon_threadsafe``. Streams can resume after
+a reconnect (see replay.py).
+"""
+import asyncio
+import json
+import re
+from typing import Callable, Optional
+from urllib.parse import parse_qs
+
+from fanout import StreamHub, StreamView
+from notify import AsyncMailbox, TimerWheel, HEARTBEAT, CLOSED, HEARTBEAT_COMMENT, fire_due
+
+HEARTBEAT_BYTES = HEARTBEAT_COMMENT.encode('utf-8')
+
+# Per-job streams, always opened with the session cookie
+JOB_STREAM_PATH = re.compile(r'/api/jobs/[^/]+/stream')
+
+
+class AsyncSSEApp:
+    """ASGI app serving ``path`` as an async SSE stream and delegating the rest.
+
+    ``get_status(user_id)`` returns the user's live status dict (or None) and
+    ``ensure_user(user_id)`` creates state for a user ID given in the URL.
+    Streams without a ``user_id`` query parameter, and job streams, rely on
+    the session cookie: ``open_session_stream(path, query_string, headers)``
+    resolves them on a thread (sessions may live in files or SQLite) and
+    returns ``(stream_key, status, response_headers)``, with a None status
+    for a stream the session may not open. Without it they are passed
+    through to ``fallback`` unchanged. With a
+    ``replay_log``, a ``Last-Event-ID`` resumes the stream after the last
+    event the client saw; ``?delta=1`` selects the delta protocol. Any
+    number of streams may watch one user; a stream whose backlog reaches
+    ``backlog_limit`` is disconnected.
+    """
+
+    def __init__(self, hub: StreamHub, get_status: Callable, ensure_user: Callable,
+                 fallback, allowed_origins, default_origin: str,
+                 path: str = '/api/stream', heartbeat_interval: float = 5.0,
+                 idle_heartbeats: int = 2, replay_log=None, backlog_limit: Optional[int] = None,
+                 open_session_stream: Optional[Callable] = None):
+        self.hub = hub
+        self.get_status = get_status
+        self.ensure_user = ensure_user
+        self.open_session_stream = open_session_stream
+        self.fallback = fallback
+        self.allowed_origins = set(allowed_origins)
+        self.default_origin = default_origin
+        self.path = path
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_heartbeats = idle_heartbeats
+        self.replay_log = replay_log
+        self.backlog_limit = backlog_limit
+        # One wheel on the event loop wakes every stream for its heartbeat
+        self.heartbeats = TimerWheel(interval=heartbeat_interval)
+        self._heartbeat_task = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            path = scope['path']
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            user_id = (query.get('user_id') or [None])[0] if path == self.path else None
+            if user_id:
+                user_status = self.get_status(user_id) or self.ensure_user(user_id)
+                await self._stream(user_id, user_status, query, scope, receive, send)
+                return
+            if self.open_session_stream and (path == self.path or JOB_STREAM_PATH.fullmatch(path)):
+                await self._session_stream(query, scope, receive, send)
+                return
+
+        await self.fallback(scope, receive, send)
+
+    async def _session_stream(self, query, scope, receive, send):
+        headers = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope.get('headers', ())]
+        stream_key, stream_status, response_headers = await asyncio.get_running_loop().run_in_executor(
+            None, self.open_session_stream, scope['path'], scope.get('query_string', b'').decode('latin-1'), headers)
+        extra_headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                         for name, value in response_headers]
+        if stream_status is None:
+            await self._error(404, 'Stream not found', extra_headers, send)
+            return
+        await self._stream(stream_key, stream_status, query, scope, receive, send, extra_headers)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._start_heartbeats()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._heartbeat_task is not None:
+                    self._heartbeat_task.cancel()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _start_heartbeats(self):
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.ensure_future(self._drive_heartbeats())
+
+    async def _drive_heartbeats(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.heartbeats.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            fire_due(self.heartbeats)
+
+    @staticmethod
+    async def _error(status, message, headers, send):
+        body = json.dumps({'error': message}).encode('utf-8')
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json')] + list(headers)})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _response_headers(self, scope):
+        origin = None
+        for name, value in scope.get('headers', ()):
+            if name == b'origin':
+                origin = value.decode('latin-1')
+                break
+        allow_origin = origin if origin in self.allowed_origins else self.default_origin
+        return [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'access-control-allow-origin', allow_origin.encode('latin-1')),
+            (b'access-control-allow-credentials', b'true'),
+            (b'access-control-allow-headers', b'Content-Type, Authorization, Cache-Control, Last-Event-ID'),
+            (b'access-control-allow-methods', b'GET, OPTIONS'),
+            (b'x-accel-buffering', b'no'),
+        ]
+
+    async def _stream(self, user_id, user_status, query, scope, receive, send, extra_headers=()):
+        if not user_status:
+            await self._error(400, 'User session not found', extra_headers, send)
+            return
+
+        last_event_id = (query.get('last_event_id') or [None])[0]
+        for name, value in scope.get('headers', ()):
+            if name == b'last-event-id':
+                last_event_id = value.decode('latin-1')
+                break
+        delta = (query.get('delta') or [''])[0].lower() in ('1', 'true')
+
+        mailbox = AsyncMailbox(asyncio.get_running_loop(), self.backlog_limit)
+        view = StreamView(user_status, delta, self.hub.subscribe(user_id, mailbox))
+
+        async def send_body(body):
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+        async def watch_disconnect():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    mailbox.close()
+                    return
+
+        # The stream sleeps on its mailbox; updates, heartbeats and disconnects all arrive there
+        watcher = asyncio.ensure_future(watch_disconnect())
+        self._start_heartbeats()
+        self.heartbeats.add(mailbox.heartbeat)
+        try:
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': self._response_headers(scope) + list(extra_headers)})
+
+            missed = None
+            if self.replay_log is not None and last_event_id:
+                missed = self.replay_log.since(user_id, last_event_id)
+            snapshot_id = self.replay_log.latest_id(user_id) if self.replay_log is not None else None
+            for body in view.opening(missed, last_event_id, snapshot_id):
+                await send_body(body)
+
+            idle_heartbeats = 0
+            while not view.finished:
+                item = await mailbox.get()
+                if item is CLOSED:
+                    # Disconnected, or too far behind: the client resumes via Last-Event-ID
+                    return
+
+                if item is HEARTBEAT:
+                    await send_body(HEARTBEAT_BYTES)
+                    # Nothing is processing and nothing has arrived for a while: end the stream
+                    if not user_status['is_processing']:
+                        idle_heartbeats += 1
+                        if idle_heartbeats >= self.idle_heartbeats:
+                            break
+                    continue
+
+                idle_heartbeats = 0
+                body = view.render(item)
+                if body is not None:
+                    await send_body(body)
+
+            await send_body(view.closing())
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            self.heartbeats.remove(mailbox.heartbeat)
+            self.hub.unsubscribe(user_id, mailbox)
+            watcher.cancel()
@@ -0,0 +1,80 @@
+"""Cross-process update delivery through RedisBroker.
+
+Two brokers play a job worker and a stream worker sharing one server (the
+bundled RESP stand-in unless ``--url`` names a real Redis). Checks state
+sharing, ordering and the local/remote flag, then reports publish-to-deliver
+latency and throughput.
+
+    python benchmarks/bench_broker.py [--updates 5000] [--url redis://localhost:6379/0]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from broker import RedisBroker
+from resp_standin import start_in_thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--updates', type=int, default=5000)
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--port', type=int, default=6391)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        start_in_thread(port=args.port)
+        url = f"redis://127.0.0.1:{args.port}/0"
+
+    job_worker = RedisBroker(url, prefix='bench')
+    stream_worker = RedisBroker(url, prefix='bench')
+    received = []
+    local_on_job_worker = []
+    all_received = threading.Event()
+
+    def on_stream_worker(channel, data, local, event_id):
+        received.append((time.perf_counter() - data['sent_at'], data['seq'], local, channel, event_id))
+        if len(received) == args.updates:
+            all_received.set()
+
+    job_worker.listen(lambda channel, data, local, event_id: local_on_job_worker.append(local))
+    stream_worker.listen(on_stream_worker)
+    assert job_worker.start() and stream_worker.start(), 'subscription failed'
+
+    job_worker.set_state('user-1', {'current_step': 2, 'is_processing': True}, ttl=60)
+    assert stream_worker.get_state('user-1') == {'current_step': 2, 'is_processing': True}
+    assert stream_worker.get_state('missing') is None
+
+    start = time.perf_counter()
+    for seq in range(args.updates):
+        job_worker.publish('user-1', {'seq': seq, 'sent_at': time.perf_counter(),
+                                      'current_thought': 'x' * 120, 'is_processing': True},
+                           event_id=f"bench-{seq + 1}")
+    publish_elapsed = time.perf_counter() - start
+    assert all_received.wait(30), f'only {len(received)}/{args.updates} updates arrived'
+    total_elapsed = time.perf_counter() - start
+
+    assert [seq for _, seq, _, _, _ in received] == list(range(args.updates)), 'updates out of order'
+    assert not any(local for _, _, local, _, _ in received), 'remote updates flagged local'
+    assert {channel for _, _, _, channel, _ in received} == {'user-1'}
+    assert [event_id for *_, event_id in received] == [f"bench-{seq + 1}" for seq in range(args.updates)]
+    assert local_on_job_worker and all(local_on_job_worker), 'own updates not flagged local'
+
+    latencies = sorted(received_item[0] for received_item in received)
+    print(f"📡 {args.updates:,} updates via {url}")
+    print(f"   publish: {args.updates / publish_elapsed:,.0f}/s, delivered: {args.updates / total_elapsed:,.0f}/s")
+    print(f"   latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print("✅ State sharing, ordering, origin flags and event IDs check out")
+
+    job_worker.close()
+    stream_worker.close()
+
+
+if __name__ == '__main__':
+    main()
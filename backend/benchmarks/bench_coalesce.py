@@ -0,0 +1,116 @@
+"""Progress updates published per job with and without coalescing.
+
+Feeds a paced replay of the recorded verbose CrewAI log through
+CrewAIOutputCapture, followed by a burst of streamed tokens, into
+UpdateCoalescer. Reports how many updates were serialized and written, and
+checks that coalescing delivered every state transition and every token.
+
+    python benchmarks/bench_coalesce.py [--rate 300] [--tokens 600] [--window-ms 100]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coalesce import UpdateCoalescer, TRANSITION_FIELDS
+from output_capture import CrewAIOutputCapture
+
+AGENT_NAMES = ['Research Analyst', 'Article Writer', 'Editor', 'Social Media Strategist']
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'crewai_verbose.log')
+
+
+class NullStream:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def run(lines, tokens, rate, window):
+    delivered = []
+    serialize_seconds = 0.0
+
+    def deliver(user_id, update):
+        nonlocal serialize_seconds
+        start = time.perf_counter()
+        payload = json.dumps(update)
+        serialize_seconds += time.perf_counter() - start
+        delivered.append((update, len(payload)))
+
+    coalescer = UpdateCoalescer(deliver, window=window)
+    coalescer.start()
+    status = {'current_step': 0, 'current_agent': None, 'current_thought': None,
+              'agent_thoughts': {}, 'is_processing': True}
+    capture = CrewAIOutputCapture(NullStream(), AGENT_NAMES, 'bench-user',
+                                  lambda user_id: status, coalescer.submit)
+
+    interval = 1.0 / rate
+    next_at = time.perf_counter()
+    for line in lines:
+        capture.write(line)
+        capture.write('\n')
+        next_at += interval
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+
+    for index in range(tokens):
+        coalescer.submit('bench-user', {'current_step': 3, 'current_agent': AGENT_NAMES[3],
+                                        'is_processing': True, 'event': 'token', 'token': f' t{index}'})
+        next_at += interval
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+
+    coalescer.submit('bench-user', {'current_step': 4, 'current_agent': None, 'current_thought': 'done',
+                                    'agent_thoughts': status['agent_thoughts'], 'is_processing': False})
+    coalescer.shutdown()
+    return delivered, serialize_seconds, coalescer.stats()
+
+
+def transitions(delivered):
+    seen = []
+    state = {}
+    for update, _ in delivered:
+        changed = {field: update[field] for field in TRANSITION_FIELDS
+                   if field in update and state.get(field) != update[field]}
+        if changed:
+            state.update(changed)
+            seen.append(tuple(sorted(changed.items(), key=lambda item: item[0])))
+    return seen
+
+
+def streamed_text(delivered):
+    return ''.join(update.get('token', '') for update, _ in delivered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rate', type=float, default=300, help='log lines / tokens per second')
+    parser.add_argument('--tokens', type=int, default=600)
+    parser.add_argument('--window-ms', type=float, default=100)
+    parser.add_argument('--log', default=DEFAULT_LOG)
+    args = parser.parse_args()
+
+    with open(args.log, encoding='utf-8') as log_file:
+        lines = log_file.read().splitlines()
+
+    results = {}
+    for label, window in (('uncoalesced', 0), (f"{args.window_ms:g} ms window", args.window_ms / 1000)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            delivered, serialize_seconds, stats = run(lines, args.tokens, args.rate, window)
+        results[label] = delivered
+        print(f"📨 {label}: {stats['submitted']:,} submitted -> {len(delivered):,} published, "
+              f"{sum(size for _, size in delivered) / 1024:,.1f} KB serialized in {serialize_seconds * 1000:.1f} ms")
+
+    plain, merged = results.values()
+    assert transitions(plain) == transitions(merged), 'coalescing lost a state transition'
+    assert streamed_text(plain) == streamed_text(merged), 'coalescing lost streamed tokens'
+    print(f"✅ All {len(transitions(plain))} state transitions and every token delivered "
+          f"({len(plain) / len(merged):.1f}x fewer publishes)")
+
+
+if __name__ == '__main__':
+    main()
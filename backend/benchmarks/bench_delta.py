@@ -0,0 +1,108 @@
+"""Bytes on the wire per job: full SSE updates vs the delta protocol.
+
+Replays the update sequence of one four-stage job as publish_progress
+produces it (stage start, agent steps, streamed tokens, stage output stored
+in agent_thoughts, heartbeats while waiting), encodes it both ways and
+checks that decoding the delta stream reproduces every legacy update.
+
+    python benchmarks/bench_delta.py [--output-chars 6000] [--tokens 1500]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delta import DeltaEncoder, apply_delta
+from stages import AGENT_NAMES
+
+WORDS = ('the', 'creative', 'industries', 'model', 'artists', 'workflow', 'generative',
+         'design', 'studio', 'audience', 'tools', 'music', 'film', 'writers', 'future')
+
+
+def prose(rng, chars):
+    words = []
+    while sum(len(word) + 1 for word in words) < chars:
+        words.append(rng.choice(WORDS))
+    return ' '.join(words)[:chars]
+
+
+def job_updates(output_chars, tokens_per_stage, steps_per_stage, heartbeats_per_stage, seed=7):
+    """The sequence of update dicts one job sends to its stream"""
+    rng = random.Random(seed)
+    job_id = 'b3f1c2d4-0000-4000-8000-000000000000'
+    status = {'current_step': 0, 'current_agent': 'AI Team', 'agent_thoughts': {},
+              'current_thought': 'Initializing AI Editorial team and preparing to analyze your topic...',
+              'is_processing': True}
+    yield dict(status, connected=True)
+    yield dict(status)
+
+    def snapshot(**extra):
+        return dict(status, agent_thoughts=status['agent_thoughts'], **extra)
+
+    for step, agent in enumerate(AGENT_NAMES):
+        status.update(current_step=step, current_agent=agent,
+                      current_thought=f"{agent} is beginning their task...")
+        yield snapshot(event='stage_started', job_id=job_id)
+
+        # Tokens, agent steps and heartbeats interleaved as they arrive during the stage
+        kinds = ['token'] * tokens_per_stage + ['step'] * steps_per_stage + ['heartbeat'] * heartbeats_per_stage
+        rng.shuffle(kinds)
+        for kind in kinds:
+            if kind == 'token':
+                yield {'current_step': step, 'current_agent': agent, 'is_processing': True,
+                       'event': 'token', 'job_id': job_id, 'token': ' ' + rng.choice(WORDS)}
+            elif kind == 'step':
+                status['current_thought'] = f"{agent}: {prose(rng, 120)}"
+                yield snapshot(event='agent_step', job_id=job_id)
+            else:
+                yield snapshot(heartbeat=True)
+
+        status['agent_thoughts'] = dict(status['agent_thoughts'])
+        status['agent_thoughts'][agent] = f"[12:00:0{step}] {prose(rng, output_chars)}"
+        status['current_thought'] = f"{agent} has completed their task"
+        yield snapshot(event='stage_completed', job_id=job_id)
+
+    status.update(current_step=4, current_agent=None, is_processing=False,
+                  current_thought='All CrewAI tasks completed successfully!')
+    yield snapshot()
+    yield snapshot(final=True)
+
+
+def frame(payload):
+    return len(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output-chars', type=int, default=6000, help='characters per stage output')
+    parser.add_argument('--tokens', type=int, default=1500, help='streamed tokens per stage')
+    parser.add_argument('--steps', type=int, default=8, help='agent steps per stage')
+    parser.add_argument('--heartbeats', type=int, default=12, help='heartbeats per stage')
+    args = parser.parse_args()
+
+    for tokens in (0, args.tokens):
+        updates = list(job_updates(args.output_chars, tokens, args.steps, args.heartbeats))
+        encoder = DeltaEncoder()
+        client_state = {}
+        legacy_bytes = delta_bytes = 0
+        for update in updates:
+            message = encoder.encode(update)
+            legacy_bytes += frame(update)
+            delta_bytes += frame(message)
+
+            decoded = apply_delta(client_state, json.loads(json.dumps(message)))
+            mismatched = [field for field, value in update.items() if decoded.get(field) != value]
+            assert not mismatched, f"delta stream diverged on {mismatched}"
+
+        label = f"{tokens:,} streamed tokens/stage" if tokens else 'no token streaming'
+        print(f"📦 {len(updates):,} updates ({label}): "
+              f"full {legacy_bytes / 1024:,.1f} KB, delta {delta_bytes / 1024:,.1f} KB "
+              f"({legacy_bytes / delta_bytes:.1f}x smaller)")
+    print("✅ Decoded delta stream matches every full update")
+
+
+if __name__ == '__main__':
+    main()
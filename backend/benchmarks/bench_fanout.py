@@ -0,0 +1,142 @@
+"""Cost of delivering one job's updates to many viewers of the same stream.
+
+Replays the update sequence from bench_delta.py to ``--viewers`` streams of
+one user (half on the delta protocol, one of them joining mid-run) two
+ways: every stream encoding and serializing each update itself, as before,
+and StreamHub encoding each update once for all of them. Checks that every
+stream decodes to the job's final state, then shows a stalled viewer being
+disconnected once its backlog reaches the limit.
+
+    python benchmarks/bench_fanout.py [--viewers 200] [--backlog 1000]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_delta import job_updates
+from delta import DeltaEncoder, apply_delta
+from fanout import StreamHub, StreamView, STATUS_FIELDS, sse_frame
+from notify import Mailbox
+
+USER = 'bench-user'
+
+
+def updates_for_job(args):
+    # Drop the per-connection first and last messages; streams build those themselves
+    updates = list(job_updates(args.output_chars, args.tokens, args.steps, args.heartbeats))[1:-1]
+    return [(f"1-{index}", update) for index, update in enumerate(updates, 1)]
+
+
+def per_stream(updates, viewers):
+    """Every stream encodes and serializes every update on its own"""
+    encoders = [DeltaEncoder() if index % 2 else None for index in range(viewers)]
+    for encoder in encoders:
+        if encoder is not None:
+            encoder.resume()
+    written = 0
+    start = time.process_time()
+    for event_id, update in updates:
+        for encoder in encoders:
+            payload = encoder.encode(update) if encoder is not None else update
+            written += len(sse_frame(payload, event_id))
+    return time.process_time() - start, written
+
+
+def shared(updates, viewers, backlog, late_at):
+    """StreamHub encodes each update once; every stream writes the same bytes"""
+    hub = StreamHub()
+    status = {'current_step': 0, 'current_agent': None, 'current_thought': None,
+              'agent_thoughts': {}, 'is_processing': True}
+    streams = []
+
+    def join(delta):
+        mailbox = Mailbox(limit=backlog)
+        view = StreamView(status, delta, hub.subscribe(USER, mailbox))
+        streams.append((mailbox, view, view.opening(None)))
+
+    for index in range(viewers - 1):
+        join(bool(index % 2))
+
+    written = 0
+    start = time.process_time()
+    for position, (event_id, update) in enumerate(updates):
+        if position == late_at:
+            join(True)
+        status.update({field: update[field] for field in STATUS_FIELDS if field in update})
+        hub.publish(USER, event_id, update)
+        for mailbox, view, sent in streams:
+            while len(mailbox):
+                body = view.render(mailbox.get())
+                if body is not None:
+                    sent.append(body)
+                    written += len(body)
+    elapsed = time.process_time() - start
+
+    for mailbox, view, sent in streams:
+        sent.append(view.closing())
+        hub.unsubscribe(USER, mailbox)
+    return elapsed, written, streams, hub.stats()
+
+
+def decoded_final_state(sent, delta):
+    state = {}
+    full = {}
+    for body in sent:
+        payload = json.loads(body.decode('utf-8').split('data: ', 1)[1])
+        full = apply_delta(state, payload) if delta else payload
+    return {field: full.get(field) for field in STATUS_FIELDS}
+
+
+def stalled_viewer(updates, backlog):
+    hub = StreamHub()
+    reader, stalled = Mailbox(limit=backlog), Mailbox(limit=backlog)
+    hub.subscribe(USER, reader)
+    hub.subscribe(USER, stalled)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for event_id, update in updates:
+            hub.publish(USER, event_id, update)
+            while len(reader):
+                reader.get()
+    return hub.stats(), stalled.overflowed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--viewers', type=int, default=200)
+    parser.add_argument('--backlog', type=int, default=1000, help='SSE_BACKLOG_LIMIT')
+    parser.add_argument('--output-chars', type=int, default=6000)
+    parser.add_argument('--tokens', type=int, default=150, help='streamed tokens per stage')
+    parser.add_argument('--steps', type=int, default=8, help='agent steps per stage')
+    parser.add_argument('--heartbeats', type=int, default=4, help='legacy heartbeats per stage')
+    args = parser.parse_args()
+
+    updates = updates_for_job(args)
+    final = {field: value for field, value in updates[-1][1].items() if field in STATUS_FIELDS}
+    print(f"🧪 {len(updates):,} updates, {args.viewers} viewers (half delta, one joining mid-run)")
+
+    alone_seconds, alone_bytes = per_stream(updates, args.viewers)
+    print(f"🐢 Per-stream encoding: {alone_seconds * 1000:,.0f} ms CPU, {alone_bytes / 1024 / 1024:,.1f} MB built")
+
+    hub_seconds, hub_bytes, streams, stats = shared(updates, args.viewers, args.backlog, len(updates) // 2)
+    print(f"🚀 Shared StreamHub: {hub_seconds * 1000:,.0f} ms CPU, {hub_bytes / 1024 / 1024:,.1f} MB written "
+          f"({alone_seconds / hub_seconds:.1f}x less CPU; {stats['published']:,} frames, "
+          f"{stats['deliveries']:,} deliveries)")
+
+    for mailbox, view, sent in streams:
+        assert decoded_final_state(sent, view.delta) == final, 'a stream decoded to the wrong final state'
+    print(f"✅ All {len(streams)} streams decode to the job's final state")
+
+    stats, overflowed = stalled_viewer(updates, min(args.backlog, len(updates) // 2))
+    assert overflowed and stats['overflows'] == 1 and stats['subscribers'] == 1
+    print(f"✂️  A stalled viewer was disconnected at its backlog limit; the other kept receiving "
+          f"({stats['deliveries']:,} deliveries)")
+
+
+if __name__ == '__main__':
+    main()
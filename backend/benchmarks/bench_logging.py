@@ -0,0 +1,92 @@
+"""Update throughput with the old debug prints vs leveled, sampled logging.
+
+Publishes ``--updates`` progress updates through the same path as
+publish_user_update (replay numbering, StreamHub fan-out to one open
+stream) with ``--users`` sessions active, logging each update four ways:
+the four prints it used to make, and the structured logger at the default
+INFO level, at DEBUG sampled 1 in 100, and at DEBUG for every update.
+Log output goes to /dev/null, so the numbers are the cost of producing it.
+
+    python benchmarks/bench_logging.py [--updates 50000] [--users 1000]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logs
+from fanout import StreamHub
+from notify import Mailbox
+from replay import ReplayLog
+from sessions import SessionRegistry
+
+
+def build(users):
+    sessions = SessionRegistry()
+    for index in range(users):
+        sessions.get_or_create(f"user-{index}")
+    hub = StreamHub()
+    mailbox = Mailbox()
+    hub.subscribe('user-0', mailbox)
+    return sessions, hub, mailbox, ReplayLog(capacity=1000)
+
+
+def run(label, updates, users, log_update):
+    sessions, hub, mailbox, replay_log = build(users)
+    user_id = 'user-0'
+    update = {'current_step': 1, 'current_agent': 'Research Analyst', 'is_processing': True,
+              'current_thought': 'Research Analyst: looking into recent studies on generative tools'}
+    start = time.perf_counter()
+    for _ in range(updates):
+        log_update(sessions, hub, user_id, update)
+        event_id = replay_log.append(user_id, update)
+        hub.publish(user_id, event_id, update)
+        mailbox.get()
+    return time.perf_counter() - start
+
+
+def report(label, updates, elapsed, baseline):
+    print(f"📨 {label:<22}: {updates / elapsed:>9,.0f} updates/s ({elapsed / updates * 1e6:,.1f} µs each, "
+          f"{baseline / elapsed:.1f}x the old prints)", file=sys.__stdout__)
+
+
+def old_prints(sessions, hub, user_id, update_data):
+    print(f"🔍 SSE DEBUG: Looking for user_id {user_id}")
+    print(f"📊 SSE DEBUG: Available session_queues: {sessions.ids()}")
+    print(f"📊 SSE DEBUG: Available user_sessions: {sessions.ids()}")
+    print(f"🔄 SSE: Sending update to user {user_id}: {update_data.get('current_agent', 'Unknown')} - "
+          f"{(update_data.get('current_thought') or 'No thought')[:50]}...")
+
+
+def structured(log):
+    def log_update(sessions, hub, user_id, update_data):
+        # As in publish_user_update
+        if log.enabled(logs.DEBUG):
+            log.sampled('update', logs.DEBUG, "🔄 SSE: Sending update", user_id=user_id,
+                        agent=update_data.get('current_agent'),
+                        thought=(update_data.get('current_thought') or '')[:50])
+    return log_update
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--updates', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=1000, help='active sessions listed by the old prints')
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        baseline = run('old prints', args.updates, args.users, old_prints)
+        report('old prints', args.updates, baseline, baseline)
+        for label, level, every in (('INFO (default)', 'INFO', 100),
+                                    ('DEBUG, sampled 1/100', 'DEBUG', 100),
+                                    ('DEBUG, every update', 'DEBUG', 1)):
+            logs.configure(level=level, stream=devnull)
+            log = logs.Logger('sse', sample_every=every)
+            report(label, args.updates, run(label, args.updates, args.users, structured(log)), baseline)
+
+
+if __name__ == '__main__':
+    main()
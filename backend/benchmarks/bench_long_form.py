@@ -0,0 +1,68 @@
+"""Long-form article wall time: one writer against parallel sections.
+
+Simulates the LLM calls with sleeps (seconds scaled by ``--scale``). A
+writer produces ``--words-per-second`` words, so the single-pass baseline
+takes ``--words`` divided by that. The long-form mode takes ``--outline``
+seconds to outline, drafts every section through ``run_each`` on the given
+pool (each section's length varies by up to ``--spread``), then the Editor
+stitches the whole article at ``--edit-words-per-second``. The stitch pass
+runs in both modes. Every combination of ``--sections`` and ``--workers``
+is reported next to its longest section.
+
+    python benchmarks/bench_long_form.py [--sections 3 5 8] [--workers 1 3 8]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handoff import list_items
+from taskgraph import run_each
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=2000)
+    parser.add_argument('--words-per-second', type=float, default=25)
+    parser.add_argument('--edit-words-per-second', type=float, default=60)
+    parser.add_argument('--outline', type=float, default=4)
+    parser.add_argument('--spread', type=float, default=0.3)
+    parser.add_argument('--sections', type=int, nargs='+', default=[3, 5, 8])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 3, 8])
+    parser.add_argument('--scale', type=float, default=0.01)
+    args = parser.parse_args()
+    rng = random.Random(1)
+    stitch_seconds = args.words / args.edit_words_per_second
+
+    start = time.time()
+    time.sleep((args.words / args.words_per_second + stitch_seconds) * args.scale)
+    single_seconds = (time.time() - start) / args.scale
+    print(f"✍️  single pass: {single_seconds:.1f}s for {args.words} words")
+
+    for count in args.sections:
+        outline = '\n'.join(f"{index + 1}. Section {index + 1}" for index in range(count))
+        section_words = [args.words / count * rng.uniform(1 - args.spread, 1 + args.spread) for _ in range(count)]
+
+        def draft(numbered):
+            index, _ = numbered
+            section_start = time.time()
+            time.sleep(section_words[index] / args.words_per_second * args.scale)
+            return (time.time() - section_start) / args.scale
+
+        for workers in args.workers:
+            start = time.time()
+            time.sleep(args.outline * args.scale)
+            sections = list_items(outline, count)
+            seconds = run_each(enumerate(sections), draft, workers)
+            time.sleep(stitch_seconds * args.scale)
+            total = (time.time() - start) / args.scale
+            print(f"📰 {count} sections on {workers} worker(s): {total:.1f}s "
+                  f"({single_seconds / total:.2f}x the single pass; longest section {max(seconds):.1f}s, "
+                  f"{sum(seconds):.1f}s of section work)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Micro-benchmark for the stdout-scraping progress parser.
+
+Replays a recorded verbose CrewAI log through CrewAIOutputCapture the way
+``print`` drives it (one write per line plus one per newline) and reports
+writes per second, next to the previous pattern-list implementation.
+
+    python benchmarks/bench_output_capture.py [--replays 10] [--log PATH]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from output_capture import CrewAIOutputCapture
+
+AGENT_NAMES = ['Research Analyst', 'Article Writer', 'Editor', 'Social Media Strategist']
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'crewai_verbose.log')
+
+
+class NullStream:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class LegacyOutputCapture:
+    """The previous parser: pattern lists rebuilt and scanned on every write"""
+
+    def __init__(self, original_stdout, agent_names, user_id, get_status, send_update):
+        self.original_stdout = original_stdout
+        self.agent_names = agent_names
+        self.user_id = user_id
+        self.get_status = get_status
+        self.send_update = send_update
+        self.buffer = ""
+
+    def write(self, text):
+        self.original_stdout.write(text)
+        self.original_stdout.flush()
+        self.buffer += text
+        self._parse_agent_activity(text)
+
+    def flush(self):
+        self.original_stdout.flush()
+
+    def _parse_agent_activity(self, text):
+        user_status = self.get_status(self.user_id)
+        if not user_status:
+            return
+        clean_text = text.strip()
+        agent_start_patterns = ["Working Agent:", "Agent:", "🤖 Agent Started", "Starting agent:",
+                                "# Agent:", "[Agent]", ">>> Agent"]
+        thinking_patterns = ["Thought:", "I need to", "Let me", "I will", "I should", "First,", "Next,",
+                             "Now I", "Action:", "Observation:", "Reasoning:", "Analysis:"]
+        for pattern in agent_start_patterns:
+            if pattern in clean_text:
+                for i, agent_name in enumerate(self.agent_names):
+                    agent_keywords = [agent_name, agent_name.split()[-1]]
+                    if any(keyword in clean_text for keyword in agent_keywords):
+                        if user_status['current_agent'] != agent_name or user_status['current_step'] != i:
+                            user_status['current_step'] = i
+                            user_status['current_agent'] = agent_name
+                            self.send_update(self.user_id, {'agent_thoughts': user_status['agent_thoughts']})
+                        break
+                break
+        for pattern in thinking_patterns:
+            if pattern in clean_text:
+                if user_status.get('current_agent'):
+                    thought_start = clean_text.find(pattern)
+                    thought_text = clean_text[thought_start:thought_start + 150].split('\n')[0]
+                    user_status['current_thought'] = thought_text
+                    self.send_update(self.user_id, {'agent_thoughts': user_status['agent_thoughts']})
+                break
+        completion_patterns = ["Final Answer:", "Task completed successfully", "Finished working on",
+                               "Agent execution complete", "OUTPUT:", "RESULT:"]
+        for pattern in completion_patterns:
+            if pattern in clean_text:
+                current_agent = user_status.get('current_agent')
+                if current_agent and current_agent not in user_status['agent_thoughts']:
+                    result_start = clean_text.find(pattern)
+                    result_text = clean_text[result_start + len(pattern):result_start + len(pattern) + 300]
+                    result_text = result_text.split('\n')[0].strip()
+                    if result_text and len(result_text) > 20:
+                        user_status['agent_thoughts'][current_agent] = result_text[:200]
+                        self.send_update(self.user_id, {'agent_thoughts': user_status['agent_thoughts']})
+                break
+
+
+def replay(capture_class, lines, replays):
+    updates = []
+    status = {}
+
+    def get_status(user_id):
+        return status
+
+    def send_update(user_id, data):
+        updates.append(data)
+
+    capture = capture_class(NullStream(), AGENT_NAMES, 'bench-user', get_status, send_update)
+    writes = 0
+    real_stdout = sys.stdout
+    sys.stdout = NullStream()  # silence the parser's own progress prints
+    try:
+        start = time.perf_counter()
+        for _ in range(replays):
+            status.clear()
+            status.update({'current_step': 0, 'current_agent': None,
+                           'current_thought': None, 'agent_thoughts': {}})
+            for line in lines:
+                capture.write(line)
+                capture.write('\n')
+                writes += 2
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout = real_stdout
+    return writes, elapsed, len(updates), len(capture.buffer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--replays', type=int, default=10)
+    parser.add_argument('--log', default=DEFAULT_LOG)
+    args = parser.parse_args()
+
+    with open(args.log, encoding='utf-8') as log_file:
+        lines = log_file.read().splitlines()
+    print(f"📄 Replaying {len(lines)} log lines x {args.replays}")
+
+    for label, capture_class in (('legacy', LegacyOutputCapture), ('compiled', CrewAIOutputCapture)):
+        writes, elapsed, updates, buffered = replay(capture_class, lines, args.replays)
+        print(f"⏱️ {label:>8}: {writes / elapsed:>12,.0f} writes/s | "
+              f"{updates / args.replays:.0f} updates per run | buffer {buffered:,} chars")
+
+
+if __name__ == '__main__':
+    main()
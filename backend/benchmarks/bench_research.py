@@ -0,0 +1,64 @@
+"""Research stage wall time: one agent against map-reduce sub-questions.
+
+Simulates the LLM calls with sleeps (seconds scaled by ``--scale``). The
+single-agent baseline takes ``--single`` seconds. Map-reduce takes
+``--split`` seconds to split the topic, then each sub-question takes
+``--question`` seconds (plus up to ``--jitter`` more), researched through
+``research_concurrently`` on the given pool, then ``--merge`` seconds to
+merge. Every combination of ``--questions`` and ``--workers`` is
+reported as timed by ResearchTimings.
+
+    python benchmarks/bench_research.py [--questions 3 4 6] [--workers 1 2 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from research import MAP_REDUCE, SINGLE, ResearchTimings, parse_subquestions, research_concurrently
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--single', type=float, default=30)
+    parser.add_argument('--split', type=float, default=3)
+    parser.add_argument('--question', type=float, default=8)
+    parser.add_argument('--jitter', type=float, default=4)
+    parser.add_argument('--merge', type=float, default=6)
+    parser.add_argument('--questions', type=int, nargs='+', default=[3, 4, 6])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--scale', type=float, default=0.02)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    baseline = ResearchTimings()
+    start = time.time()
+    time.sleep(args.single * args.scale)
+    baseline.record(SINGLE, (time.time() - start) / args.scale)
+    single_seconds = baseline.stats()[SINGLE]['avg_seconds']
+    print(f"🔬 single agent: {single_seconds:.1f}s")
+
+    for count in args.questions:
+        for workers in args.workers:
+            timings = ResearchTimings()
+            start = time.time()
+            time.sleep(args.split * args.scale)
+            split_output = '\n'.join(f"{index + 1}. Question {index + 1}?" for index in range(count))
+            questions = parse_subquestions(split_output, count)
+            findings = research_concurrently(
+                questions, lambda question: time.sleep((args.question + rng.uniform(0, args.jitter)) * args.scale),
+                workers)
+            time.sleep(args.merge * args.scale)
+            timings.record(MAP_REDUCE, (time.time() - start) / args.scale, len(findings),
+                           sum(finding.seconds for finding in findings) / args.scale)
+            stats = timings.stats()[MAP_REDUCE]
+            print(f"🗺️  {count} questions on {workers} worker(s): {stats['avg_seconds']:.1f}s "
+                  f"({single_seconds / stats['avg_seconds']:.2f}x the single agent; "
+                  f"{stats['avg_question_seconds']:.1f}s of question work)")
+
+
+if __name__ == '__main__':
+    main()
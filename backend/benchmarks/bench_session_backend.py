@@ -0,0 +1,95 @@
+"""Requests per second for each Flask session backend.
+
+Builds a minimal Flask app with the backend's session configuration and an
+endpoint that does what ``get_or_create_user_session`` does on every
+``/api/status`` poll, then drives ``--clients`` browsers (each with its own
+cookie jar) through ``--polls`` polls each via the test client. Reports
+throughput and what each backend left on disk. Needs Flask and
+Flask-Session; no LLM or CrewAI involved.
+
+    python benchmarks/bench_session_backend.py [--clients 200] [--polls 25]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify, session
+from flask_session import Session
+
+from session_store import SQLiteSessionInterface
+
+
+def build_app(backend, directory):
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'bench-secret'
+    app.config['SESSION_TYPE'] = 'filesystem'
+    app.config['SESSION_FILE_DIR'] = directory
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+    app.config['PERMANENT_SESSION_LIFETIME'] = 3600
+    if backend == 'sqlite':
+        app.session_interface = SQLiteSessionInterface(os.path.join(directory, 'sessions.db'), ttl=3600)
+    elif backend == 'filesystem':
+        Session(app)
+
+    @app.route('/api/status')
+    def status():
+        if 'user_id' not in session:
+            session['user_id'] = str(uuid.uuid4())
+            session['created_at'] = datetime.now().isoformat()
+        return jsonify({'user_id': session['user_id'], 'is_processing': False})
+
+    return app
+
+
+def disk_usage(directory):
+    files = 0
+    size = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+
+def run(backend, clients, polls):
+    directory = tempfile.mkdtemp(prefix=f"sessions-{backend}-")
+    try:
+        app = build_app(backend, directory)
+        browsers = [app.test_client() for _ in range(clients)]
+        user_ids = [browser.get('/api/status').get_json()['user_id'] for browser in browsers]
+
+        start = time.perf_counter()
+        for _ in range(polls):
+            for browser, user_id in zip(browsers, user_ids):
+                assert browser.get('/api/status').get_json()['user_id'] == user_id, 'session was lost'
+        elapsed = time.perf_counter() - start
+        return clients * polls / elapsed, disk_usage(directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--polls', type=int, default=25)
+    args = parser.parse_args()
+
+    print(f"🧪 {args.clients} clients x {args.polls} status polls per backend")
+    baseline = None
+    for backend in ('filesystem', 'sqlite', 'cookie'):
+        rate, (files, size) = run(backend, args.clients, args.polls)
+        baseline = baseline or rate
+        print(f"🍪 {backend:<10}: {rate:,.0f} req/s ({rate / baseline:.1f}x), "
+              f"{files} file(s), {size / 1024:,.0f} KB on disk")
+
+
+if __name__ == '__main__':
+    main()
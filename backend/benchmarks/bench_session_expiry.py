@@ -0,0 +1,94 @@
+"""Session expiry cost at 1M sessions: indexed sweeps vs full scans.
+
+Fills a SessionRegistry with ``--sessions`` users whose last activity is
+spread over one TTL, then runs sweeps on a simulated clock, touching a
+fraction of users between sweeps the way requests do. Each indexed sweep
+only visits sessions whose deadline has come due. The same population in
+the previous representation (ISO ``last_activity`` strings, one scan with
+``datetime.fromisoformat`` per session) is swept for comparison.
+
+    python benchmarks/bench_session_expiry.py [--sessions 1000000] [--sweeps 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sessions import SessionRegistry
+
+
+def rss_mb():
+    with open('/proc/self/status') as status_file:
+        for line in status_file:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def indexed(args, rng):
+    registry = SessionRegistry(ttl=args.ttl)
+    before = rss_mb()
+    start = time.perf_counter()
+    for index in range(args.sessions):
+        registry.get_or_create(f"user-{index}", now=rng.uniform(0, args.ttl))
+    print(f"🏗️  Built {len(registry):,} sessions in {time.perf_counter() - start:.1f}s "
+          f"(+{rss_mb() - before:,.0f} MB RSS)")
+
+    now = args.ttl
+    sweep_seconds = []
+    expired = 0
+    for _ in range(args.sweeps):
+        for _ in range(int(args.sessions * args.active)):
+            registry.touch(f"user-{rng.randrange(args.sessions)}", now=now)
+        now += args.interval
+        start = time.perf_counter()
+        expired += len(registry.expire(now=now))
+        sweep_seconds.append(time.perf_counter() - start)
+    return sweep_seconds, expired, len(registry)
+
+
+def full_scan(args, rng):
+    base = datetime.now() - timedelta(seconds=args.ttl)
+    sessions = {f"user-{index}": {'last_activity': (base + timedelta(seconds=rng.uniform(0, args.ttl))).isoformat()}
+                for index in range(args.sessions)}
+    now = datetime.now()
+    sweep_seconds = []
+    for _ in range(args.legacy_sweeps):
+        now += timedelta(seconds=args.interval)
+        start = time.perf_counter()
+        idle = [user_id for user_id, session in sessions.items()
+                if (now - datetime.fromisoformat(session['last_activity'])).total_seconds() > args.ttl]
+        for user_id in idle:
+            del sessions[user_id]
+        sweep_seconds.append(time.perf_counter() - start)
+    return sweep_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=1_000_000)
+    parser.add_argument('--ttl', type=float, default=3600)
+    parser.add_argument('--interval', type=float, default=5, help='simulated seconds between sweeps')
+    parser.add_argument('--sweeps', type=int, default=20)
+    parser.add_argument('--legacy-sweeps', type=int, default=3)
+    parser.add_argument('--active', type=float, default=0.01, help='fraction of sessions touched between sweeps')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    sweep_seconds, expired, remaining = indexed(args, rng)
+    average = sum(sweep_seconds) / len(sweep_seconds)
+    print(f"⚡ Indexed sweeps: {average * 1000:,.2f} ms average, {max(sweep_seconds) * 1000:,.2f} ms worst; "
+          f"{expired:,} expired over {args.sweeps} sweeps, {remaining:,} left")
+
+    legacy_seconds = full_scan(args, rng)
+    legacy_average = sum(legacy_seconds) / len(legacy_seconds)
+    print(f"🐢 Full scans: {legacy_average * 1000:,.0f} ms average over {len(legacy_seconds)} sweeps "
+          f"({legacy_average / average:,.0f}x slower)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Speculative tweet hit rate and latency against the sequential pipeline.
+
+Simulates ``--jobs`` runs with each stage sleeping for its share of a
+typical run (``--durations`` scaled by ``--scale``). Each job's draft is
+a random article from a fixed vocabulary; the edit rewrites a random
+fraction of its words (``--min-change`` to ``--max-change``). The
+speculative mode runs the graph from stages.py through ``run_task_graph``
+and then reconciles the tweet as reconcile_speculation does: it keeps the
+tweet when ``draft_similarity`` reaches the threshold and otherwise
+sleeps through the tweet stage again.
+
+    python benchmarks/bench_speculation.py [--jobs 20] [--threshold 0.5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from speculation import SpeculationStats, draft_similarity, latency_saved
+from stages import EDITORIAL_STAGES, SEQUENTIAL, SPECULATIVE, speculative_stages, stage_graph, stage_inputs
+from taskgraph import run_task_graph
+
+VOCABULARY = [f"term{index}" for index in range(2000)]
+
+
+def make_texts(rng, change):
+    draft = [rng.choice(VOCABULARY) for _ in range(400)]
+    edited = [rng.choice(VOCABULARY) if rng.random() < change else word for word in draft]
+    return ' '.join(draft), ' '.join(edited)
+
+
+def run_job(mode, durations, texts, threshold, stats):
+    stage_times = {}
+
+    def run(stage_key, inputs):
+        started = time.time()
+        time.sleep(durations[stage_key])
+        stage_times[stage_key] = (started, time.time())
+        return texts.get(stage_key, stage_key)
+
+    start = time.perf_counter()
+    outputs = run_task_graph(stage_graph(mode), run)
+    if mode == SPECULATIVE:
+        for stage in speculative_stages():
+            real_input = stage_inputs(stage, SEQUENTIAL)[0]
+            started, finished = stage_times[stage['key']]
+            if draft_similarity(outputs[stage['speculate_from']], outputs[real_input]) >= threshold:
+                stats.record(True, latency_saved(stage_times[real_input][1], started, finished))
+            else:
+                stats.record(False, wasted_seconds=finished - started)
+                run(stage['key'], {real_input: outputs[real_input]})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--durations', type=float, nargs=len(EDITORIAL_STAGES), default=[20, 25, 20, 8],
+                        help='seconds per stage in pipeline order (research article edited tweet)')
+    parser.add_argument('--scale', type=float, default=0.05, help='multiplier applied to every duration')
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--min-change', type=float, default=0.1, help='smallest fraction of words the edit rewrites')
+    parser.add_argument('--max-change', type=float, default=0.6, help='largest fraction of words the edit rewrites')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    durations = {stage['key']: seconds * args.scale for stage, seconds in zip(EDITORIAL_STAGES, args.durations)}
+    jobs = []
+    for _ in range(args.jobs):
+        draft, edited = make_texts(rng, rng.uniform(args.min_change, args.max_change))
+        jobs.append({'article': draft, 'edited': edited})
+
+    results = {}
+    for mode in (SEQUENTIAL, SPECULATIVE):
+        stats = SpeculationStats()
+        elapsed = [run_job(mode, durations, texts, args.threshold, stats) for texts in jobs]
+        results[mode] = sum(elapsed) / len(elapsed)
+        if mode == SPECULATIVE:
+            summary = stats.stats()
+            print(f"🎲 Speculation: {summary['hits']}/{summary['attempts']} kept (hit rate {summary['hit_rate']:.0%}), "
+                  f"{summary['saved_seconds'] / args.jobs:.2f}s saved and "
+                  f"{summary['wasted_seconds'] / args.jobs:.2f}s of tweet work discarded per job")
+
+    saved = results[SEQUENTIAL] - results[SPECULATIVE]
+    print(f"⏱️  {SEQUENTIAL}: {results[SEQUENTIAL]:.2f}s per job, {SPECULATIVE}: {results[SPECULATIVE]:.2f}s "
+          f"({saved:.2f}s, {saved / results[SEQUENTIAL]:.0%} faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""End-to-end job latency for the sequential and dag pipeline modes.
+
+Each stage is simulated by sleeping for its share of a typical run
+(``--durations``, seconds per stage in pipeline order, scaled by
+``--scale``), and the stage graph for each mode is run through
+``run_task_graph`` exactly as process_crew_ai runs it. In dag mode the
+edit and the tweet both start once the article exists, so a job should
+finish one tweet-stage sooner.
+
+    python benchmarks/bench_taskgraph.py [--jobs 5] [--scale 0.1]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stages import EDITORIAL_STAGES, PIPELINE_MODES, stage_graph
+from taskgraph import run_task_graph
+
+
+def run_job(mode, durations):
+    overlap = {'running': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def run(stage_key, inputs):
+        with lock:
+            overlap['running'] += 1
+            overlap['peak'] = max(overlap['peak'], overlap['running'])
+        time.sleep(durations[stage_key])
+        with lock:
+            overlap['running'] -= 1
+        return f"{stage_key} from {', '.join(inputs) or 'topic'}"
+
+    start = time.perf_counter()
+    run_task_graph(stage_graph(mode), run)
+    return time.perf_counter() - start, overlap['peak']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--durations', type=float, nargs=len(EDITORIAL_STAGES), default=[20, 25, 20, 8],
+                        help='seconds per stage in pipeline order (research article edited tweet)')
+    parser.add_argument('--scale', type=float, default=0.1, help='multiplier applied to every duration')
+    parser.add_argument('--jobs', type=int, default=5)
+    args = parser.parse_args()
+
+    durations = {stage['key']: seconds * args.scale for stage, seconds in zip(EDITORIAL_STAGES, args.durations)}
+    print(f"🧪 {args.jobs} jobs per mode, stages: "
+          + ', '.join(f"{key} {seconds:.2f}s" for key, seconds in durations.items()))
+
+    baseline = None
+    for mode in PIPELINE_MODES:
+        timings = [run_job(mode, durations) for _ in range(args.jobs)]
+        average = sum(elapsed for elapsed, _ in timings) / len(timings)
+        peak = max(peak for _, peak in timings)
+        baseline = baseline or average
+        print(f"🔀 {mode:<10}: {average:.2f}s per job, {peak} stage(s) at once, "
+              f"{baseline - average:.2f}s saved ({(baseline - average) / baseline:.0%})")
+
+
+if __name__ == '__main__':
+    main()
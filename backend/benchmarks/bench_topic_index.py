@@ -0,0 +1,86 @@
+"""Benchmark near-duplicate topic lookups at scale.
+
+Fills a TopicIndex with synthetic topics (100k by default) and reports
+insert throughput and lookup latency for paraphrased and unrelated queries.
+
+    python benchmarks/bench_topic_index.py [--topics 100000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_index import TopicIndex
+
+SUBJECTS = ['AI', 'machine learning', 'remote work', 'climate change', 'blockchain',
+            'quantum computing', 'social media', 'electric vehicles', 'gene editing',
+            'space tourism', 'renewable energy', 'cybersecurity', 'the gig economy']
+VERBS = ['transforming', 'reshaping', 'disrupting', 'changing', 'influencing', 'redefining']
+PREFIXES = ['How', 'Why', 'The ways', 'What it means that', '']
+
+
+def make_vocabulary(size, rng):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)]
+
+
+def make_topic(rng, vocabulary):
+    objects = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 4)))
+    return f"{rng.choice(PREFIXES)} {rng.choice(SUBJECTS)} is {rng.choice(VERBS)} {objects}".strip()
+
+
+def paraphrase(topic, rng):
+    # Drop the framing words and shuffle the rest, which is how users rephrase topics
+    words = [w for w in topic.split() if w not in ('How', 'Why', 'is', 'The', 'ways', 'What', 'it', 'means', 'that')]
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--topics', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(5000, rng)
+    topics = [make_topic(rng, vocabulary) for _ in range(args.topics)]
+    index = TopicIndex(threshold=args.threshold, max_topics=args.topics)
+
+    start = time.perf_counter()
+    for topic in topics:
+        index.add(topic)
+    insert_seconds = time.perf_counter() - start
+    print(f"📥 Inserted {len(index):,} topics in {insert_seconds:.2f}s "
+          f"({len(index) / insert_seconds:,.0f} topics/s)")
+
+    for label, queries in (
+        ('paraphrased', [paraphrase(rng.choice(topics), rng) for _ in range(args.queries)]),
+        ('unrelated', [make_topic(rng, vocabulary) for _ in range(args.queries)]),
+    ):
+        latencies = []
+        hits = 0
+        for query in queries:
+            start = time.perf_counter()
+            match = index.nearest(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += match is not None
+        print(f"🔎 {label:>11}: {hits / len(queries):6.1%} matched | "
+              f"p50 {statistics.median(latencies):.3f} ms | "
+              f"p99 {percentile(latencies, 99):.3f} ms | "
+              f"max {max(latencies):.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Load test: thousands of concurrent idle SSE clients on one async process.
+
+Starts a server process running AsyncSSEApp (the async /api/stream used by
+asgi.py) against in-memory user state, opens ``--clients`` EventSource-style
+connections, holds them idle through several heartbeats, then publishes one
+update to every user and measures how quickly all streams receive it.
+Needs ``uvicorn``; no LLM or CrewAI involved.
+
+    python benchmarks/load_sse_idle.py [--clients 5000] [--hold 12]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_sse import AsyncSSEApp
+from fanout import StreamHub
+
+HOST = '127.0.0.1'
+
+
+def raise_fd_limit(needed):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return target
+
+
+def rss_mb():
+    with open('/proc/self/status') as status_file:
+        for line in status_file:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+# --- server side -----------------------------------------------------------
+
+def build_server_app(heartbeat_interval):
+    hub = StreamHub()
+    statuses = {}
+
+    def ensure_user(user_id):
+        return statuses.setdefault(user_id, {
+            'current_step': 1,
+            'current_agent': 'Research Analyst',
+            'current_thought': 'Researching...',
+            'agent_thoughts': {},
+            'is_processing': True,
+        })
+
+    async def control(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        if scope['path'] == '/publish':
+            # Publish from a plain thread, exactly like a crew worker does
+            def publish_all():
+                for user_id, status in list(statuses.items()):
+                    status['is_processing'] = False
+                    hub.publish(user_id, None, {'current_step': 4, 'current_agent': None,
+                                                'current_thought': 'done', 'agent_thoughts': {},
+                                                'is_processing': False})
+            threading.Thread(target=publish_all).start()
+            body = {'published': len(statuses)}
+        else:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            body = {
+                'subscribers': hub.subscriber_count(),
+                'threads': threading.active_count(),
+                'rss_mb': round(rss_mb(), 1),
+                'cpu_seconds': usage.ru_utime + usage.ru_stime,
+            }
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+    return AsyncSSEApp(hub=hub, get_status=statuses.get, ensure_user=ensure_user,
+                       fallback=control, allowed_origins=['http://localhost:5173'],
+                       default_origin='http://localhost:5173',
+                       heartbeat_interval=heartbeat_interval)
+
+
+def serve(port, clients, heartbeat_interval):
+    import uvicorn
+    raise_fd_limit(clients + 1024)
+    uvicorn.run(build_server_app(heartbeat_interval), host=HOST, port=port,
+                log_level='warning', backlog=clients + 1024)
+
+
+# --- client side -----------------------------------------------------------
+
+async def http_json(port, method, path):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(f"{method} {path} HTTP/1.0\r\nHost: {HOST}\r\nContent-Length: 0\r\n"
+                 f"Connection: close\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    return json.loads(raw.split(b'\r\n\r\n', 1)[1])
+
+
+class Client:
+    def __init__(self, index):
+        self.user_id = f"load-user-{index}"
+        self.heartbeats = 0
+        self.connected_at = None
+        self.finished_at = None
+        self.failed = None
+
+
+async def run_client(client, port, connect_gate, connected):
+    try:
+        async with connect_gate:
+            reader, writer = await asyncio.open_connection(HOST, port)
+            writer.write(f"GET /api/stream?user_id={client.user_id} HTTP/1.1\r\n"
+                         f"Host: {HOST}\r\nAccept: text/event-stream\r\n\r\n".encode())
+            await writer.drain()
+            await reader.readuntil(b'\r\n\r\n')
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b': heartbeat'):
+                client.heartbeats += 1
+                continue
+            if not line.startswith(b'data: '):
+                continue
+            payload = json.loads(line[6:])
+            if payload.get('connected'):
+                client.connected_at = time.perf_counter()
+                connected.release()
+            elif not payload.get('is_processing', True):
+                client.finished_at = time.perf_counter()
+                break
+        writer.close()
+    except Exception as e:
+        client.failed = repr(e)
+        if client.connected_at is None:
+            connected.release()
+
+
+async def drive(args, port):
+    clients = [Client(i) for i in range(args.clients)]
+    connect_gate = asyncio.Semaphore(args.connect_concurrency)
+    connected = asyncio.Semaphore(0)
+
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(run_client(c, port, connect_gate, connected)) for c in clients]
+    for _ in clients:
+        await connected.acquire()
+    ramp = time.perf_counter() - start
+    ok = sum(c.connected_at is not None for c in clients)
+    print(f"🔌 {ok:,}/{len(clients):,} streams open after {ramp:.1f}s")
+
+    before = await http_json(port, 'GET', '/stats')
+    await asyncio.sleep(args.hold)
+    stats = await http_json(port, 'GET', '/stats')
+    heartbeats = sum(c.heartbeats for c in clients)
+    print(f"💤 Held idle for {args.hold}s: server has {stats['subscribers']:,} subscribers, "
+          f"{stats['threads']} threads, {stats['rss_mb']} MB RSS, "
+          f"{stats['cpu_seconds'] - before['cpu_seconds']:.2f} s CPU; "
+          f"{heartbeats:,} heartbeats delivered")
+
+    publish_start = time.perf_counter()
+    await http_json(port, 'POST', '/publish')
+    await asyncio.wait(tasks, timeout=60)
+    done = [c.finished_at - publish_start for c in clients if c.finished_at]
+    failed = [c.failed for c in clients if c.failed]
+    if done:
+        done.sort()
+        print(f"📣 Broadcast reached {len(done):,} clients: "
+              f"p50 {done[len(done) // 2] * 1000:.0f} ms, max {done[-1] * 1000:.0f} ms")
+    if failed:
+        print(f"❌ {len(failed)} clients failed, e.g. {failed[0]}")
+    return ok == len(clients) and not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--hold', type=float, default=12)
+    parser.add_argument('--heartbeat', type=float, default=5.0)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connect-concurrency', type=int, default=500)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.clients, args.heartbeat)
+        return
+
+    raise_fd_limit(args.clients + 1024)
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve',
+                               '--port', str(args.port), '--clients', str(args.clients),
+                               '--heartbeat', str(args.heartbeat)])
+    try:
+        deadline = time.time() + 15
+        while True:
+            try:
+                asyncio.run(http_json(args.port, 'GET', '/stats'))
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.2)
+        success = asyncio.run(drive(args, args.port))
+    finally:
+        server.terminate()
+        server.wait()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""Tiny in-memory Redis-protocol server for exercising RedisBroker locally.
+
+Implements just what the broker uses: PING, ECHO, AUTH, SELECT, GET, SET
+(with EX/PX), DEL, RPUSH, LRANGE, LREM, PEXPIRE, PUBLISH, SUBSCRIBE and
+PSUBSCRIBE. Not a Redis replacement; use it when no real Redis is at hand.
+
+    python benchmarks/resp_standin.py [--port 6390]
+    EVENT_BROKER_URL=redis://localhost:6390/0 python app.py
+"""
+import argparse
+import asyncio
+import fnmatch
+import threading
+import time
+
+
+def bulk(value):
+    if value is None:
+        return b'$-1\r\n'
+    if not isinstance(value, bytes):
+        value = str(value).encode('utf-8')
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+def array(items):
+    return b'*%d\r\n' % len(items) + b''.join(
+        b':%d\r\n' % item if isinstance(item, int) else bulk(item) for item in items)
+
+
+class RespStandIn:
+    """Shared keyspace and subscriptions for all client connections"""
+
+    def __init__(self):
+        self.data = {}  # key -> (value, expires_at)
+        self.channels = {}  # channel -> set of writers
+        self.patterns = {}  # pattern -> set of writers
+
+    async def handle(self, reader, writer):
+        subscriptions = []
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                writer.write(self._execute(args, writer, subscriptions))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for registry, name in subscriptions:
+                registry.get(name, set()).discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _execute(self, args, writer, subscriptions):
+        name = args[0].upper()
+        if name == b'PING':
+            return b'+PONG\r\n'
+        if name == b'ECHO':
+            return bulk(args[1])
+        if name in (b'AUTH', b'SELECT'):
+            return b'+OK\r\n'
+        if name == b'GET':
+            return bulk(self._get(args[1]))
+        if name == b'SET':
+            expires_at = None
+            options = [arg.upper() for arg in args[3:]]
+            if b'EX' in options:
+                expires_at = time.time() + int(args[3 + options.index(b'EX') + 1])
+            elif b'PX' in options:
+                expires_at = time.time() + int(args[3 + options.index(b'PX') + 1]) / 1000
+            self.data[args[1]] = (args[2], expires_at)
+            return b'+OK\r\n'
+        if name == b'DEL':
+            removed = sum(self.data.pop(key, None) is not None for key in args[1:])
+            return b':%d\r\n' % removed
+        if name == b'RPUSH':
+            items = self._get(args[1]) or []
+            items.extend(args[2:])
+            self.data[args[1]] = (items, self.data.get(args[1], (None, None))[1])
+            return b':%d\r\n' % len(items)
+        if name == b'LRANGE':
+            items = self._get(args[1]) or []
+            start, stop = int(args[2]), int(args[3])
+            return array(items[start:None if stop == -1 else stop + 1])
+        if name == b'LREM':
+            items = self._get(args[1]) or []
+            kept = [item for item in items if item != args[3]]
+            if args[1] in self.data:
+                self.data[args[1]] = (kept, self.data[args[1]][1])
+            return b':%d\r\n' % (len(items) - len(kept))
+        if name == b'PEXPIRE':
+            if self._get(args[1]) is None:
+                return b':0\r\n'
+            self.data[args[1]] = (self.data[args[1]][0], time.time() + int(args[2]) / 1000)
+            return b':1\r\n'
+        if name == b'PUBLISH':
+            return b':%d\r\n' % self._publish(args[1], args[2])
+        if name in (b'SUBSCRIBE', b'PSUBSCRIBE'):
+            registry = self.channels if name == b'SUBSCRIBE' else self.patterns
+            kind = b'subscribe' if name == b'SUBSCRIBE' else b'psubscribe'
+            replies = []
+            for target in args[1:]:
+                registry.setdefault(target, set()).add(writer)
+                subscriptions.append((registry, target))
+                replies.append(array([kind, target, len(subscriptions)]))
+            return b''.join(replies)
+        return b'-ERR unknown command\r\n'
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _publish(self, channel, message):
+        receivers = 0
+        for writer in self.channels.get(channel, ()):
+            writer.write(array([b'message', channel, message]))
+            receivers += 1
+        text_channel = channel.decode('utf-8', 'replace')
+        for pattern, writers in self.patterns.items():
+            if fnmatch.fnmatchcase(text_channel, pattern.decode('utf-8', 'replace')):
+                for writer in writers:
+                    writer.write(array([b'pmessage', pattern, channel, message]))
+                    receivers += 1
+        return receivers
+
+
+async def serve(host='127.0.0.1', port=6390, ready=None):
+    server = await asyncio.start_server(RespStandIn().handle, host, port)
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def start_in_thread(host='127.0.0.1', port=6390):
+    """Run the stand-in on a daemon thread; returns once it accepts connections"""
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(serve(host, port, ready)), daemon=True)
+    thread.start()
+    ready.wait(5)
+    return thread
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6390)
+    args = parser.parse_args()
+    print(f"📡 RESP stand-in listening on {args.host}:{args.port}")
+    asyncio.run(serve(args.host, args.port))
@@ -0,0 +1,182 @@
+"""Concurrency stress test for the session registry.
+
+Many threads create, touch and update sessions the way request handlers
+and crew workers do, while a cleanup thread expires idle users and a
+debug reader lists them all. Afterwards every user's creations and
+removals are reconciled with what is left in the registry. The same
+workload against the plain dict the registry replaced shows what went
+wrong there: iteration errors during cleanup and sessions that were
+created twice.
+
+    python benchmarks/stress_sessions.py [--threads 16] [--seconds 3] [--users 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sessions import SessionRegistry
+
+
+class RegistryStore:
+    label = 'SessionRegistry'
+
+    def __init__(self, shards, ttl):
+        self.registry = SessionRegistry(shards=shards, ttl=ttl)
+
+    def ensure(self, user_id):
+        return self.registry.get_or_create(user_id)[1]
+
+    def touch(self, user_id):
+        self.registry.touch(user_id)
+
+    def update(self, user_id, step):
+        record = self.registry.get(user_id)
+        if record is not None:
+            record['current_step'] = step
+            record['current_thought'] = f"step {step}"
+
+    def expire(self, ttl):
+        return [user_id for user_id, _ in self.registry.expire()]
+
+    def list_all(self):
+        return sum(1 for _ in self.registry.items())
+
+    def ids(self):
+        return set(self.registry.ids())
+
+
+class DictStore:
+    """The previous approach: a bare dict of dicts with ISO timestamps"""
+    label = 'plain dict'
+
+    def __init__(self, shards, ttl):
+        self.sessions = {}
+
+    def ensure(self, user_id):
+        if user_id not in self.sessions:
+            self.sessions[user_id] = {'current_step': 0, 'current_thought': None,
+                                      'created_at': datetime.now().isoformat(),
+                                      'last_activity': datetime.now().isoformat()}
+            return True
+        return False
+
+    def touch(self, user_id):
+        session = self.sessions.get(user_id)
+        if session is not None:
+            session['last_activity'] = datetime.now().isoformat()
+
+    def update(self, user_id, step):
+        session = self.sessions.get(user_id)
+        if session is not None:
+            session['current_step'] = step
+            session['current_thought'] = f"step {step}"
+
+    def expire(self, ttl):
+        now = datetime.now()
+        idle = [user_id for user_id, session in self.sessions.items()
+                if (now - datetime.fromisoformat(session['last_activity'])).total_seconds() > ttl]
+        removed = []
+        for user_id in idle:
+            if self.sessions.pop(user_id, None) is not None:
+                removed.append(user_id)
+        return removed
+
+    def list_all(self):
+        return sum(1 for _ in self.sessions.items())
+
+    def ids(self):
+        return set(self.sessions)
+
+
+def hammer(store, args):
+    stop = threading.Event()
+    created = Counter()
+    removed = Counter()
+    errors = Counter()
+    ops = [0] * args.threads
+    lock = threading.Lock()
+
+    def worker(index):
+        rng = random.Random(index)
+        local_created = Counter()
+        count = 0
+        while not stop.is_set():
+            user_id = f"user-{rng.randrange(args.users)}"
+            roll = rng.random()
+            try:
+                if roll < 0.3:
+                    if store.ensure(user_id):
+                        local_created[user_id] += 1
+                elif roll < 0.5:
+                    store.touch(user_id)
+                else:
+                    store.update(user_id, count)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            count += 1
+        ops[index] = count
+        with lock:
+            created.update(local_created)
+
+    def cleaner():
+        while not stop.is_set():
+            try:
+                removed.update(store.expire(args.ttl))
+            except Exception as e:
+                errors[f"cleanup {type(e).__name__}"] += 1
+            time.sleep(0.01)
+
+    def lister():
+        while not stop.is_set():
+            try:
+                store.list_all()
+            except Exception as e:
+                errors[f"listing {type(e).__name__}"] += 1
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.threads)]
+    threads += [threading.Thread(target=cleaner), threading.Thread(target=lister)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Each user was created once more than it was removed if it is still present, else equally often
+    present = store.ids()
+    mismatched = [user_id for user_id in set(created) | set(removed)
+                  if created[user_id] - removed[user_id] != (1 if user_id in present else 0)]
+    return sum(ops) / elapsed, errors, mismatched, len(present), sum(removed.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--shards', type=int, default=16)
+    parser.add_argument('--ttl', type=float, default=0.5, help='idle seconds before cleanup removes a user')
+    args = parser.parse_args()
+
+    print(f"🧪 {args.threads} worker threads + cleanup + listing for {args.seconds:g}s over {args.users:,} users")
+    for store_class in (DictStore, RegistryStore):
+        store = store_class(args.shards, args.ttl)
+        throughput, errors, mismatched, present, removed = hammer(store, args)
+        errors_text = ', '.join(f"{count:,} {name}" for name, count in errors.items()) or 'no errors'
+        print(f"{'❌' if errors or mismatched else '✅'} {store.label}: {throughput:,.0f} ops/s, "
+              f"{present:,} live / {removed:,} expired, {errors_text}, "
+              f"{len(mismatched):,} users with inconsistent create/remove counts")
+
+
+if __name__ == '__main__':
+    main()
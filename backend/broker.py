@@ -0,0 +1,343 @@
+"""Event broker carrying per-user updates between web processes.
+
+``send_user_update`` publishes through a broker and every process delivers
+what it receives to the SSE streams it is serving. ``InProcessBroker``
+keeps today's single-process behaviour; ``RedisBroker`` speaks the Redis
+protocol (RESP) directly, so job execution and stream serving can live in
+different gunicorn workers or instances that share one Redis.
+
+Besides pub/sub the broker stores a small JSON snapshot per user or job,
+so a process that never saw a job can still greet a new stream with its
+state, and short lists of IDs (a user's jobs) that any process can append to.
+"""
+import json
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+from urllib.parse import urlparse
+
+from logs import get_logger
+
+log = get_logger('broker')
+
+# listener(channel, data, local, event_id): local is False for updates from another process
+Listener = Callable[[str, dict, bool, Optional[str]], None]
+
+
+class EventBroker:
+    """Publish/subscribe of JSON updates plus a shared snapshot store"""
+
+    # True when updates and state are visible to other processes
+    shared = False
+
+    def __init__(self):
+        self.node_id = uuid.uuid4().hex
+        self._listeners = []
+
+    def listen(self, listener: Listener):
+        """Call ``listener`` for every update published on any channel"""
+        self._listeners.append(listener)
+
+    def publish(self, channel: str, data: dict, event_id: Optional[str] = None):
+        raise NotImplementedError
+
+    def set_state(self, key: str, data: dict, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def get_state(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def add_to_list(self, key: str, item: str, ttl: Optional[float] = None):
+        """Append ``item`` to a shared list; ``ttl`` restarts the whole list's expiry"""
+        raise NotImplementedError
+
+    def get_list(self, key: str) -> List[str]:
+        raise NotImplementedError
+
+    def remove_from_list(self, key: str, item: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _dispatch(self, channel, data, local, event_id=None):
+        for listener in self._listeners:
+            try:
+                listener(channel, data, local, event_id)
+            except Exception as e:
+                log.error("❌ Broker: Listener failed", channel=channel, error=e)
+
+
+class InProcessBroker(EventBroker):
+    """Delivers updates synchronously to listeners in this process"""
+
+    def __init__(self):
+        super().__init__()
+        self._state = {}
+        self._lists = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, data, event_id=None):
+        self._dispatch(channel, data, True, event_id)
+
+    def set_state(self, key, data, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._state[key] = (data, expires_at)
+
+    def get_state(self, key):
+        with self._lock:
+            entry = self._state.get(key)
+            if entry is None:
+                return None
+            data, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._state[key]
+                return None
+            return data
+
+    def add_to_list(self, key, item, ttl=None):
+        with self._lock:
+            items = self._live_list(key)
+            items.append(item)
+            self._lists[key] = (items, time.time() + ttl if ttl else None)
+
+    def get_list(self, key):
+        with self._lock:
+            return list(self._live_list(key))
+
+    def remove_from_list(self, key, item):
+        with self._lock:
+            entry = self._lists.get(key)
+            if entry is not None:
+                entry[0][:] = [existing for existing in entry[0] if existing != item]
+
+    def _live_list(self, key):
+        # Called with the lock held
+        items, expires_at = self._lists.get(key, ([], None))
+        if expires_at is not None and expires_at <= time.time():
+            del self._lists[key]
+            return []
+        return items
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RespConnection:
+    """Minimal blocking RESP2 client connection"""
+
+    def __init__(self, host='localhost', port=6379, db=0, password=None, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+
+    def connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile('rb')
+        if self.password:
+            self.command('AUTH', self.password)
+        if self.db:
+            self.command('SELECT', self.db)
+
+    def close(self):
+        sock, reader = self._sock, self._reader
+        self._sock = None
+        self._reader = None
+        if sock is None:
+            return
+        try:
+            # Shutdown first so a read blocked on another thread returns
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            reader.close()
+            sock.close()
+        except OSError:
+            pass
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def settimeout(self, timeout):
+        self._sock.settimeout(timeout)
+
+    def send(self, *args):
+        self._sock.sendall(encode_command(*args))
+
+    def command(self, *args):
+        """Send one command and return its reply"""
+        if self._sock is None:
+            self.connect()
+        self.send(*args)
+        reply = self.read_reply()
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError('Connection closed by server')
+        prefix, rest = line[:1], line[1:-2]
+        if prefix == b'+':
+            return rest.decode('utf-8')
+        if prefix == b'-':
+            return RespError(rest.decode('utf-8'))
+        if prefix == b':':
+            return int(rest)
+        if prefix == b'$':
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b'*':
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self.read_reply() for _ in range(count)]
+        raise ConnectionError(f'Unexpected RESP reply: {line!r}')
+
+
+def encode_command(*args) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode('utf-8')
+        parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+    return b''.join(parts)
+
+
+class RedisBroker(EventBroker):
+    """Broker over a Redis-protocol server (``redis://[:password@]host:port/db``).
+
+    Publishing uses one command connection; a background thread holds a
+    PSUBSCRIBE on the key prefix and dispatches every update, including this
+    process's own, to the local listeners.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = 'editorial', reconnect_delay: float = 1.0):
+        super().__init__()
+        parsed = urlparse(url)
+        self._conn_args = {
+            'host': parsed.hostname or 'localhost',
+            'port': parsed.port or 6379,
+            'db': int(parsed.path.lstrip('/') or 0),
+            'password': parsed.password,
+        }
+        self.prefix = prefix
+        self.reconnect_delay = reconnect_delay
+        self._commands = RespConnection(**self._conn_args)
+        self._command_lock = threading.Lock()
+        self._subscriber = None
+        self._subscribed = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    @property
+    def location(self) -> dict:
+        """Where the server is, without the password, for logging"""
+        return {name: self._conn_args[name] for name in ('host', 'port', 'db')}
+
+    def start(self, wait: float = 5.0) -> bool:
+        """Start the subscriber thread; True once the subscription is live"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._subscribe_loop, name='broker-subscriber', daemon=True)
+            self._thread.start()
+        return self._subscribed.wait(wait)
+
+    def publish(self, channel, data, event_id=None):
+        message = json.dumps({'o': self.node_id, 'i': event_id, 'd': data})
+        self._command('PUBLISH', f"{self.prefix}:updates:{channel}", message)
+
+    def set_state(self, key, data, ttl=None):
+        args = ['SET', f"{self.prefix}:state:{key}", json.dumps(data)]
+        if ttl:
+            args += ['PX', int(ttl * 1000)]
+        self._command(*args)
+
+    def get_state(self, key):
+        raw = self._command('GET', f"{self.prefix}:state:{key}")
+        return json.loads(raw) if raw is not None else None
+
+    def add_to_list(self, key, item, ttl=None):
+        list_key = f"{self.prefix}:list:{key}"
+        self._command('RPUSH', list_key, item)
+        if ttl:
+            self._command('PEXPIRE', list_key, int(ttl * 1000))
+
+    def get_list(self, key):
+        return [item.decode('utf-8') for item in self._command('LRANGE', f"{self.prefix}:list:{key}", 0, -1)]
+
+    def remove_from_list(self, key, item):
+        self._command('LREM', f"{self.prefix}:list:{key}", 0, item)
+
+    def close(self):
+        self._closed = True
+        with self._command_lock:
+            self._commands.close()
+        if self._subscriber is not None:
+            self._subscriber.close()
+
+    def _command(self, *args):
+        with self._command_lock:
+            try:
+                return self._commands.command(*args)
+            except (OSError, ConnectionError):
+                # One retry on a fresh connection after a dropped socket
+                self._commands.close()
+                return self._commands.command(*args)
+
+    def _subscribe_loop(self):
+        pattern = f"{self.prefix}:updates:*"
+        channel_start = len(pattern) - 1
+        while not self._closed:
+            subscriber = RespConnection(**self._conn_args)
+            try:
+                subscriber.connect()
+                subscriber.send('PSUBSCRIBE', pattern)
+                subscriber.read_reply()
+                subscriber.settimeout(None)
+                self._subscriber = subscriber
+                self._subscribed.set()
+                log.info("📡 Broker: Subscribed", pattern=pattern, **self.location)
+
+                while not self._closed:
+                    reply = subscriber.read_reply()
+                    if not isinstance(reply, list) or len(reply) != 4 or reply[0] != b'pmessage':
+                        continue
+                    channel = reply[2].decode('utf-8')[channel_start:]
+                    message = json.loads(reply[3])
+                    self._dispatch(channel, message['d'], message['o'] == self.node_id, message.get('i'))
+            except Exception as e:
+                if self._closed:
+                    return
+                self._subscribed.clear()
+                log.error("❌ Broker: Subscription lost, reconnecting", error=e, retry_seconds=self.reconnect_delay)
+                time.sleep(self.reconnect_delay)
+            finally:
+                subscriber.close()
+
+
+def create_broker(url: Optional[str]) -> EventBroker:
+    """Broker for ``url``: Redis-protocol for redis:// URLs, in-process otherwise"""
+    if url and url.startswith('redis://'):
+        broker = RedisBroker(url)
+        if not broker.start():
+            log.warning("⚠️ Broker: Not subscribed yet, will keep retrying", **broker.location)
+        return broker
+    return InProcessBroker()
@@ -0,0 +1,202 @@
+"""Coalescing and rate limiting of progress updates before they are published.
+
+Stdout scraping, agent steps and streamed tokens can produce many updates
+per second for one job, and each one is numbered, serialized and written to
+every viewer. ``UpdateCoalescer`` holds routine updates for a short window
+per user and merges them, so a superseded ``current_thought`` is dropped
+and token chunks are concatenated. State transitions (a new step or agent,
+a job state change, start/finish of processing) are never held: they flush
+whatever is pending and go out immediately.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+from logs import get_logger
+
+log = get_logger('coalesce')
+
+# A change to any of these fields is a state transition
+TRANSITION_FIELDS = ('is_processing', 'current_step', 'current_agent', 'job_state')
+
+# Per-message flags and event kinds that always go out immediately
+TRANSITION_FLAGS = ('connected', 'final', 'cached', 'coalesced')
+TRANSITION_EVENTS = frozenset({'stage_started', 'stage_completed'})
+
+_MISSING = object()
+
+
+class _Channel:
+    """Pending merged updates and last delivered state for one user"""
+
+    __slots__ = ('key', 'lock', 'pending', 'state', 'due')
+
+    def __init__(self, key):
+        self.key = key
+        self.lock = threading.Lock()
+        self.pending = {}  # 'token' / 'status' -> merged update, in arrival order
+        self.state = {}
+        self.due = None
+
+
+class UpdateCoalescer:
+    """Merges each key's routine updates within ``window`` seconds.
+
+    ``deliver(key, update)`` publishes an update; it is called at most once
+    per window per key and kind of update, plus once for every transition.
+    A window of 0 delivers every update immediately.
+    """
+
+    def __init__(self, deliver: Callable[[str, dict], None], window: float = 0.1):
+        self.deliver = deliver
+        self.window = window
+        self._channels = {}
+        self._timers = []  # heap of (due, seq, channel)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self._stopping = False
+        self.submitted = 0
+        self.delivered = 0
+        self.merged = 0
+
+    def start(self):
+        if self.window > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._flush_loop, name='update-coalescer', daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        """Stop the timer thread after delivering everything pending"""
+        with self._lock:
+            self._stopping = True
+            self._wake.notify()
+            channels = list(self._channels.values())
+        if self._thread is not None:
+            self._thread.join()
+        for channel in channels:
+            with channel.lock:
+                self._flush_locked(channel)
+
+    def submit(self, key, update: dict):
+        """Publish ``update`` now if it is a transition, otherwise merge it into the window"""
+        with self._lock:
+            self.submitted += 1
+        if self.window <= 0 or self._thread is None:
+            self._send(key, update)
+            return
+
+        channel = self._channel(key)
+        with channel.lock:
+            if self._is_transition(channel, update):
+                self._flush_locked(channel)
+                self._deliver_locked(channel, update)
+                return
+
+            kind = 'token' if 'token' in update else 'status'
+            pending = channel.pending.get(kind)
+            if pending is None:
+                channel.pending[kind] = dict(update)
+            else:
+                with self._lock:
+                    self.merged += 1
+                if kind == 'token':
+                    token = pending['token'] + update['token']
+                    pending.update(update)
+                    pending['token'] = token
+                else:
+                    pending.update(update)
+
+            if channel.due is None:
+                channel.due = time.monotonic() + self.window
+                with self._lock:
+                    heapq.heappush(self._timers, (channel.due, next(self._seq), channel))
+                    self._wake.notify()
+
+    def flush(self, key):
+        """Deliver ``key``'s pending updates now"""
+        with self._lock:
+            channel = self._channels.get(key)
+        if channel is not None:
+            with channel.lock:
+                self._flush_locked(channel)
+
+    def discard(self, key):
+        """Forget a key's state, delivering anything still pending"""
+        with self._lock:
+            channel = self._channels.pop(key, None)
+        if channel is not None:
+            with channel.lock:
+                self._flush_locked(channel)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'window_ms': int(self.window * 1000),
+                'submitted': self.submitted,
+                'delivered': self.delivered,
+                'merged': self.merged,
+            }
+
+    def _channel(self, key):
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = self._channels[key] = _Channel(key)
+            return channel
+
+    @staticmethod
+    def _is_transition(channel, update):
+        if update.get('event') in TRANSITION_EVENTS:
+            return True
+        for flag in TRANSITION_FLAGS:
+            if update.get(flag):
+                return True
+        for field in TRANSITION_FIELDS:
+            if field in update and channel.state.get(field, _MISSING) != update[field]:
+                return True
+        return False
+
+    def _flush_locked(self, channel):
+        channel.due = None
+        if not channel.pending:
+            return
+        pending = list(channel.pending.values())
+        channel.pending.clear()
+        for update in pending:
+            self._deliver_locked(channel, update)
+
+    def _deliver_locked(self, channel, update):
+        for field in TRANSITION_FIELDS:
+            if field in update:
+                channel.state[field] = update[field]
+        self._send(channel.key, update)
+
+    def _send(self, key, update):
+        # Counters are bumped from producer and flusher threads alike
+        with self._lock:
+            self.delivered += 1
+        try:
+            self.deliver(key, update)
+        except Exception as e:
+            log.error("❌ Coalescer: Failed to deliver update", key=key, error=e)
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._stopping:
+                    now = time.monotonic()
+                    if self._timers and self._timers[0][0] <= now:
+                        break
+                    self._wake.wait(self._timers[0][0] - now if self._timers else None)
+                if self._stopping:
+                    return
+                due = []
+                while self._timers and self._timers[0][0] <= now:
+                    due.append(heapq.heappop(self._timers)[2])
+
+            for channel in due:
+                with channel.lock:
+                    self._flush_locked(channel)
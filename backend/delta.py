@@ -0,0 +1,113 @@
+"""Delta encoding of SSE progress updates.
+
+Legacy streams resend the whole status, including ``agent_thoughts`` with
+every finished article, in every update and heartbeat. A stream opened
+with ``?delta=1`` instead gets one snapshot followed by patches holding
+only what changed:
+
+    {"snapshot": {...state...}, "connected": true}
+    {"delta": {"set": {"current_step": 2},
+               "append": {"current_thought": " more text"},
+               "merge": {"agent_thoughts": {"Content Writer": "..."}}},
+     "event": "stage_completed"}
+
+Per-message flags (``TRANSIENT_FIELDS``) ride alongside unchanged and are
+not part of the state. The client keeps the state, applies each patch and
+sees ``{**state, **flags}`` as the full update.
+"""
+from typing import Optional
+
+# Per-message fields that describe the message rather than the job's state
+TRANSIENT_FIELDS = frozenset({
+    'event', 'token', 'heartbeat', 'connected', 'final', 'cached', 'coalesced',
+})
+
+
+class DeltaEncoder:
+    """Per-connection encoder tracking the state the client has been sent.
+
+    Starts by sending a snapshot. ``resume()`` starts from an empty baseline
+    for a client that reconnected with its state intact, so the first update
+    is a patch rather than a snapshot that would discard what it holds.
+    """
+
+    __slots__ = ('state',)
+
+    def __init__(self):
+        self.state: Optional[dict] = None
+
+    def resume(self):
+        self.state = {}
+
+    def encode(self, update_data: dict) -> dict:
+        flags = {}
+        fields = {}
+        for field, value in update_data.items():
+            if field in TRANSIENT_FIELDS:
+                flags[field] = value
+            else:
+                fields[field] = value
+
+        if self.state is None:
+            self.state = {field: _copy(value) for field, value in fields.items()}
+            flags['snapshot'] = fields
+            return flags
+
+        patch = {}
+        for field, value in fields.items():
+            if field not in self.state:
+                patch.setdefault('set', {})[field] = value
+                self.state[field] = _copy(value)
+                continue
+
+            old = self.state[field]
+            if value == old:
+                continue
+            if isinstance(value, str) and isinstance(old, str) and old and value.startswith(old):
+                patch.setdefault('append', {})[field] = value[len(old):]
+            elif isinstance(value, dict) and isinstance(old, dict) and value:
+                changes = {key: item for key, item in value.items() if old.get(key, _MISSING) != item}
+                changes.update({key: None for key in old if key not in value})
+                patch.setdefault('merge', {})[field] = changes
+            else:
+                patch.setdefault('set', {})[field] = value
+            self.state[field] = _copy(value)
+
+        if patch:
+            flags['delta'] = patch
+        return flags
+
+
+_MISSING = object()
+
+
+def _copy(value):
+    return dict(value) if isinstance(value, dict) else value
+
+
+def apply_delta(state: dict, message: dict) -> dict:
+    """Reference decoder: update ``state`` in place, return the full update"""
+    flags = dict(message)
+    snapshot = flags.pop('snapshot', None)
+    patch = flags.pop('delta', None)
+
+    if snapshot is not None:
+        state.clear()
+        state.update({field: _copy(value) for field, value in snapshot.items()})
+    if patch:
+        for field, value in patch.get('set', {}).items():
+            state[field] = _copy(value)
+        for field, suffix in patch.get('append', {}).items():
+            state[field] = state.get(field, '') + suffix
+        for field, changes in patch.get('merge', {}).items():
+            merged = dict(state.get(field) or {})
+            for key, item in changes.items():
+                if item is None:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = item
+            state[field] = merged
+
+    full = dict(state)
+    full.update(flags)
+    return full
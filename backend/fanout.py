@@ -0,0 +1,234 @@
+"""Shared fan-out of a user's updates to every stream watching it.
+
+Each published update becomes one ``Frame``. Its SSE bytes are built at
+most once per protocol (full JSON, or a delta patch) and the same bytes are
+written to every subscriber, so a share link or a second reviewer costs a
+queue append rather than another serialization.
+
+The delta patch is computed against one shared ``DeltaEncoder`` per
+channel. A new delta subscriber is sent a snapshot of that encoder's state,
+taken atomically with its subscription, and then the shared patches.
+
+Subscribers are Mailboxes with a bounded backlog: a client that stops
+reading is disconnected (and can resume via Last-Event-ID) instead of
+buffering the job's output in memory.
+"""
+import json
+import threading
+from typing import List, Optional
+
+from delta import DeltaEncoder
+from logs import get_logger
+from replay import EventFilter
+
+log = get_logger('sse')
+
+# Status fields sent when a stream opens and closes
+STATUS_FIELDS = ('current_step', 'current_agent', 'current_thought', 'agent_thoughts', 'is_processing')
+
+
+def sse_frame(payload, event_id=None) -> bytes:
+    """Frame a JSON payload as one SSE message"""
+    if event_id:
+        return f"id: {event_id}\ndata: {json.dumps(payload)}\n\n".encode('utf-8')
+    return f"data: {json.dumps(payload)}\n\n".encode('utf-8')
+
+
+class Frame:
+    """One published update; its encodings are built once and shared"""
+
+    __slots__ = ('event_id', 'data', 'patch', '_full_bytes', '_delta_bytes')
+
+    def __init__(self, event_id, data, patch):
+        self.event_id = event_id
+        self.data = data
+        self.patch = patch
+        self._full_bytes = None
+        self._delta_bytes = None
+
+    def encoded(self, delta: bool) -> bytes:
+        # Concurrent first readers may both encode; the result is identical
+        if delta:
+            if self._delta_bytes is None:
+                self._delta_bytes = sse_frame(self.patch, self.event_id)
+            return self._delta_bytes
+        if self._full_bytes is None:
+            self._full_bytes = sse_frame(self.data, self.event_id)
+        return self._full_bytes
+
+
+class _Channel:
+    __slots__ = ('lock', 'encoder', 'subscribers')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.encoder = DeltaEncoder()
+        self.encoder.resume()
+        self.subscribers = set()
+
+
+class StreamHub:
+    """Per-user publish/subscribe of Frames to any number of stream Mailboxes"""
+
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.deliveries = 0
+        self.overflows = 0
+
+    def subscribe(self, user_id, mailbox) -> dict:
+        """Start delivering the user's frames to ``mailbox``.
+
+        Returns the shared delta state at the moment of subscribing, which a
+        delta stream sends as its snapshot before the frames that follow.
+        """
+        with self._lock:
+            channel = self._channels.get(user_id)
+            if channel is None:
+                channel = self._channels[user_id] = _Channel()
+            with channel.lock:
+                channel.subscribers.add(mailbox)
+                return dict(channel.encoder.state)
+
+    def unsubscribe(self, user_id, mailbox):
+        with self._lock:
+            channel = self._channels.get(user_id)
+            if channel is None:
+                return
+            with channel.lock:
+                channel.subscribers.discard(mailbox)
+                if not channel.subscribers:
+                    # The next subscriber starts from a fresh snapshot
+                    del self._channels[user_id]
+
+    def close(self, user_id) -> int:
+        """Close every stream watching the user; returns how many there were"""
+        with self._lock:
+            channel = self._channels.pop(user_id, None)
+        if channel is None:
+            return 0
+        with channel.lock:
+            subscribers = list(channel.subscribers)
+            channel.subscribers.clear()
+        for mailbox in subscribers:
+            mailbox.close()
+        return len(subscribers)
+
+    def publish(self, user_id, event_id, data) -> int:
+        """Hand one update to every subscriber; returns how many received it"""
+        with self._lock:
+            channel = self._channels.get(user_id)
+        if channel is None:
+            return 0
+
+        with channel.lock:
+            frame = Frame(event_id, data, channel.encoder.encode(data))
+            subscribers = list(channel.subscribers)
+            # Appending under the channel lock keeps every mailbox in publish order
+            delivered = 0
+            for mailbox in subscribers:
+                if mailbox.put(frame):
+                    delivered += 1
+                elif mailbox.overflowed:
+                    self.overflows += 1
+                    channel.subscribers.discard(mailbox)
+                    log.warning("⚠️ SSE: Disconnected a slow stream (backlog full)", user_id=user_id)
+
+        self.published += 1
+        self.deliveries += delivered
+        return delivered
+
+    def delta_state(self, user_id) -> Optional[dict]:
+        """Copy of the shared delta state, or None without subscribers"""
+        with self._lock:
+            channel = self._channels.get(user_id)
+        if channel is None:
+            return None
+        with channel.lock:
+            return dict(channel.encoder.state)
+
+    def subscriber_count(self, user_id=None) -> int:
+        with self._lock:
+            if user_id is not None:
+                channel = self._channels.get(user_id)
+                return len(channel.subscribers) if channel else 0
+            return sum(len(channel.subscribers) for channel in self._channels.values())
+
+    def stats(self):
+        return {
+            'channels': len(self._channels),
+            'subscribers': self.subscriber_count(),
+            'published': self.published,
+            'deliveries': self.deliveries,
+            'overflows': self.overflows,
+        }
+
+
+def status_message(user_status, **flags) -> dict:
+    """The user's current status as a stream message"""
+    message = {field: user_status[field] for field in STATUS_FIELDS}
+    message.update(flags)
+    return message
+
+
+class StreamView:
+    """What one connection writes: its opening messages, shared frames, its closing status.
+
+    ``shared_state`` is what ``StreamHub.subscribe`` returned; delta streams
+    start from it so the shared patches apply cleanly.
+    """
+
+    def __init__(self, user_status, delta: bool, shared_state: dict):
+        self.user_status = user_status
+        self.delta = delta
+        self.shared_state = shared_state
+        self.seen = EventFilter()
+        self.finished = False
+
+    def opening(self, missed, last_event_id=None, snapshot_id=None) -> List[bytes]:
+        """Messages to send first: missed events on resume, otherwise a snapshot"""
+        if missed is not None:
+            self.seen = EventFilter(missed[-1][0] if missed else last_event_id)
+            self.finished = bool(missed) and not missed[-1][1].get('is_processing', False)
+            if not self.delta:
+                return [sse_frame(data, event_id) for event_id, data in missed]
+
+            # Patch the client's own state with what it missed, then line it up with the shared patches
+            encoder = DeltaEncoder()
+            encoder.resume()
+            messages = [sse_frame(encoder.encode(data), event_id) for event_id, data in missed]
+            messages.append(sse_frame({'snapshot': self._delta_snapshot()}))
+            return messages
+
+        self.seen = EventFilter(snapshot_id)
+        initial = status_message(self.user_status, connected=True)
+        initial['current_thought'] = initial['current_thought'] or 'Connection established'
+        if not self.delta:
+            return [sse_frame(initial, snapshot_id)]
+        return [sse_frame({'snapshot': self._delta_snapshot(initial), 'connected': True}, snapshot_id)]
+
+    def render(self, frame: Frame) -> Optional[bytes]:
+        """Bytes for a shared frame, or None if this stream has nothing to send for it"""
+        if not self.seen.accept(frame.event_id):
+            # Already covered by the opening, but later shared patches build on this one
+            if self.delta and 'delta' in frame.patch:
+                return sse_frame({'delta': frame.patch['delta']})
+            return None
+        if not frame.data.get('is_processing', False):
+            self.finished = True
+        return frame.encoded(self.delta)
+
+    def closing(self) -> bytes:
+        """Final status before the stream closes"""
+        final = status_message(self.user_status, final=True)
+        if not self.delta:
+            return sse_frame(final)
+        # A snapshot, since shared patches may have moved on since this stream's last frame
+        return sse_frame(DeltaEncoder().encode(final))
+
+    def _delta_snapshot(self, base=None):
+        snapshot = {field: value for field, value in (base or status_message(self.user_status)).items()
+                    if field != 'connected'}
+        snapshot.update(self.shared_state)
+        return snapshot
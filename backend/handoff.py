@@ -0,0 +1,146 @@
+"""Streamed hand-off between pipeline stages.
+
+Normally a stage starts once the stage before it has produced its whole
+output. The research stage's output is a list of insights that streams
+in token by token, so the writer can start planning from the first few.
+``ItemSplitter`` cuts the stream into completed list items, and
+``StreamedHandoff`` starts the next stage's first step on its own thread
+once ``min_items`` of them exist. The upstream stage keeps running in the
+meantime.
+"""
+import contextvars
+import re
+import threading
+import time
+from typing import Callable, List, Optional
+
+# "1. ", "2) ", "- ", "* " or "• " at the start of a line begins a new item
+_ITEM_START = re.compile(r'^\s*(?:\d+[.)]|[-*•])\s+')
+
+
+def item_text(item: str) -> str:
+    """An item without its "1." or "-" marker"""
+    return _ITEM_START.sub('', item, count=1).strip()
+
+
+def list_items(text: str, limit: Optional[int] = None) -> List[str]:
+    """The items of a complete numbered or bulleted list, without their markers"""
+    splitter = ItemSplitter()
+    items = [item_text(item) for item in splitter.feed(text) + splitter.finish()]
+    return [item for item in items if item][:limit]
+
+
+class ItemSplitter:
+    """Cuts streamed text into list items.
+
+    An item is complete once the next item starts or a blank line follows
+    it. Text outside any item (preambles, "Final Answer:") is skipped.
+    """
+
+    def __init__(self):
+        self.items = []
+        self._line = ''
+        self._item = None
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; returns the items it completed"""
+        completed = []
+        self._line += text
+        while '\n' in self._line:
+            line, self._line = self._line.split('\n', 1)
+            completed.extend(self._take_line(line))
+        return completed
+
+    def finish(self) -> List[str]:
+        """The stream ended; returns the items that completes"""
+        completed = self._take_line(self._line) if self._line else []
+        self._line = ''
+        return completed + self._close()
+
+    def _take_line(self, line):
+        if _ITEM_START.match(line):
+            completed = self._close()
+            self._item = [line.strip()]
+            return completed
+        if not line.strip():
+            return self._close()
+        if self._item is not None:
+            self._item.append(line.strip())
+        return []
+
+    def _close(self):
+        if self._item is None:
+            return []
+        item = ' '.join(self._item)
+        self._item = None
+        self.items.append(item)
+        return [item]
+
+
+class StreamedHandoff:
+    """Runs ``start(items)`` on its own thread once ``min_items`` items have streamed in.
+
+    ``feed`` may be called from any thread. After ``close`` (the upstream
+    stage finished) nothing new starts; the downstream stage then runs from
+    the whole output as usual, with ``result()`` as a head start when the
+    early step did run. The early step runs in a copy of the context
+    variables of the thread that started it, so log context carries over.
+    """
+
+    def __init__(self, min_items: int, start: Callable[[List[str]], str]):
+        self.min_items = min_items
+        self.splitter = ItemSplitter()
+        self.started_at = None
+        self.closed_at = None
+        self.error = None
+        self._start = start
+        self._result = None
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def feed(self, text: str):
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self.splitter.feed(text)
+            if len(self.splitter.items) >= self.min_items:
+                self._launch(list(self.splitter.items))
+
+    def close(self):
+        """The upstream stage finished; nothing starts after this"""
+        with self._lock:
+            self._closed = True
+            self.closed_at = time.time()
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def lead_seconds(self) -> Optional[float]:
+        """How long before the upstream stage finished the early step started"""
+        if self.started_at is None or self.closed_at is None:
+            return None
+        return max(0.0, self.closed_at - self.started_at)
+
+    def result(self) -> Optional[str]:
+        """The early step's output, waiting for it if needed; None if it never ran or failed"""
+        if self._thread is None:
+            return None
+        self._thread.join()
+        return self._result
+
+    def _launch(self, items):
+        # Called with the lock held
+        self.started_at = time.time()
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run, items),
+                                        name='stage-handoff', daemon=True)
+        self._thread.start()
+
+    def _run(self, items):
+        try:
+            self._result = self._start(items)
+        except Exception as e:
+            self.error = e
@@ -0,0 +1,133 @@
+"""Leveled, structured logging with per-job context and sampling.
+
+Messages keep the backend's emoji prefixes but carry their details as
+fields (``log.info("🚀 Job queued", topic=topic)``), rendered as
+``key=value`` text or one JSON object per line (``LOG_FORMAT=json``).
+Fields set with ``log_context(job_id=..., user_id=...)`` are added to every
+message logged inside it, including from code that knows nothing of the job.
+
+A call below ``LOG_LEVEL`` returns after one level check, before any
+formatting. High-frequency events (every update, every token) use
+``log.sampled(key, ...)``, which emits one in every ``LOG_SAMPLE_EVERY``
+calls per key and reports how many it stands for.
+"""
+import contextvars
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+ROOT = 'editorial'
+
+_context = contextvars.ContextVar('log_context', default={})
+
+
+@contextmanager
+def log_context(**fields):
+    """Add ``fields`` to every message logged in this block (and this thread or task)"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class Logger:
+    """Thin wrapper over a stdlib logger taking structured fields"""
+
+    __slots__ = ('_logger', '_samples', 'sample_every')
+
+    def __init__(self, name: str, sample_every: int = 100):
+        self._logger = logging.getLogger(f"{ROOT}.{name}")
+        self._samples = {}
+        self.sample_every = sample_every
+
+    def enabled(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def debug(self, message, **fields):
+        if self._logger.isEnabledFor(DEBUG):
+            self._emit(DEBUG, message, fields)
+
+    def info(self, message, **fields):
+        if self._logger.isEnabledFor(INFO):
+            self._emit(INFO, message, fields)
+
+    def warning(self, message, **fields):
+        if self._logger.isEnabledFor(WARNING):
+            self._emit(WARNING, message, fields)
+
+    def error(self, message, **fields):
+        if self._logger.isEnabledFor(ERROR):
+            self._emit(ERROR, message, fields)
+
+    def sampled(self, key, level: int, message, **fields):
+        """Log one in every ``sample_every`` calls for ``key``"""
+        if not self._logger.isEnabledFor(level):
+            return
+        counter = self._samples.get(key)
+        if counter is None:
+            counter = self._samples.setdefault(key, itertools.count())
+        if next(counter) % self.sample_every == 0:
+            fields['sampled'] = self.sample_every
+            self._emit(level, message, fields)
+
+    def _emit(self, level, message, fields):
+        context = _context.get()
+        if context:
+            fields = {**context, **fields}
+        self._logger.log(level, message, extra={'fields': fields})
+
+
+class TextFormatter(logging.Formatter):
+    """``12:00:01 INFO sse 🔄 Sending update user_id=... agent=...``"""
+
+    def format(self, record):
+        fields = getattr(record, 'fields', None) or {}
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname} " \
+               f"{record.name[len(ROOT) + 1:]} {record.getMessage()}"
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, fields at the top level"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name[len(ROOT) + 1:],
+            'msg': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure(level=None, fmt=None, stream=None):
+    """Set up the backend's log handler; defaults come from LOG_LEVEL and LOG_FORMAT"""
+    level = level or os.getenv('LOG_LEVEL', 'INFO').upper()
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    root = logging.getLogger(ROOT)
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    root.propagate = False
+
+
+def get_logger(name: str) -> Logger:
+    return Logger(name, sample_every=max(1, int(os.getenv('LOG_SAMPLE_EVERY', 100))))
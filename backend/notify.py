@@ -0,0 +1,215 @@
+"""Wake-on-event primitives for SSE stream loops.
+
+Stream loops used to wake every second on ``queue.get(timeout=1)`` just to
+count empty timeouts. Now a stream sleeps until something happens: the
+publisher wakes it through its ``Mailbox`` (``AsyncMailbox`` on an event
+loop), and heartbeats come from one shared ``TimerWheel`` that wakes each
+connected stream once per interval instead of every connection keeping its
+own timer.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Hashable, List, Optional
+
+from logs import get_logger
+
+log = get_logger('notify')
+
+# Returned by Mailbox.get() when the stream's heartbeat is due
+HEARTBEAT = object()
+
+# Returned once a mailbox has been closed, e.g. because its backlog overflowed
+CLOSED = object()
+
+# SSE comment line: keeps proxies and the connection alive, ignored by EventSource
+HEARTBEAT_COMMENT = ': heartbeat\n\n'
+
+
+class Mailbox:
+    """Update queue whose reader blocks until an update or heartbeat arrives.
+
+    With a ``limit``, a reader that falls that far behind is cut off: the
+    backlog is dropped and ``get()`` returns CLOSED, so a stalled client
+    cannot grow memory without bound.
+    """
+
+    __slots__ = ('limit', 'overflowed', '_items', '_ready', '_heartbeat_due', '_closed')
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.overflowed = False
+        self._items = deque()
+        self._ready = threading.Condition(threading.Lock())
+        self._heartbeat_due = False
+        self._closed = False
+
+    def put(self, item) -> bool:
+        """Queue an item; False if the mailbox is closed or just overflowed"""
+        with self._ready:
+            if self._closed:
+                return False
+            if self.limit is not None and len(self._items) >= self.limit:
+                self.overflowed = True
+                self._close_locked()
+                return False
+            self._items.append(item)
+            self._ready.notify()
+            return True
+
+    def heartbeat(self):
+        """Wake the reader for a heartbeat (called from the timer wheel)"""
+        with self._ready:
+            self._heartbeat_due = True
+            self._ready.notify()
+
+    def close(self):
+        with self._ready:
+            self._close_locked()
+
+    def get(self):
+        """Next update, HEARTBEAT or CLOSED; blocks without polling until one is available"""
+        with self._ready:
+            while not self._items and not self._heartbeat_due and not self._closed:
+                self._ready.wait()
+            if self._closed:
+                return CLOSED
+            if self._items:
+                return self._items.popleft()
+            self._heartbeat_due = False
+            return HEARTBEAT
+
+    def _close_locked(self):
+        self._closed = True
+        self._items.clear()
+        self._ready.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class AsyncMailbox:
+    """Mailbox for a reader on an asyncio loop; ``put`` may be called from any thread"""
+
+    __slots__ = ('loop', 'limit', 'overflowed', '_queue', '_closed')
+
+    def __init__(self, loop, limit: Optional[int] = None):
+        self.loop = loop
+        self.limit = limit
+        self.overflowed = False
+        self._queue = asyncio.Queue()
+        self._closed = False
+
+    def put(self, item) -> bool:
+        if self._closed or self.loop.is_closed():
+            return False
+        self.loop.call_soon_threadsafe(self._put, item)
+        return True
+
+    def heartbeat(self):
+        """Called on the loop by its timer wheel"""
+        self._put(HEARTBEAT)
+
+    def close(self):
+        """Stop the reader; may be called from any thread"""
+        if self._on_loop():
+            self._close()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._close)
+
+    def _on_loop(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _close(self):
+        if not self._closed:
+            self._closed = True
+            self._drain()
+            self._queue.put_nowait(CLOSED)
+
+    async def get(self):
+        return await self._queue.get()
+
+    def _put(self, item):
+        if self._closed:
+            return
+        if self.limit is not None and item is not HEARTBEAT and self._queue.qsize() >= self.limit:
+            self.overflowed = True
+            self._close()
+            return
+        self._queue.put_nowait(item)
+
+    def _drain(self):
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __len__(self):
+        return self._queue.qsize()
+
+
+class TimerWheel:
+    """Hashed timer wheel firing each entry once per ``interval``.
+
+    The interval is split into ``slots`` buckets and one bucket is due per
+    tick, so the cost of a tick is proportional to the streams due in it
+    rather than to every open connection.
+    """
+
+    def __init__(self, interval: float = 5.0, slots: int = 10):
+        self.interval = interval
+        self.slots = slots
+        self.tick = interval / slots
+        self._buckets = [set() for _ in range(slots)]
+        self._where = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def add(self, entry: Hashable):
+        """Fire ``entry`` one full interval from now, then every interval"""
+        with self._lock:
+            # The bucket just behind the cursor comes round last
+            index = (self._cursor - 1) % self.slots
+            self._buckets[index].add(entry)
+            self._where[entry] = index
+
+    def remove(self, entry: Hashable):
+        with self._lock:
+            index = self._where.pop(entry, None)
+            if index is not None:
+                self._buckets[index].discard(entry)
+
+    def advance(self) -> List[Hashable]:
+        """Entries due at this tick; moves the wheel on by one slot"""
+        with self._lock:
+            due = list(self._buckets[self._cursor])
+            self._cursor = (self._cursor + 1) % self.slots
+            return due
+
+    def __len__(self):
+        return len(self._where)
+
+
+def fire_due(wheel: TimerWheel):
+    """Call every entry due at this tick"""
+    for beat in wheel.advance():
+        try:
+            beat()
+        except Exception as e:
+            log.error("❌ Heartbeat: Failed to wake stream", error=e)
+
+
+def start_wheel_thread(wheel: TimerWheel, name: str = 'sse-heartbeats') -> threading.Thread:
+    """Drive a wheel of callables from one daemon thread"""
+    def run():
+        next_tick = time.monotonic()
+        while True:
+            next_tick += wheel.tick
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            fire_due(wheel)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
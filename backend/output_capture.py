@@ -0,0 +1,208 @@
+"""Legacy progress tracking by scraping CrewAI's verbose stdout.
+
+Only used when PROGRESS_SOURCE=stdout. Every write is scanned once by a
+single precompiled regex covering the agent-start, thinking and completion
+markers plus the agent names, and only the tail of the output is retained.
+"""
+import re
+import time
+from collections import deque
+
+from logs import get_logger
+
+log = get_logger('capture')
+
+AGENT_START_PATTERNS = (
+    "Working Agent:",
+    "Agent:",
+    "🤖 Agent Started",
+    "Starting agent:",
+    "# Agent:",
+    "[Agent]",
+    ">>> Agent",
+)
+
+THINKING_PATTERNS = (
+    "Thought:",
+    "I need to",
+    "Let me",
+    "I will",
+    "I should",
+    "First,",
+    "Next,",
+    "Now I",
+    "Action:",
+    "Observation:",
+    "Reasoning:",
+    "Analysis:",
+)
+
+COMPLETION_PATTERNS = (
+    "Final Answer:",
+    "Task completed successfully",
+    "Finished working on",
+    "Agent execution complete",
+    "OUTPUT:",
+    "RESULT:",
+)
+
+# Keep this much recent output for debugging instead of the whole run
+DEFAULT_BUFFER_CHARS = 64 * 1024
+
+
+def _alternation(literals):
+    # Longest first so overlapping markers ("# Agent:" / "Agent:") match whole
+    return '|'.join(re.escape(literal) for literal in sorted(literals, key=len, reverse=True))
+
+
+def compile_activity_matcher(agent_names):
+    """One regex that finds every marker class and agent keyword in a single scan"""
+    agent_keywords = {}
+    for index, agent_name in enumerate(agent_names):
+        for keyword in (agent_name, agent_name.split()[-1]):
+            agent_keywords.setdefault(keyword, index)
+    pattern = '|'.join([
+        f'(?P<start>{_alternation(AGENT_START_PATTERNS)})',
+        f'(?P<done>{_alternation(COMPLETION_PATTERNS)})',
+        f'(?P<think>{_alternation(THINKING_PATTERNS)})',
+        f'(?P<agent>{_alternation(agent_keywords)})',
+    ])
+    return re.compile(pattern), agent_keywords
+
+
+class TailBuffer:
+    """Ring of recent text chunks holding at most ``capacity`` characters"""
+
+    def __init__(self, capacity=DEFAULT_BUFFER_CHARS):
+        self.capacity = capacity
+        self._chunks = deque()
+        self._size = 0
+
+    def append(self, text):
+        if len(text) >= self.capacity:
+            self._chunks.clear()
+            self._chunks.append(text[-self.capacity:])
+            self._size = self.capacity
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+        while self._size > self.capacity:
+            overflow = self._size - self.capacity
+            oldest = self._chunks[0]
+            if len(oldest) <= overflow:
+                self._chunks.popleft()
+                self._size -= len(oldest)
+            else:
+                self._chunks[0] = oldest[overflow:]
+                self._size -= overflow
+
+    def getvalue(self):
+        return ''.join(self._chunks)
+
+    def __len__(self):
+        return self._size
+
+
+class CrewAIOutputCapture:
+    """Captures and parses CrewAI output to track agent progress in real-time
+
+    ``get_status(user_id)`` returns the mutable status dict to update and
+    ``send_update(user_id, data)`` publishes a progress update.
+    """
+
+    def __init__(self, original_stdout, agent_names, user_id, get_status, send_update,
+                 buffer_chars=DEFAULT_BUFFER_CHARS):
+        self.original_stdout = original_stdout
+        self.agent_names = list(agent_names)
+        self.user_id = user_id
+        self.get_status = get_status
+        self.send_update = send_update
+        self.buffer = TailBuffer(buffer_chars)
+        self._matcher, self._agent_keywords = compile_activity_matcher(self.agent_names)
+
+    def write(self, text):
+        # Write to original stdout so we still see the output
+        self.original_stdout.write(text)
+        self.original_stdout.flush()
+
+        # Keep a bounded tail for parsing/debugging
+        self.buffer.append(text)
+
+        # Parse for agent activity
+        self._parse_agent_activity(text)
+
+    def flush(self):
+        self.original_stdout.flush()
+
+    def _parse_agent_activity(self, text):
+        """Parse CrewAI output for agent start/completion markers in one pass"""
+        try:
+            clean_text = text.strip()
+            start_seen = False
+            think_at = done_at = None
+            done_end = 0
+            agent_index = None
+
+            for match in self._matcher.finditer(clean_text):
+                kind = match.lastgroup
+                if kind == 'start':
+                    start_seen = True
+                elif kind == 'agent':
+                    index = self._agent_keywords[match.group()]
+                    if agent_index is None or index < agent_index:
+                        agent_index = index
+                elif kind == 'think':
+                    if think_at is None:
+                        think_at = match.start()
+                elif done_at is None:
+                    done_at = match.start()
+                    done_end = match.end()
+
+            if not start_seen and think_at is None and done_at is None:
+                return
+
+            user_status = self.get_status(self.user_id)
+            if not user_status:
+                return
+
+            # Agent start or transition
+            if start_seen and agent_index is not None:
+                agent_name = self.agent_names[agent_index]
+                if user_status['current_agent'] != agent_name or user_status['current_step'] != agent_index:
+                    self._publish(user_status, agent_index, agent_name,
+                                  f"{agent_name} is beginning their task...")
+                    log.debug("🎯 Detected agent start", user_id=self.user_id, agent=agent_name, step=agent_index)
+
+            # Real-time thoughts
+            current_agent = user_status.get('current_agent')
+            if think_at is not None and current_agent:
+                thought_text = clean_text[think_at:think_at + 150].split('\n')[0]
+                self._publish(user_status, user_status['current_step'], current_agent,
+                              f"{current_agent}: {thought_text}")
+
+            # Final answer / completion, only for substantial outputs
+            current_agent = user_status.get('current_agent')
+            if done_at is not None and current_agent and current_agent not in user_status['agent_thoughts']:
+                result_text = clean_text[done_end:done_end + 300].split('\n')[0].strip()
+                if len(result_text) > 20:
+                    timestamp = time.strftime("%H:%M:%S")
+                    user_status['agent_thoughts'][current_agent] = f"[{timestamp}] {result_text[:200]}..."
+                    self._publish(user_status, user_status['current_step'], current_agent,
+                                  f"{current_agent} has completed their task")
+                    log.debug("✅ Detected agent completion", user_id=self.user_id, agent=current_agent,
+                              output=result_text[:50])
+
+        except Exception as e:
+            log.error("❌ Error parsing CrewAI output", user_id=self.user_id, error=e)
+
+    def _publish(self, user_status, step, agent_name, thought):
+        user_status['current_step'] = step
+        user_status['current_agent'] = agent_name
+        user_status['current_thought'] = thought
+        self.send_update(self.user_id, {
+            'current_step': step,
+            'current_agent': agent_name,
+            'current_thought': thought,
+            'agent_thoughts': user_status['agent_thoughts'],
+            'is_processing': True
+        })
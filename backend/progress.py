@@ -0,0 +1,111 @@
+"""Typed progress events built from CrewAI's step and task callbacks.
+
+Each running stage gets its own ``CrewProgressReporter`` bound to the job,
+so progress no longer depends on redirecting the process-wide stdout and
+stays correct when several crews run at once.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from logs import get_logger
+
+log = get_logger('progress')
+
+# Event kinds
+STAGE_STARTED = 'stage_started'
+AGENT_STEP = 'agent_step'
+TOKEN = 'token'
+STAGE_COMPLETED = 'stage_completed'
+
+MAX_STEP_TEXT = 150
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """One thing that happened while a job's crew was running"""
+    job_id: str
+    kind: str
+    step: int
+    agent: str
+    text: str = ''
+    timestamp: float = field(default_factory=time.time)
+
+
+def describe_step(step_output) -> str:
+    """Short human-readable line for a CrewAI step callback payload.
+
+    Handles AgentAction/AgentFinish/ToolResult objects from current CrewAI
+    as well as the ``[(action, observation)]`` lists older versions pass.
+    """
+    if isinstance(step_output, (list, tuple)) and step_output:
+        step_output = step_output[-1]
+        if isinstance(step_output, tuple):
+            step_output = step_output[0]
+
+    text = ''
+    for attribute in ('thought', 'log', 'text', 'result', 'output'):
+        value = getattr(step_output, attribute, None)
+        if isinstance(value, str) and value.strip():
+            text = value
+            break
+    tool = getattr(step_output, 'tool', None)
+    if not text and tool:
+        text = f"Using tool: {tool}"
+
+    text = text.strip().split('\n')[0]
+    return text[:MAX_STEP_TEXT]
+
+
+def task_output_text(task_output) -> str:
+    """Final text of a CrewAI task callback payload across CrewAI versions"""
+    raw = getattr(task_output, 'raw', None) or getattr(task_output, 'exported_output', None)
+    return str(raw if raw else task_output)
+
+
+class CrewProgressReporter:
+    """Turns one stage's CrewAI callbacks into ProgressEvents for ``emit``"""
+
+    def __init__(self, job_id: str, step: int, agent: str,
+                 emit: Callable[[ProgressEvent], None]):
+        self.job_id = job_id
+        self.step = step
+        self.agent = agent
+        self.emit = emit
+        self.completed = False
+
+    def started(self):
+        """Report that the stage is about to run"""
+        self._emit(STAGE_STARTED, f"{self.agent} is beginning their task...")
+
+    def step_callback(self, step_output):
+        """Agent ``step_callback``: one reasoning or tool step finished"""
+        text = describe_step(step_output)
+        if text:
+            self._emit(AGENT_STEP, text)
+
+    def note(self, text: str):
+        """Report a step the stage's own code took, outside any CrewAI callback"""
+        self._emit(AGENT_STEP, text[:MAX_STEP_TEXT])
+
+    def token_callback(self, chunk: str):
+        """Streaming sink: a chunk of the agent's output as the LLM generates it"""
+        self._emit(TOKEN, chunk)
+
+    def task_callback(self, task_output):
+        """Task ``callback``: the stage produced its final output"""
+        self.complete(task_output_text(task_output))
+
+    def complete(self, output: str):
+        """Report the stage's final output (once)"""
+        if self.completed:
+            return
+        self.completed = True
+        self._emit(STAGE_COMPLETED, output)
+
+    def _emit(self, kind, text):
+        try:
+            self.emit(ProgressEvent(self.job_id, kind, self.step, self.agent, text))
+        except Exception as e:
+            # Progress reporting must never break the crew run itself
+            log.error("❌ Progress: Failed to publish", kind=kind, job_id=self.job_id, error=e)
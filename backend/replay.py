@@ -0,0 +1,142 @@
+"""Numbered SSE events and bounded replay for reconnecting clients.
+
+Every update published to a stream gets an ID of the form
+``<stream>-<seq>``: ``stream`` changes whenever the stream starts a new job
+and ``seq`` counts up from 1. Recent events are kept in a per-stream ring,
+so a client reconnecting with ``Last-Event-ID`` receives exactly the events
+it missed. If they have already fallen out of the ring (or belong to an
+earlier job) the caller sends a full snapshot instead.
+"""
+import threading
+import uuid
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple
+
+Event = Tuple[str, dict]
+
+
+def parse_event_id(event_id) -> Optional[Tuple[str, int]]:
+    """``(stream, seq)`` from an event ID, or None if it isn't one of ours"""
+    if not event_id:
+        return None
+    stream, _, seq = str(event_id).rpartition('-')
+    if not stream or not seq.isdigit():
+        return None
+    return stream, int(seq)
+
+
+class ReplayBuffer:
+    """Ring of the most recent events of one stream"""
+
+    __slots__ = ('stream', 'last_seq', 'events')
+
+    def __init__(self, capacity: int, stream: Optional[str] = None):
+        self.stream = stream or uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self.events = deque(maxlen=capacity)  # (seq, data)
+
+    def event_id(self, seq):
+        return f"{self.stream}-{seq}"
+
+    def since(self, seq) -> Optional[List[Event]]:
+        if seq >= self.last_seq:
+            return []
+        oldest = self.events[0][0] if self.events else self.last_seq + 1
+        if seq < oldest - 1:
+            return None
+        return [(self.event_id(s), data) for s, data in self.events if s > seq]
+
+
+class ReplayLog:
+    """Replay buffers keyed by stream (user) with a cap on how many are kept"""
+
+    def __init__(self, capacity: int = 1000, max_streams: int = 10000):
+        self.capacity = capacity
+        self.max_streams = max_streams
+        self._buffers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, key, data) -> str:
+        """Number a new event on ``key``'s stream and keep it for replay"""
+        with self._lock:
+            buffer = self._buffer(key)
+            buffer.last_seq += 1
+            buffer.events.append((buffer.last_seq, data))
+            return buffer.event_id(buffer.last_seq)
+
+    def record(self, key, event_id, data):
+        """Keep an event numbered by another process"""
+        parsed = parse_event_id(event_id)
+        if parsed is None:
+            return
+        stream, seq = parsed
+        with self._lock:
+            buffer = self._buffer(key)
+            if buffer.stream != stream:
+                buffer = self._buffers[key] = ReplayBuffer(self.capacity, stream)
+            if seq > buffer.last_seq:
+                buffer.last_seq = seq
+                buffer.events.append((seq, data))
+
+    def reset(self, key):
+        """Start a fresh stream for ``key`` (a new job); old IDs stop replaying"""
+        with self._lock:
+            self._buffers.pop(key, None)
+            self._buffer(key)
+
+    def since(self, key, last_event_id) -> Optional[List[Event]]:
+        """Events after ``last_event_id``, or None if they can't all be replayed"""
+        parsed = parse_event_id(last_event_id)
+        if parsed is None:
+            return None
+        stream, seq = parsed
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None or buffer.stream != stream:
+                return None
+            return buffer.since(seq)
+
+    def latest_id(self, key) -> Optional[str]:
+        """ID of the newest event on ``key``'s stream, for tagging snapshots"""
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None or not buffer.last_seq:
+                return None
+            return buffer.event_id(buffer.last_seq)
+
+    def discard(self, key):
+        with self._lock:
+            self._buffers.pop(key, None)
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def _buffer(self, key):
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = ReplayBuffer(self.capacity)
+            while len(self._buffers) > self.max_streams:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer
+
+
+class EventFilter:
+    """Drops events a stream has already sent (replayed, or seen twice)"""
+
+    __slots__ = ('stream', 'seq')
+
+    def __init__(self, last_event_id=None):
+        parsed = parse_event_id(last_event_id)
+        self.stream, self.seq = parsed if parsed else (None, 0)
+
+    def accept(self, event_id) -> bool:
+        parsed = parse_event_id(event_id)
+        if parsed is None:
+            return True
+        stream, seq = parsed
+        if stream == self.stream and seq <= self.seq:
+            return False
+        self.stream, self.seq = stream, seq
+        return True
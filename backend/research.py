@@ -0,0 +1,105 @@
+"""Map-reduce research: sub-questions researched in parallel, then merged.
+
+The single research task is one long sequential conversation. In the
+``map_reduce`` research mode the topic is first split into a handful of
+sub-questions, each sub-question is researched by its own agent on a
+bounded pool, and a final step merges the findings into the 3–5 insights
+the writer expects. The stage then takes about as long as the slowest
+sub-question plus the split and merge steps.
+"""
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from handoff import list_items
+from taskgraph import run_each
+
+# Research modes
+SINGLE = 'single'
+MAP_REDUCE = 'map_reduce'
+RESEARCH_MODES = (SINGLE, MAP_REDUCE)
+
+
+def parse_subquestions(text: str, limit: int) -> List[str]:
+    """Up to ``limit`` sub-questions from a numbered or bulleted list"""
+    return list_items(text, limit)
+
+
+class Finding(NamedTuple):
+    question: str
+    text: Optional[str]
+    seconds: float
+    error: Optional[Exception] = None
+
+
+def research_concurrently(questions: List[str], run: Callable[[str], str], workers: int) -> List[Finding]:
+    """``run(question)`` for every question on at most ``workers`` threads, in question order.
+
+    A failed question is reported in its Finding instead of raising, so the
+    other findings can still be merged. Fans out with ``taskgraph.run_each``.
+    """
+    def timed(question):
+        start = time.time()
+        try:
+            return Finding(question, run(question), time.time() - start)
+        except Exception as e:
+            return Finding(question, None, time.time() - start, e)
+
+    return run_each(questions, timed, workers)
+
+
+def merge_input(findings: List[Finding]) -> str:
+    """The findings laid out for the merge step"""
+    return '\n\n'.join(f"Question: {finding.question}\nFindings:\n{finding.text}"
+                       for finding in findings if finding.text)
+
+
+class ResearchTimings:
+    """Wall time of research stages per mode, so the modes can be compared on live traffic.
+
+    The single-agent baseline is measured from single-mode runs (including
+    map-reduce runs that fell back to one pass); until there is one,
+    ``baseline_seconds`` stands in for it.
+    """
+
+    def __init__(self, baseline_seconds: Optional[float] = None):
+        self.baseline_seconds = baseline_seconds
+        self._lock = threading.Lock()
+        self._modes = {}
+
+    def record(self, mode: str, seconds: float, questions: int = 0, question_seconds: float = 0.0):
+        """Count one research stage; ``question_seconds`` is the sub-questions' total time"""
+        with self._lock:
+            entry = self._modes.setdefault(mode, {'runs': 0, 'seconds': 0.0, 'questions': 0,
+                                                  'question_seconds': 0.0, 'last_seconds': None})
+            entry['runs'] += 1
+            entry['seconds'] += seconds
+            entry['questions'] += questions
+            entry['question_seconds'] += question_seconds
+            entry['last_seconds'] = seconds
+
+    def baseline(self) -> Optional[float]:
+        """Average single-agent research seconds, measured or configured"""
+        with self._lock:
+            entry = self._modes.get(SINGLE)
+            return entry['seconds'] / entry['runs'] if entry else self.baseline_seconds
+
+    def stats(self):
+        with self._lock:
+            stats = {}
+            for mode, entry in self._modes.items():
+                stats[mode] = {
+                    'runs': entry['runs'],
+                    'avg_seconds': round(entry['seconds'] / entry['runs'], 1),
+                    'last_seconds': round(entry['last_seconds'], 1),
+                }
+                if entry['questions']:
+                    stats[mode]['avg_questions'] = round(entry['questions'] / entry['runs'], 1)
+                    stats[mode]['avg_question_seconds'] = round(entry['question_seconds'] / entry['runs'], 1)
+            single, mapped = stats.get(SINGLE), stats.get(MAP_REDUCE)
+            baseline = single['avg_seconds'] if single else self.baseline_seconds
+            if baseline and mapped and mapped['avg_seconds']:
+                stats['baseline_seconds'] = round(baseline, 1)
+                stats['baseline'] = 'measured' if single else 'configured'
+                stats['speedup'] = round(baseline / mapped['avg_seconds'], 2)
+            return stats
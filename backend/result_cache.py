@@ -0,0 +1,149 @@
+"""Content-addressed cache for finished editorial runs.
+
+Entries are keyed by the normalized topic, the model name and a fingerprint
+of the agent/task prompts, so changing any prompt naturally invalidates old
+results. A bounded in-memory LRU sits in front of an optional SQLite file.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+_WHITESPACE = re.compile(r'\s+')
+_EDGE_PUNCTUATION = re.compile(r'^[\W_]+|[\W_]+$')
+
+
+def normalize_topic(topic: str) -> str:
+    """Canonical form of a topic: lowercase, single-spaced, no edge punctuation"""
+    topic = _WHITESPACE.sub(' ', topic.strip().lower())
+    return _EDGE_PUNCTUATION.sub('', topic)
+
+
+def make_cache_key(*parts: str) -> str:
+    """SHA-256 over the given parts, unambiguously separated"""
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode('utf-8')
+        digest.update(str(len(encoded)).encode('ascii') + b':' + encoded)
+    return digest.hexdigest()
+
+
+def result_cache_key(topic: str, model: str, prompts_hash: str) -> str:
+    """Cache key for a whole editorial run"""
+    return make_cache_key('run', normalize_topic(topic), model, prompts_hash)
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache with an optional SQLite tier.
+
+    ``max_entries`` bounds the in-memory tier; the SQLite tier is only
+    bounded by ``ttl`` and is swept with :meth:`purge_expired`.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 86400,
+                 db_path: Optional[str] = None, table: str = 'results'):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.table = table
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self.hits += 1
+                        return value
+                    self._db.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serializable value in every tier"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value), expires_at)
+                )
+                self._db.commit()
+
+    def delete(self, key: str):
+        """Drop a key from every tier"""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                self._db.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                self._db.commit()
+
+    def purge_expired(self) -> int:
+        """Remove expired entries from every tier, returning how many were dropped"""
+        now = time.time()
+        with self._lock:
+            stale = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in stale:
+                del self._entries[key]
+            removed = len(stale)
+            if self._db is not None:
+                cursor = self._db.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (now,))
+                self._db.commit()
+                removed += cursor.rowcount
+            return removed
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_tier': self._db is not None,
+            }
+
+    def _remember(self, key, expires_at, value):
+        # Called with the lock held
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,191 @@
+"""Bounded job scheduler for CrewAI runs.
+
+A fixed pool of worker threads pulls jobs from a FIFO queue so a burst of
+requests cannot start an unbounded number of concurrent crews.
+"""
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Optional
+
+from logs import get_logger
+
+log = get_logger('scheduler')
+
+# Job states reported to clients
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """Raised when the scheduler cannot accept more queued jobs"""
+
+
+class Job:
+    """A single editorial run waiting for, or holding, a worker"""
+
+    __slots__ = ('job_id', 'user_id', 'topic', 'state', 'error',
+                 'submitted_at', 'started_at', 'finished_at', 'seq')
+
+    def __init__(self, job_id, user_id, topic, seq):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.topic = topic
+        self.state = QUEUED
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.seq = seq
+
+    def to_dict(self):
+        """Serializable view of the job for status endpoints"""
+        return {
+            'job_id': self.job_id,
+            'user_id': self.user_id,
+            'topic': self.topic,
+            'state': self.state,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobScheduler:
+    """Runs jobs on a fixed-size worker pool in submission order.
+
+    ``runner(job)`` does the actual work; an exception marks the job failed.
+    ``on_queue_change(job, position)`` is called for every job still waiting
+    whenever the queue moves, with ``position`` counted from 1.
+    """
+
+    def __init__(self, runner: Callable[[Job], None], workers: int = 2,
+                 max_queued: int = 100,
+                 on_queue_change: Optional[Callable[[Job, int], None]] = None,
+                 finished_ttl: float = 3600):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.on_queue_change = on_queue_change
+        self.finished_ttl = finished_ttl
+
+        self._pending = deque()
+        self._jobs = {}
+        self._running = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop,
+                                          name=f"crew-worker-{i}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and let workers exit after their current job"""
+        with self._lock:
+            self._stopping = True
+            self._has_work.notify_all()
+            threads = list(self._threads)
+            self._threads = []
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def submit(self, user_id, topic, job_id=None) -> Job:
+        """Queue a job and return it; raises QueueFullError when saturated"""
+        with self._lock:
+            if len(self._pending) >= self.max_queued:
+                raise QueueFullError(f"Job queue is full ({self.max_queued} waiting)")
+            job = Job(job_id or str(uuid.uuid4()), user_id, topic, next(self._seq))
+            self._jobs[job.job_id] = job
+            self._pending.append(job)
+            position = len(self._pending)
+            self._prune_finished()
+            self._has_work.notify()
+        self._notify(job, position)
+        return job
+
+    def get(self, job_id) -> Optional[Job]:
+        """Look up a job by ID"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job_id) -> int:
+        """1-based queue position of a waiting job, 0 once it has left the queue"""
+        with self._lock:
+            for index, job in enumerate(self._pending):
+                if job.job_id == job_id:
+                    return index + 1
+        return 0
+
+    def stats(self):
+        """Current pool utilisation"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'running': self._running,
+                'queued': len(self._pending),
+                'max_queued': self.max_queued,
+            }
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopping:
+                    self._has_work.wait()
+                if self._stopping:
+                    return
+                job = self._pending.popleft()
+                job.state = RUNNING
+                job.started_at = time.time()
+                self._running += 1
+                waiting = list(self._pending)
+
+            # Everyone behind this job moved up one place
+            for index, queued_job in enumerate(waiting):
+                self._notify(queued_job, index + 1)
+
+            try:
+                self.runner(job)
+                job.state = DONE
+            except Exception as e:
+                job.state = FAILED
+                job.error = str(e)
+                log.error("❌ Scheduler: Job failed", job_id=job.job_id, error=e)
+            finally:
+                job.finished_at = time.time()
+                with self._lock:
+                    self._running -= 1
+
+    def _notify(self, job, position):
+        if not self.on_queue_change:
+            return
+        try:
+            self.on_queue_change(job, position)
+        except Exception as e:
+            log.error("❌ Scheduler: Queue callback failed", job_id=job.job_id, error=e)
+
+    def _prune_finished(self):
+        # Called with the lock held; forget jobs that finished long ago
+        cutoff = time.time() - self.finished_ttl
+        stale = [job_id for job_id, job in self._jobs.items()
+                 if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in stale:
+            del self._jobs[job_id]
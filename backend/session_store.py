@@ -0,0 +1,118 @@
+"""SQLite-backed Flask session interface.
+
+The filesystem Flask-Session backend reads and rewrites a session file on
+every request, including each status poll and SSE connect, and leaves old
+files behind. ``SQLiteSessionInterface`` keeps sessions in one WAL-mode
+SQLite table instead. A request reads a single row; the row is only
+rewritten when the session changed or its expiry needs extending, and
+expired rows are deleted in batches rather than per request.
+"""
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class SQLiteSession(CallbackDict, SessionMixin):
+    """Session dict that remembers its ID, expiry and whether it changed"""
+
+    def __init__(self, initial=None, sid=None, expires_at=None, new=False):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.new = new
+        self.modified = False
+
+
+class SQLiteSessionInterface(SessionInterface):
+    """Flask sessions stored as JSON rows keyed by a random session ID.
+
+    An unchanged session's expiry is pushed back at most once per
+    ``refresh_after`` seconds. Expired rows are purged every
+    ``purge_every`` writes and by :meth:`purge_expired`.
+    """
+
+    def __init__(self, db_path: str, ttl: float = 3600, refresh_after: Optional[float] = None,
+                 purge_every: int = 1000, table: str = 'flask_sessions'):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid session table name: {table!r}")
+        self.ttl = ttl
+        self.refresh_after = ttl / 10 if refresh_after is None else refresh_after
+        self.purge_every = purge_every
+        self.table = table
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            'sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._db.execute(f'CREATE INDEX IF NOT EXISTS {table}_expires_at ON {table} (expires_at)')
+        self._db.commit()
+
+    def open_session(self, app, request) -> SQLiteSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            with self._lock:
+                row = self._db.execute(
+                    f'SELECT data, expires_at FROM {self.table} WHERE sid = ?', (sid,)
+                ).fetchone()
+            if row is not None and row[1] > time.time():
+                return SQLiteSession(json.loads(row[0]), sid=sid, expires_at=row[1])
+        return SQLiteSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session: SQLiteSession, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                with self._lock:
+                    self._db.execute(f'DELETE FROM {self.table} WHERE sid = ?', (session.sid,))
+                    self._db.commit()
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        refresh_due = session.expires_at is None or session.expires_at - now < self.ttl - self.refresh_after
+        if not (session.modified or session.new or refresh_due):
+            return
+
+        expires_at = now + self.ttl
+        with self._lock:
+            self._db.execute(
+                f'INSERT OR REPLACE INTO {self.table} (sid, data, expires_at) VALUES (?, ?, ?)',
+                (session.sid, json.dumps(dict(session)), expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._db.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (now,))
+            self._db.commit()
+
+        response.set_cookie(
+            name, session.sid, max_age=int(self.ttl), domain=domain, path=path,
+            httponly=self.get_cookie_httponly(app), secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+    def purge_expired(self) -> int:
+        """Delete expired sessions, returning how many were dropped"""
+        with self._lock:
+            cursor = self._db.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (time.time(),))
+            self._db.commit()
+            return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
@@ -0,0 +1,193 @@
+"""Per-user session state shared by request handlers and crew worker threads.
+
+``SessionRegistry`` splits users across shards, each a plain dict behind
+its own lock, so creating, touching and cleaning up sessions is safe from
+any thread without one global lock serializing every request. Records are
+``SessionRecord`` objects with ``__slots__`` and monotonic timestamps.
+They keep the dict-style access (``status['current_step']``) the rest of
+the backend uses, and ``to_dict()`` renders them for JSON.
+
+Expiry is indexed: each shard keeps a heap of (deadline, user) with one
+entry per session. Touching a session only updates its timestamp; a sweep
+pops the entries that have come due and reschedules those that were
+touched since, so it costs O(log n) per due session instead of a scan.
+"""
+import heapq
+import threading
+import time
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+# Fields rendered by to_dict(), in order
+STATUS_FIELDS = (
+    'is_processing', 'current_step', 'total_steps', 'topic', 'result', 'error',
+    'agent_thoughts', 'current_agent', 'current_thought', 'job_id', 'job_state',
+    'queue_position',
+)
+
+# Only rendered once set
+OPTIONAL_FIELDS = ('final_result', 'speculation')
+
+# Bookkeeping that is never sent to clients
+INTERNAL_FIELDS = ('flight_key', 'owner', 'jobs')
+
+_TIMESTAMP_FIELDS = ('created_at', 'last_activity')
+_FIELDS = frozenset(STATUS_FIELDS + OPTIONAL_FIELDS + INTERNAL_FIELDS)
+_UNSET_WHEN_NONE = frozenset(OPTIONAL_FIELDS + INTERNAL_FIELDS)
+
+
+def wall_clock_iso(monotonic_ts: float) -> str:
+    """ISO wall-clock time for a ``time.monotonic()`` timestamp"""
+    return datetime.fromtimestamp(time.time() - (time.monotonic() - monotonic_ts)).isoformat()
+
+
+class SessionRecord:
+    """One user's or job's processing status; supports ``record[field]`` like the dict it replaces"""
+
+    __slots__ = STATUS_FIELDS + OPTIONAL_FIELDS + INTERNAL_FIELDS + _TIMESTAMP_FIELDS
+
+    def __init__(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.is_processing = False
+        self.current_step = 0
+        self.total_steps = 4
+        self.topic = ''
+        self.result = None
+        self.error = None
+        self.agent_thoughts = {}
+        self.current_agent = None
+        self.current_thought = None
+        self.job_id = None
+        self.job_state = None
+        self.queue_position = 0
+        self.final_result = None
+        self.speculation = None
+        self.flight_key = None
+        self.owner = None
+        self.jobs = None
+        self.created_at = now
+        self.last_activity = now
+
+    def __getitem__(self, field):
+        if field not in _FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field not in _FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __contains__(self, field):
+        if field in _UNSET_WHEN_NONE:
+            return getattr(self, field) is not None
+        return field in _FIELDS
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in self else default
+
+    def pop(self, field, default=None):
+        """Return a field's value and clear it"""
+        value = self.get(field, default)
+        if field in _UNSET_WHEN_NONE:
+            setattr(self, field, None)
+        return value
+
+    def update(self, fields: dict):
+        for field, value in fields.items():
+            if field in _FIELDS:
+                setattr(self, field, value)
+
+    def to_dict(self) -> dict:
+        data = {field: getattr(self, field) for field in STATUS_FIELDS}
+        for field in OPTIONAL_FIELDS:
+            if getattr(self, field) is not None:
+                data[field] = getattr(self, field)
+        data['created_at'] = wall_clock_iso(self.created_at)
+        data['last_activity'] = wall_clock_iso(self.last_activity)
+        return data
+
+
+class _Shard:
+    __slots__ = ('lock', 'records', 'deadlines')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}
+        self.deadlines = []  # heap of (expires_at, user_id, record)
+
+
+class SessionRegistry:
+    """Thread-safe map of user_id -> SessionRecord split over ``shards`` locks.
+
+    A session expires ``ttl`` seconds after its last activity; sessions with
+    a job still processing are kept.
+    """
+
+    def __init__(self, shards: int = 16, ttl: float = 3600):
+        self.ttl = ttl
+        self._shards = [_Shard() for _ in range(shards)]
+
+    def _shard(self, user_id) -> _Shard:
+        return self._shards[hash(user_id) % len(self._shards)]
+
+    def get(self, user_id) -> Optional[SessionRecord]:
+        return self._shard(user_id).records.get(user_id)
+
+    def get_or_create(self, user_id, now: Optional[float] = None) -> Tuple[SessionRecord, bool]:
+        """The user's record and whether it was just created"""
+        shard = self._shard(user_id)
+        with shard.lock:
+            record = shard.records.get(user_id)
+            if record is not None:
+                return record, False
+            record = shard.records[user_id] = SessionRecord(now)
+            heapq.heappush(shard.deadlines, (record.created_at + self.ttl, user_id, record))
+            return record, True
+
+    def touch(self, user_id, now: Optional[float] = None) -> Optional[SessionRecord]:
+        """Mark the user active now; its expiry moves lazily at the next sweep"""
+        record = self.get(user_id)
+        if record is not None:
+            record.last_activity = time.monotonic() if now is None else now
+        return record
+
+    def remove(self, user_id) -> Optional[SessionRecord]:
+        shard = self._shard(user_id)
+        with shard.lock:
+            return shard.records.pop(user_id, None)
+
+    def expire(self, now: Optional[float] = None) -> List[Tuple[str, SessionRecord]]:
+        """Remove sessions idle for longer than the TTL; returns what was removed"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        for shard in self._shards:
+            with shard.lock:
+                deadlines = shard.deadlines
+                while deadlines and deadlines[0][0] <= now:
+                    _, user_id, record = heapq.heappop(deadlines)
+                    if shard.records.get(user_id) is not record:
+                        continue  # Removed (and maybe recreated) since it was scheduled
+                    expires_at = now + self.ttl if record.is_processing else record.last_activity + self.ttl
+                    if expires_at > now:
+                        heapq.heappush(deadlines, (expires_at, user_id, record))
+                    else:
+                        del shard.records[user_id]
+                        expired.append((user_id, record))
+        return expired
+
+    def items(self) -> Iterator[Tuple[str, SessionRecord]]:
+        """Snapshot of (user_id, record), one shard at a time"""
+        for shard in self._shards:
+            with shard.lock:
+                records = list(shard.records.items())
+            yield from records
+
+    def ids(self) -> List[str]:
+        return [user_id for user_id, _ in self.items()]
+
+    def __contains__(self, user_id):
+        return user_id in self._shard(user_id).records
+
+    def __len__(self):
+        return sum(len(shard.records) for shard in self._shards)
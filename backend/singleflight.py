@@ -0,0 +1,64 @@
+"""Single-flight coalescing of identical in-flight work.
+
+The first caller for a key becomes the leader and does the work; callers
+arriving with the same key while it is in flight join as followers and
+share the leader's updates and result instead of starting their own run.
+"""
+import threading
+from typing import List, Optional, Tuple
+
+
+class Flight:
+    """One in-flight piece of work and everyone waiting on it"""
+
+    __slots__ = ('key', 'job_id', 'leader', 'followers')
+
+    def __init__(self, key, job_id, leader):
+        self.key = key
+        self.job_id = job_id
+        self.leader = leader
+        self.followers = []
+
+
+class SingleFlight:
+    """Registry of in-flight work keyed by an equivalence key"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def join(self, key, member, job_id) -> Tuple[Flight, bool]:
+        """Attach ``member`` to the flight for ``key``, creating it if needed.
+
+        Returns ``(flight, is_leader)``. ``job_id`` is only used when a new
+        flight is created; followers adopt the existing flight's job ID.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = Flight(key, job_id, member)
+                self._flights[key] = flight
+                return flight, True
+            if member != flight.leader and member not in flight.followers:
+                flight.followers.append(member)
+            return flight, False
+
+    def get(self, key) -> Optional[Flight]:
+        """The in-flight work for ``key``, if any"""
+        with self._lock:
+            return self._flights.get(key)
+
+    def followers(self, key) -> List:
+        """Snapshot of the members waiting on ``key``'s leader"""
+        with self._lock:
+            flight = self._flights.get(key)
+            return list(flight.followers) if flight else []
+
+    def finish(self, key) -> Optional[Flight]:
+        """Close the flight so the next caller for ``key`` starts fresh work"""
+        with self._lock:
+            return self._flights.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,63 @@
+"""Speculative stage execution and its reconciliation.
+
+In the speculative pipeline mode a stage may start from an earlier draft
+of its real input: the tweet is written from the Article Writer's draft
+while the Editor is still working. Once the real input exists,
+``draft_similarity`` compares it with the draft. If they are close enough
+the speculative output is kept; otherwise the stage runs again from the
+real input. ``SpeculationStats`` tracks the hit rate and the latency saved
+across jobs.
+"""
+import threading
+from typing import Optional
+
+from topic_index import content_words
+
+
+def draft_similarity(draft: str, final: str) -> float:
+    """Jaccard similarity of the two texts' stemmed content words, 0.0 to 1.0"""
+    draft_words = set(content_words(draft))
+    final_words = set(content_words(final))
+    if not draft_words and not final_words:
+        return 1.0
+    return len(draft_words & final_words) / len(draft_words | final_words)
+
+
+def latency_saved(input_finished: float, started: float, finished: float) -> float:
+    """Seconds a kept speculative run saved over starting once its real input finished"""
+    return max(0.0, input_finished + (finished - started) - max(input_finished, finished))
+
+
+class SpeculationStats:
+    """Thread-safe counters for speculative runs across all jobs"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+        self.saved_seconds = 0.0
+        self.wasted_seconds = 0.0
+
+    def record(self, hit: bool, saved_seconds: float = 0.0, wasted_seconds: float = 0.0):
+        """Count one reconciled speculation"""
+        with self._lock:
+            self.attempts += 1
+            self.hits += hit
+            self.saved_seconds += saved_seconds
+            self.wasted_seconds += wasted_seconds
+
+    def hit_rate(self) -> Optional[float]:
+        with self._lock:
+            return self.hits / self.attempts if self.attempts else None
+
+    def stats(self):
+        hit_rate = self.hit_rate()
+        with self._lock:
+            return {
+                'attempts': self.attempts,
+                'hits': self.hits,
+                'misses': self.attempts - self.hits,
+                'hit_rate': round(hit_rate, 3) if hit_rate is not None else None,
+                'saved_seconds': round(self.saved_seconds, 1),
+                'wasted_seconds': round(self.wasted_seconds, 1),
+            }
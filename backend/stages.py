@@ -0,0 +1,244 @@
+"""Agent and task definitions for the editorial pipeline.
+
+The prompts live here as plain data so that the app can build CrewAI
+objects from them and the caches can fingerprint them. Each stage also
+declares the stages whose output it reads (``inputs``). The sequential
+pipeline ignores them and chains every stage to the one before it; the
+``dag`` pipeline mode runs each stage as soon as its declared inputs exist.
+In the ``speculative`` mode a stage with ``speculate_from`` starts from
+that earlier stage's output and is reconciled once its sequential input
+exists (see ``speculation.py``). With the pipelined hand-off a stage with
+a ``plan`` step runs it from the first ``after`` items its input streams
+(see ``handoff.py``), overlapping the stage before it. In the
+``map_reduce`` research mode a stage with ``map_reduce`` prompts splits its
+topic into sub-questions, researches them in parallel and merges the
+findings (see ``research.py``). In the ``long_form`` article mode the
+writer outlines the article and drafts its sections in parallel, and the
+Editor stitches them together (``long_form`` prompts).
+"""
+import hashlib
+import json
+
+from result_cache import make_cache_key
+
+# Pipeline modes
+SEQUENTIAL = 'sequential'
+DAG = 'dag'
+SPECULATIVE = 'speculative'
+PIPELINE_MODES = (SEQUENTIAL, DAG, SPECULATIVE)
+
+# Article modes
+STANDARD = 'standard'
+LONG_FORM = 'long_form'
+ARTICLE_MODES = (STANDARD, LONG_FORM)
+
+# One entry per pipeline stage, in execution order
+EDITORIAL_STAGES = [
+    {
+        'key': 'research',
+        'inputs': [],
+        'agent': {
+            'role': "Research Analyst",
+            'goal': "Research a given topic deeply and provide clear findings",
+            'backstory': "You're a seasoned researcher known for producing accurate and concise insights.",
+        },
+        'task': {
+            'description': "Research the topic: {topic}",
+            'expected_output': "A list of 3–5 key insights about the topic.",
+        },
+        'map_reduce': {
+            'split': {
+                'description': "Split the topic {topic} into {count} distinct research questions that together cover it",
+                'expected_output': "A numbered list of {count} research questions, one per line.",
+            },
+            'map': {
+                'description': "Research this question about {topic}: {question}",
+                'expected_output': "2–3 concise, accurate findings that answer the question.",
+            },
+            'reduce': {
+                'description': "Merge the research findings on {topic} into its key insights, removing overlap",
+                'expected_output': "A list of 3–5 key insights about the topic.",
+            },
+        },
+    },
+    {
+        'key': 'article',
+        'inputs': ['research'],
+        'agent': {
+            'role': "Article Writer",
+            'goal': "Write a short, compelling article based on the research",
+            'backstory': "You're a skilled writer who turns insights into engaging prose.",
+        },
+        'task': {
+            'description': "Write a 400-word article based on the research",
+            'expected_output': "A complete article, written in natural language, based on the research insights.",
+        },
+        'plan': {
+            'description': "Plan a 400-word article on {topic} from the first research insights",
+            'expected_output': "An outline of the article: a working title and one line per paragraph.",
+            'after': 2,
+        },
+        'long_form': {
+            'outline': {
+                'description': "Outline a {words}-word article on {topic} based on the research, in {sections} sections",
+                'expected_output': "A numbered list of {sections} sections, each a heading and one line on what it covers.",
+            },
+            'section': {
+                'description': "Write section {index} of {count} of a {words}-word article on {topic}: {section}\n\n"
+                               "Write only this section, about {section_words} words, under its heading. "
+                               "The full outline, so the sections fit together:\n\n{outline}",
+                'expected_output': "The section's heading and about {section_words} words of text.",
+            },
+        },
+    },
+    {
+        'key': 'edited',
+        'inputs': ['article'],
+        'agent': {
+            'role': "Editor",
+            'goal': "Polish the article for tone, flow, and clarity",
+            'backstory': "You're a language expert who makes content shine.",
+        },
+        'task': {
+            'description': "Edit the article so it's twice as clear in terms of tone and structure",
+            'expected_output': "A refined version of the article with improved tone and readability.",
+        },
+        'long_form': {
+            'stitch': {
+                'description': "The sections of this {words}-word article were drafted separately. Edit them into one "
+                               "article: smooth the transitions, remove repetition and keep the tone consistent",
+                'expected_output': "The complete, polished article of about {words} words, with subheadings.",
+            },
+        },
+    },
+    {
+        'key': 'tweet',
+        # The core idea is already in the writer's draft, so this need not wait for the Editor
+        'inputs': ['article'],
+        'speculate_from': 'article',
+        'agent': {
+            'role': "Social Media Strategist",
+            'goal': "Summarise the article into a tweet for engagement",
+            'backstory': "You're great at distilling ideas into bite-sized, high-impact tweets.",
+        },
+        'task': {
+            'description': "Summarise the article in a single tweet (max 280 characters)",
+            'expected_output': "A concise, engaging tweet that captures the article's core idea.",
+        },
+    },
+]
+
+AGENT_NAMES = [stage['agent']['role'] for stage in EDITORIAL_STAGES]
+
+
+def task_description(stage, topic):
+    """Task description for a stage with the topic filled in"""
+    return stage['task']['description'].format(topic=topic)
+
+
+def stage_inputs(stage, mode=SEQUENTIAL, stages=EDITORIAL_STAGES):
+    """Keys of the stages whose output ``stage`` reads in the given pipeline mode"""
+    if mode == DAG:
+        return list(stage['inputs'])
+    if mode == SPECULATIVE and stage.get('speculate_from'):
+        return [stage['speculate_from']]
+    index = stages.index(stage)
+    return [stages[index - 1]['key']] if index else []
+
+
+def stage_graph(mode=SEQUENTIAL, stages=EDITORIAL_STAGES):
+    """Stage key -> input keys for the whole pipeline"""
+    graph = {stage['key']: stage_inputs(stage, mode, stages) for stage in stages}
+    if mode == SPECULATIVE:
+        # A speculative output may still be replaced, so nothing may build on it
+        speculative = {stage['key'] for stage in speculative_stages(stages)}
+        for key, inputs in graph.items():
+            if speculative.intersection(inputs):
+                raise ValueError(f"Stage {key!r} reads a speculative stage")
+    return graph
+
+
+def speculative_stages(stages=EDITORIAL_STAGES):
+    """Stages that may start from a draft of their input in the speculative mode"""
+    return [stage for stage in stages if stage.get('speculate_from')]
+
+
+def stage_upstream(inputs, outputs, stages=EDITORIAL_STAGES):
+    """The text a stage works from: its single input's output, or each input labelled by agent"""
+    if not inputs:
+        return None
+    if len(inputs) == 1:
+        return outputs[inputs[0]]
+    roles = {stage['key']: stage['agent']['role'] for stage in stages}
+    return '\n\n'.join(f"{roles[key]}:\n{outputs[key]}" for key in inputs)
+
+
+def plan_stage(stage):
+    """A stage's early planning step, shaped like a stage so it can run on its own"""
+    return {
+        'key': f"{stage['key']}_plan",
+        'agent': stage['agent'],
+        'task': {field: stage['plan'][field] for field in ('description', 'expected_output')},
+    }
+
+
+def handoff_stage(stage):
+    """``stage`` as cached with the pipelined hand-off, its planning prompts included"""
+    return dict(stage, task=dict(stage['task'], plan=stage['plan']))
+
+
+def _step_stage(stage, group, step, fields):
+    # Filled in now except the topic; braces in the inserted text must survive the later format
+    escaped = {name: str(value).replace('{', '{{').replace('}', '}}') for name, value in fields.items()}
+    task = {field: text.format(topic='{topic}', **escaped) for field, text in stage[group][step].items()}
+    return {'key': f"{stage['key']}_{step}", 'agent': stage['agent'], 'task': task}
+
+
+def map_reduce_step(stage, step, **fields):
+    """One step of a stage's map-reduce research, shaped like a stage so it can run on its own"""
+    return _step_stage(stage, 'map_reduce', step, fields)
+
+
+def map_reduce_stage(stage, count):
+    """The stage as the caches see it in the map-reduce research mode"""
+    return dict(stage, task=dict(stage['task'], map_reduce=stage['map_reduce'], subquestions=count))
+
+
+def long_form_step(stage, step, **fields):
+    """One step of a stage's long-form article work, shaped like a stage so it can run on its own"""
+    return _step_stage(stage, 'long_form', step, fields)
+
+
+def long_form_stage(stage, words, sections):
+    """The stage as the caches see it in the long-form article mode"""
+    return dict(stage, task=dict(stage['task'], long_form=stage['long_form'], words=words, sections=sections))
+
+
+def stage_fingerprint(stage):
+    """Stable hash of one stage's agent and task prompts"""
+    payload = json.dumps({'agent': stage['agent'], 'task': stage['task']}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def prompts_fingerprint(stages=EDITORIAL_STAGES, mode=SEQUENTIAL):
+    """Stable hash of every prompt in the pipeline and of what each stage reads"""
+    digest = hashlib.sha256()
+    for stage in stages:
+        digest.update(stage_fingerprint(stage).encode('ascii'))
+        if mode != SEQUENTIAL:
+            digest.update(json.dumps(stage_inputs(stage, mode, stages)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def stage_cache_key(stage, model, normalized_topic, upstream_output=None):
+    """Memo key for one stage: its own prompts plus everything it reads.
+
+    The first stage reads the topic; every later stage reads its upstream
+    output (see ``stage_upstream``), so an upstream change cascades but a
+    prompt change in a later stage leaves earlier keys untouched.
+    """
+    if upstream_output is None:
+        upstream = 'topic:' + normalized_topic
+    else:
+        upstream = 'output:' + hashlib.sha256(upstream_output.encode('utf-8')).hexdigest()
+    return make_cache_key('stage', stage['key'], model, stage_fingerprint(stage), upstream)
@@ -0,0 +1,75 @@
+"""Token-level streaming of agent output.
+
+CrewAI's ``LLM(stream=True)`` publishes every generated chunk on its global
+event bus. ``TokenStreamRouter`` subscribes once and forwards each chunk to
+the sink registered for the LLM (or agent) that produced it, so each
+running stage can stream to its own job without cross-talk.
+"""
+import threading
+from typing import Callable, Optional
+
+from logs import get_logger
+
+log = get_logger('streaming')
+
+
+class TokenStreamRouter:
+    """Routes streamed LLM chunks to per-stage sinks by their emitting object"""
+
+    def __init__(self):
+        self._sinks = {}
+        self._lock = threading.Lock()
+        self.installed = False
+
+    def install(self) -> bool:
+        """Subscribe to CrewAI's stream chunk events; False if this CrewAI can't stream"""
+        if self.installed:
+            return True
+        try:
+            try:
+                from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+            except ImportError:
+                from crewai.utilities.events import crewai_event_bus
+                from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+        except ImportError as e:
+            log.warning("⚠️ Token streaming unavailable in this CrewAI version", error=e)
+            return False
+
+        crewai_event_bus.on(LLMStreamChunkEvent)(self._on_chunk)
+        self.installed = True
+        return True
+
+    def register(self, sink: Callable[[str], None], *sources):
+        """Send chunks emitted by any of ``sources`` to ``sink``"""
+        with self._lock:
+            for source in sources:
+                if source is not None:
+                    self._sinks[id(source)] = sink
+
+    def unregister(self, *sources):
+        """Stop routing chunks from ``sources``"""
+        with self._lock:
+            for source in sources:
+                if source is not None:
+                    self._sinks.pop(id(source), None)
+
+    def _sink_for(self, source, event) -> Optional[Callable[[str], None]]:
+        with self._lock:
+            sink = self._sinks.get(id(source))
+            if sink is None:
+                # Some CrewAI versions emit from the agent rather than the LLM
+                agent = getattr(event, 'from_agent', None)
+                sink = self._sinks.get(id(agent)) if agent is not None else None
+            return sink
+
+    def _on_chunk(self, source, event):
+        chunk = getattr(event, 'chunk', None)
+        if not chunk:
+            return
+        sink = self._sink_for(source, event)
+        if sink is None:
+            return
+        try:
+            sink(chunk)
+        except Exception as e:
+            log.error("❌ Token streaming: Sink failed", error=e)
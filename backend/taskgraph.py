@@ -0,0 +1,75 @@
+"""Run tasks that declare their inputs as soon as those inputs exist.
+
+A graph maps each task key to the keys it reads. ``run_task_graph`` starts
+every task whose inputs are complete on a thread pool, so independent
+branches run concurrently and a chain runs one task at a time. Tasks run
+in a copy of the caller's context variables, so log context set around
+the graph (job_id, user_id) is carried into every task. ``run_each``
+fans one function out over a list of items the same way.
+"""
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+def topological_order(graph: Dict[str, List[str]]) -> List[str]:
+    """Task keys with every task after its inputs, otherwise in declaration order"""
+    for key, inputs in graph.items():
+        unknown = [name for name in inputs if name not in graph]
+        if unknown:
+            raise ValueError(f"Task {key!r} reads unknown task(s): {', '.join(unknown)}")
+
+    order = []
+    placed = set()
+    while len(order) < len(graph):
+        ready = [key for key, inputs in graph.items()
+                 if key not in placed and all(name in placed for name in inputs)]
+        if not ready:
+            cycle = [key for key in graph if key not in placed]
+            raise ValueError(f"Task graph has a cycle among: {', '.join(cycle)}")
+        order.extend(ready)
+        placed.update(ready)
+    return order
+
+
+def run_task_graph(graph: Dict[str, List[str]], run: Callable[[str, Dict[str, object]], object],
+                   max_workers: Optional[int] = None) -> Dict[str, object]:
+    """Run ``run(key, inputs)`` for every task and return each task's output by key.
+
+    ``inputs`` maps the task's input keys to their outputs. The first task
+    to raise stops the graph: nothing new is started, tasks already running
+    are allowed to finish, and the exception propagates.
+    """
+    order = topological_order(graph)
+    outputs = {}
+    running = {}
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(graph) or 1, thread_name_prefix='task-graph')
+    try:
+        while len(outputs) < len(order):
+            started = set(running.values())
+            for key in order:
+                if key in outputs or key in started:
+                    continue
+                if all(name in outputs for name in graph[key]):
+                    inputs = {name: outputs[name] for name in graph[key]}
+                    future = pool.submit(contextvars.copy_context().run, run, key, inputs)
+                    running[future] = key
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                outputs[key] = future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return outputs
+
+
+def run_each(items: Iterable, run: Callable, max_workers: int) -> List:
+    """``run(item)`` for every item on at most ``max_workers`` threads; results in item order.
+
+    The first exception is raised once every call has finished.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='task-each') as pool:
+        futures = [pool.submit(contextvars.copy_context().run, run, item) for item in items]
+        wait(futures)
+        return [future.result() for future in futures]
@@ -0,0 +1,115 @@
+import importlib
+import io
+import logging
+import os
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logs import ROOT, configure
+
+
+class StubLLM:
+    """Stands in for ChatOpenAI and crewai.LLM; never reaches the network"""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def invoke(self, prompt):
+        return SimpleNamespace(content='OK')
+
+
+class StubAgent:
+    def __init__(self, role, goal, backstory, verbose=False, **kwargs):
+        self.role = role
+        self.kwargs = kwargs
+
+
+class StubTask:
+    def __init__(self, description, expected_output, agent, **kwargs):
+        self.description = description
+        self.agent = agent
+        self.kwargs = kwargs
+
+
+class StubCrew:
+    """Prints a verbose-style transcript and answers with a two-item list per task"""
+
+    def __init__(self, agents, tasks, verbose=False, **kwargs):
+        self.agents = agents
+        self.tasks = tasks
+
+    def kickoff(self):
+        answer = ''
+        for task in self.tasks:
+            answer = f"1. {task.agent.role} finding one\n2. {task.agent.role} finding two"
+            print(f"# Agent: {task.agent.role}")
+            print(f"## Final Answer: {answer}")
+        return SimpleNamespace(raw=answer)
+
+
+def stub_module(name, **attributes):
+    module = ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def missing(name):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        return True
+    return False
+
+
+@pytest.fixture
+def load_app(monkeypatch):
+    """Import a fresh ``app`` under the given environment.
+
+    CrewAI and the OpenAI client are always replaced by stubs, so no test
+    reaches an LLM; packages that are only needed for serving are stubbed
+    when they aren't installed.
+    """
+    stubs = {
+        'crewai': stub_module('crewai', Agent=StubAgent, Task=StubTask, Crew=StubCrew, LLM=StubLLM),
+        'langchain_openai': stub_module('langchain_openai', ChatOpenAI=StubLLM),
+    }
+    if missing('dotenv'):
+        stubs['dotenv'] = stub_module('dotenv', load_dotenv=lambda *args, **kwargs: False)
+    if missing('flask_cors'):
+        stubs['flask_cors'] = stub_module('flask_cors', CORS=lambda *args, **kwargs: None)
+    if missing('flask_session'):
+        stubs['flask_session'] = stub_module('flask_session', Session=lambda app: None)
+    if missing('asgiref'):
+        stubs['asgiref'] = stub_module('asgiref')
+        stubs['asgiref.wsgi'] = stub_module('asgiref.wsgi', WsgiToAsgi=lambda wsgi_app: wsgi_app)
+
+    def load(**env):
+        for name, module in stubs.items():
+            monkeypatch.setitem(sys.modules, name, module)
+        monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+        monkeypatch.setenv('STREAM_TOKENS', 'false')
+        monkeypatch.setenv('SESSION_BACKEND', 'cookie')
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        sys.modules.pop('app', None)
+        return importlib.import_module('app')
+
+    yield load
+    sys.modules.pop('app', None)
+
+
+@pytest.fixture
+def log_output():
+    """Everything the backend logs during the test, as text"""
+    root = logging.getLogger(ROOT)
+    handlers, level, propagate = root.handlers[:], root.level, root.propagate
+    stream = io.StringIO()
+    configure(level='DEBUG', fmt='text', stream=stream)
+    yield stream
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    root.propagate = propagate
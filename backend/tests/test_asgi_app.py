@@ -0,0 +1,8 @@
+def test_asgi_app_uses_the_configured_heartbeat(load_app):
+    app = load_app(SSE_HEARTBEAT_SECONDS='2.5')
+
+    asgi_app = app.create_asgi_app()
+
+    assert asgi_app.heartbeat_interval == 2.5
+    assert asgi_app.heartbeats.interval == 2.5
+    assert asgi_app.idle_heartbeats == app.SSE_IDLE_HEARTBEATS
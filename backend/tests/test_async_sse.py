@@ -0,0 +1,176 @@
+import asyncio
+import json
+
+from async_sse import AsyncSSEApp
+from fanout import StreamHub
+from replay import ReplayLog
+
+ORIGIN = 'http://localhost:5173'
+
+
+def user_status(**fields):
+    status = {'current_step': 1, 'current_agent': 'Content Writer', 'current_thought': 'Drafting',
+              'agent_thoughts': {}, 'is_processing': True}
+    status.update(fields)
+    return status
+
+
+def request(path, query=b'', headers=()):
+    return {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query,
+            'headers': [(b'origin', ORIGIN.encode())] + list(headers)}
+
+
+class Client:
+    """Fake ASGI receive/send pair recording what the server sends"""
+
+    def __init__(self):
+        self.messages = []
+        self.disconnected = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    @property
+    def start(self):
+        return self.messages[0]
+
+    @property
+    def headers(self):
+        return dict(self.start['headers'])
+
+    @property
+    def events(self):
+        body = b''.join(message.get('body', b'') for message in self.messages[1:]).decode('utf-8')
+        return [chunk for chunk in body.split('\n\n') if chunk]
+
+    def payloads(self):
+        return [json.loads(event.split('data: ', 1)[1]) for event in self.events if 'data: ' in event]
+
+
+def make_app(statuses, **kwargs):
+    fallback_calls = []
+
+    async def fallback(scope, receive, send):
+        fallback_calls.append(scope['path'])
+
+    app = AsyncSSEApp(StreamHub(), get_status=statuses.get, ensure_user=lambda user_id: None,
+                      fallback=fallback, allowed_origins=[ORIGIN], default_origin='https://example.com',
+                      **kwargs)
+    return app, fallback_calls
+
+
+async def until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('timed out')
+
+
+def test_stream_sends_a_snapshot_then_updates_until_the_job_finishes():
+    status = user_status()
+    app, _ = make_app({'alice': status})
+    client = Client()
+
+    async def scenario():
+        stream = asyncio.ensure_future(app(request('/api/stream', b'user_id=alice'), client.receive, client.send))
+        await until(lambda: app.hub.subscriber_count('alice') == 1)
+        app.hub.publish('alice', 's-1', user_status(current_thought='Still drafting'))
+        status['is_processing'] = False
+        app.hub.publish('alice', 's-2', user_status(current_step=4, is_processing=False))
+        await asyncio.wait_for(stream, 5)
+
+    asyncio.run(scenario())
+
+    assert client.start['status'] == 200
+    assert client.headers[b'content-type'] == b'text/event-stream'
+    assert client.headers[b'access-control-allow-origin'] == ORIGIN.encode()
+    payloads = client.payloads()
+    assert payloads[0]['connected'] and payloads[0]['current_thought'] == 'Drafting'
+    assert payloads[1]['current_thought'] == 'Still drafting'
+    assert payloads[2]['current_step'] == 4
+    assert payloads[-1]['final']
+    assert client.events[1].startswith('id: s-1\n')
+    assert client.messages[-1] == {'type': 'http.response.body', 'body': b'', 'more_body': False}
+    assert app.hub.subscriber_count() == 0
+
+
+def test_disconnect_ends_the_stream():
+    app, _ = make_app({'alice': user_status()})
+    client = Client()
+
+    async def scenario():
+        stream = asyncio.ensure_future(app(request('/api/stream', b'user_id=alice'), client.receive, client.send))
+        await until(lambda: app.hub.subscriber_count('alice') == 1)
+        client.disconnected.set()
+        await asyncio.wait_for(stream, 5)
+
+    asyncio.run(scenario())
+
+    assert len(client.payloads()) == 1
+    assert app.hub.subscriber_count() == 0
+
+
+def test_idle_stream_closes_after_its_heartbeats():
+    app, _ = make_app({'alice': user_status(is_processing=False)}, heartbeat_interval=0.05, idle_heartbeats=2)
+    client = Client()
+
+    asyncio.run(asyncio.wait_for(app(request('/api/stream', b'user_id=alice'), client.receive, client.send), 5))
+
+    assert client.events[1:3] == [': heartbeat', ': heartbeat']
+    assert client.payloads()[-1]['final']
+
+
+def test_reconnect_with_last_event_id_replays_missed_events():
+    replay_log = ReplayLog()
+    ids = [replay_log.append('alice', user_status(current_thought=f"update {n}")) for n in range(3)]
+    app, _ = make_app({'alice': user_status(is_processing=False)}, replay_log=replay_log,
+                      heartbeat_interval=0.05, idle_heartbeats=1)
+    client = Client()
+
+    asyncio.run(asyncio.wait_for(app(request('/api/stream', b'user_id=alice&delta=0',
+                                             [(b'last-event-id', ids[0].encode())]),
+                                     client.receive, client.send), 5))
+
+    assert [payload['current_thought'] for payload in client.payloads()[:2]] == ['update 1', 'update 2']
+    assert client.events[0].startswith(f"id: {ids[1]}\n")
+
+
+def test_session_streams_are_resolved_off_the_loop():
+    status = user_status(is_processing=False)
+    opened = []
+
+    def open_session_stream(path, query_string, headers):
+        opened.append((path, query_string))
+        if path == '/api/jobs/mine/stream':
+            return 'job:mine', status, [('Set-Cookie', 'session=abc')]
+        return None, None, []
+
+    app, _ = make_app({}, open_session_stream=open_session_stream, heartbeat_interval=0.05, idle_heartbeats=1)
+    mine, theirs = Client(), Client()
+
+    async def scenario():
+        await asyncio.wait_for(app(request('/api/jobs/mine/stream'), mine.receive, mine.send), 5)
+        await asyncio.wait_for(app(request('/api/jobs/theirs/stream'), theirs.receive, theirs.send), 5)
+
+    asyncio.run(scenario())
+
+    assert mine.start['status'] == 200
+    assert mine.headers[b'set-cookie'] == b'session=abc'
+    assert mine.payloads()[0]['connected']
+    assert theirs.start['status'] == 404
+    assert opened == [('/api/jobs/mine/stream', ''), ('/api/jobs/theirs/stream', '')]
+
+
+def test_other_requests_go_to_the_fallback_app():
+    app, fallback_calls = make_app({})
+    client = Client()
+
+    asyncio.run(app(request('/api/health'), client.receive, client.send))
+    asyncio.run(app(request('/api/stream'), client.receive, client.send))
+
+    assert fallback_calls == ['/api/health', '/api/stream']
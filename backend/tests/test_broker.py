@@ -0,0 +1,117 @@
+import socket
+import threading
+import time
+import uuid
+
+import pytest
+
+from benchmarks.resp_standin import start_in_thread
+from broker import InProcessBroker, RedisBroker, create_broker
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture(scope='module')
+def redis_url():
+    """A RESP stand-in server on a free local port"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    start_in_thread(port=port)
+    return f"redis://127.0.0.1:{port}/0"
+
+
+@pytest.fixture
+def brokers(redis_url):
+    """Two brokers sharing one server, as two web processes would"""
+    prefix = uuid.uuid4().hex
+    pair = [RedisBroker(redis_url, prefix=prefix) for _ in range(2)]
+    for broker in pair:
+        assert broker.start()
+    yield pair
+    for broker in pair:
+        broker.close()
+
+
+def listen(broker):
+    received = []
+    lock = threading.Lock()
+
+    def listener(channel, data, local, event_id):
+        with lock:
+            received.append((channel, data, local, event_id))
+
+    broker.listen(listener)
+    return received
+
+
+def test_updates_reach_every_process_flagged_local_or_remote(brokers):
+    publisher, other = brokers
+    own, remote = listen(publisher), listen(other)
+
+    publisher.publish('user-1', {'current_step': 2}, event_id='stream-7')
+    publisher.publish('user-1', {'current_step': 3})
+
+    assert wait_for(lambda: len(own) == 2 and len(remote) == 2)
+    assert own == [('user-1', {'current_step': 2}, True, 'stream-7'),
+                   ('user-1', {'current_step': 3}, True, None)]
+    assert remote == [('user-1', {'current_step': 2}, False, 'stream-7'),
+                      ('user-1', {'current_step': 3}, False, None)]
+
+
+def test_state_is_shared_between_processes(brokers):
+    writer, reader = brokers
+
+    writer.set_state('job:1', {'job_state': 'running'})
+    writer.set_state('job:2', {'job_state': 'done'}, ttl=0.05)
+
+    assert reader.get_state('job:1') == {'job_state': 'running'}
+    assert reader.get_state('missing') is None
+    assert wait_for(lambda: reader.get_state('job:2') is None)
+
+
+def test_lists_are_shared_between_processes(brokers):
+    writer, reader = brokers
+
+    writer.add_to_list('jobs:alice', 'job-1')
+    reader.add_to_list('jobs:alice', 'job-2')
+    assert writer.get_list('jobs:alice') == ['job-1', 'job-2']
+
+    reader.remove_from_list('jobs:alice', 'job-1')
+    assert writer.get_list('jobs:alice') == ['job-2']
+    assert reader.get_list('jobs:bob') == []
+
+    writer.add_to_list('jobs:alice', 'job-3', ttl=0.05)
+    assert wait_for(lambda: reader.get_list('jobs:alice') == [])
+
+
+def test_in_process_broker_delivers_locally():
+    broker = InProcessBroker()
+    received = listen(broker)
+
+    broker.publish('user-1', {'current_step': 1}, event_id='s-1')
+    broker.set_state('job:1', {'job_state': 'queued'})
+    broker.add_to_list('jobs:alice', 'job-1')
+
+    assert received == [('user-1', {'current_step': 1}, True, 's-1')]
+    assert broker.get_state('job:1') == {'job_state': 'queued'}
+    assert broker.get_list('jobs:alice') == ['job-1']
+    assert not broker.shared
+
+
+def test_broker_logs_never_include_the_password(monkeypatch, log_output):
+    monkeypatch.setattr(RedisBroker, 'start', lambda self, wait=5.0: False)
+
+    broker = create_broker('redis://:hunter2@cache.internal:6380/3')
+
+    assert broker.location == {'host': 'cache.internal', 'port': 6380, 'db': 3}
+    assert 'host=cache.internal port=6380 db=3' in log_output.getvalue()
+    assert 'hunter2' not in log_output.getvalue()
+    assert isinstance(create_broker(None), InProcessBroker)
@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from coalesce import UpdateCoalescer
+
+
+@pytest.fixture
+def delivered():
+    return []
+
+
+@pytest.fixture
+def coalescer(delivered):
+    # A long window, so only transitions and explicit flushes deliver during a test
+    coalescer = UpdateCoalescer(lambda key, update: delivered.append((key, update)), window=60)
+    coalescer.start()
+    yield coalescer
+    coalescer.shutdown()
+
+
+def test_routine_updates_are_merged_until_flushed(coalescer, delivered):
+    coalescer.submit('user', {'current_step': 0, 'is_processing': True})
+    coalescer.submit('user', {'current_thought': 'first'})
+    coalescer.submit('user', {'current_thought': 'second'})
+    coalescer.submit('user', {'event': 'token', 'token': 'Hel'})
+    coalescer.submit('user', {'event': 'token', 'token': 'lo'})
+    assert len(delivered) == 1
+
+    coalescer.flush('user')
+
+    assert delivered[1:] == [
+        ('user', {'current_thought': 'second'}),
+        ('user', {'event': 'token', 'token': 'Hello'}),
+    ]
+    assert coalescer.stats()['merged'] == 2
+
+
+def test_a_transition_flushes_pending_updates_first(coalescer, delivered):
+    coalescer.submit('user', {'current_step': 0, 'is_processing': True})
+    coalescer.submit('user', {'current_thought': 'researching'})
+    coalescer.submit('user', {'current_step': 1, 'current_thought': 'writing'})
+    coalescer.submit('user', {'current_step': 1, 'current_thought': 'still writing'})
+
+    assert [update for _, update in delivered] == [
+        {'current_step': 0, 'is_processing': True},
+        {'current_thought': 'researching'},
+        {'current_step': 1, 'current_thought': 'writing'},
+    ]
+
+    coalescer.submit('user', {'event': 'stage_completed'})
+    assert delivered[-2:] == [
+        ('user', {'current_step': 1, 'current_thought': 'still writing'}),
+        ('user', {'event': 'stage_completed'}),
+    ]
+
+
+def test_keys_are_coalesced_separately(coalescer, delivered):
+    coalescer.submit('a', {'current_thought': 'a1'})
+    coalescer.submit('b', {'current_thought': 'b1'})
+
+    coalescer.discard('a')
+
+    assert delivered == [('a', {'current_thought': 'a1'})]
+
+
+def test_pending_updates_go_out_when_the_window_closes():
+    delivered = []
+    arrived = threading.Event()
+    coalescer = UpdateCoalescer(lambda key, update: (delivered.append(update), arrived.set()), window=0.05)
+    coalescer.start()
+    try:
+        coalescer.submit('user', {'current_thought': 'one'})
+        coalescer.submit('user', {'current_thought': 'two'})
+        assert arrived.wait(5)
+        assert delivered == [{'current_thought': 'two'}]
+    finally:
+        coalescer.shutdown()
+
+
+def test_zero_window_delivers_everything_immediately():
+    delivered = []
+    coalescer = UpdateCoalescer(lambda key, update: delivered.append(update), window=0)
+    coalescer.start()
+
+    coalescer.submit('user', {'current_thought': 'one'})
+    coalescer.submit('user', {'current_thought': 'two'})
+
+    assert delivered == [{'current_thought': 'one'}, {'current_thought': 'two'}]
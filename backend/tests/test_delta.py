@@ -0,0 +1,56 @@
+from delta import TRANSIENT_FIELDS, DeltaEncoder, apply_delta
+
+UPDATES = [
+    {'current_step': 0, 'current_thought': 'Researching', 'agent_thoughts': {}, 'is_processing': True,
+     'connected': True},
+    {'current_thought': 'Researching AI', 'event': 'token', 'token': ' AI'},
+    {'current_step': 1, 'agent_thoughts': {'Researcher': 'insights'}, 'event': 'stage_completed'},
+    {'current_thought': 'Drafting', 'agent_thoughts': {'Researcher': 'insights', 'Writer': 'draft'}},
+    {'agent_thoughts': {'Writer': 'draft'}, 'heartbeat': True},
+    {'current_step': 1, 'is_processing': False, 'final': True},
+]
+
+
+def test_patches_replay_every_full_update():
+    encoder = DeltaEncoder()
+    client_state = {}
+    state = {}
+
+    for update in UPDATES:
+        state.update({field: value for field, value in update.items() if field not in TRANSIENT_FIELDS})
+        flags = {field: value for field, value in update.items() if field in TRANSIENT_FIELDS}
+        assert apply_delta(client_state, encoder.encode(update)) == {**state, **flags}
+
+
+def test_first_message_is_a_snapshot_then_only_changes():
+    encoder = DeltaEncoder()
+
+    first = encoder.encode(UPDATES[0])
+    assert first == {'snapshot': {'current_step': 0, 'current_thought': 'Researching',
+                                  'agent_thoughts': {}, 'is_processing': True},
+                     'connected': True}
+    assert encoder.encode(UPDATES[1]) == {'delta': {'append': {'current_thought': ' AI'}},
+                                          'event': 'token', 'token': ' AI'}
+    assert encoder.encode({'current_step': 0}) == {}
+    assert encoder.encode(UPDATES[4]) == {'delta': {'merge': {'agent_thoughts': {'Writer': 'draft'}}},
+                                          'heartbeat': True}
+
+
+def test_removed_dict_entries_are_sent_as_none():
+    encoder = DeltaEncoder()
+    encoder.encode({'agent_thoughts': {'Researcher': 'a', 'Writer': 'b'}})
+
+    message = encoder.encode({'agent_thoughts': {'Writer': 'b'}})
+    assert message == {'delta': {'merge': {'agent_thoughts': {'Researcher': None}}}}
+    assert apply_delta({'agent_thoughts': {'Researcher': 'a', 'Writer': 'b'}}, message) == {
+        'agent_thoughts': {'Writer': 'b'}}
+
+
+def test_resumed_encoder_sends_patches_onto_the_clients_state():
+    client_state = {'current_step': 2, 'current_thought': 'Editing'}
+    encoder = DeltaEncoder()
+    encoder.resume()
+
+    message = encoder.encode({'current_thought': 'Editing done'})
+    assert 'snapshot' not in message
+    assert apply_delta(client_state, message) == {'current_step': 2, 'current_thought': 'Editing done'}
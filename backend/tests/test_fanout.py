@@ -0,0 +1,94 @@
+import json
+
+from delta import apply_delta
+from fanout import StreamHub, StreamView
+from notify import CLOSED, Mailbox
+
+STATUS = {'current_step': 1, 'current_agent': 'Writer', 'current_thought': 'Drafting',
+          'agent_thoughts': {}, 'is_processing': True}
+
+
+def payload(frame_bytes):
+    return json.loads(frame_bytes.decode('utf-8').split('data: ', 1)[1])
+
+
+def test_every_subscriber_gets_the_same_encoded_frame():
+    hub = StreamHub()
+    first, second = Mailbox(), Mailbox()
+    hub.subscribe('user', first)
+    hub.subscribe('user', second)
+
+    assert hub.publish('user', 's-1', {'current_thought': 'hi'}) == 2
+
+    frame = first.get()
+    assert second.get() is frame
+    assert frame.encoded(delta=False) is frame.encoded(delta=False)
+    assert frame.encoded(delta=False) == b'id: s-1\ndata: {"current_thought": "hi"}\n\n'
+    assert hub.publish('nobody', 's-1', {}) == 0
+
+
+def test_a_stream_that_stops_reading_is_disconnected():
+    hub = StreamHub()
+    stalled, reader = Mailbox(limit=2), Mailbox(limit=2)
+    hub.subscribe('user', stalled)
+    hub.subscribe('user', reader)
+
+    for seq in range(1, 4):
+        hub.publish('user', f's-{seq}', {'current_thought': str(seq)})
+        reader.get()
+
+    assert stalled.overflowed
+    assert stalled.get() is CLOSED
+    assert len(stalled) == 0
+    assert hub.subscriber_count('user') == 1
+    assert hub.stats()['overflows'] == 1
+    assert hub.publish('user', 's-4', {}) == 1
+
+
+def test_close_ends_every_stream_of_the_user():
+    hub = StreamHub()
+    mailboxes = [Mailbox(), Mailbox()]
+    for mailbox in mailboxes:
+        hub.subscribe('user', mailbox)
+
+    assert hub.close('user') == 2
+    assert all(mailbox.get() is CLOSED for mailbox in mailboxes)
+    assert hub.subscriber_count() == 0
+
+
+def test_late_delta_subscriber_catches_up_from_the_shared_state():
+    hub = StreamHub()
+    early = Mailbox()
+    hub.subscribe('user', early)
+    hub.publish('user', 's-1', dict(STATUS, current_thought='Drafting'))
+
+    late = Mailbox()
+    view = StreamView(STATUS, delta=True, shared_state=hub.subscribe('user', late))
+    client = {}
+    for message in view.opening(None, snapshot_id='s-1'):
+        apply_delta(client, payload(message))
+
+    hub.publish('user', 's-2', dict(STATUS, current_thought='Drafting the intro'))
+    frame = late.get()
+    full = apply_delta(client, payload(view.render(frame)))
+
+    assert full == dict(STATUS, current_thought='Drafting the intro')
+
+
+def test_resumed_stream_skips_frames_it_already_replayed():
+    view = StreamView(STATUS, delta=False, shared_state={})
+    missed = [('s-2', dict(STATUS, current_thought='two')), ('s-3', dict(STATUS, current_thought='three'))]
+
+    opening = view.opening(missed, last_event_id='s-1')
+    assert [payload(message)['current_thought'] for message in opening] == ['two', 'three']
+
+    hub = StreamHub()
+    mailbox = Mailbox()
+    hub.subscribe('user', mailbox)
+    hub.publish('user', 's-3', missed[1][1])
+    hub.publish('user', 's-4', dict(STATUS, is_processing=False))
+
+    assert view.render(mailbox.get()) is None
+    assert payload(view.render(mailbox.get()))['is_processing'] is False
+    assert view.finished
+
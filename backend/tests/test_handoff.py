@@ -0,0 +1,85 @@
+import threading
+
+from handoff import ItemSplitter, StreamedHandoff, item_text, list_items
+
+RESEARCH = """Thought: I now know the final answer
+Final Answer:
+1. AI tools draft concept art
+   in minutes.
+2) Musicians use models for stems
+
+- Studios worry about licensing
+* Audiences want disclosure"""
+
+
+def test_splitter_completes_items_as_the_stream_arrives():
+    splitter = ItemSplitter()
+    completed = []
+    for chunk in (RESEARCH[i:i + 7] for i in range(0, len(RESEARCH), 7)):
+        completed.append(splitter.feed(chunk))
+
+    items = [item for batch in completed for item in batch] + splitter.finish()
+
+    assert items == [
+        '1. AI tools draft concept art in minutes.',
+        '2) Musicians use models for stems',
+        '- Studios worry about licensing',
+        '* Audiences want disclosure',
+    ]
+    # An item is only handed out once the next one starts or a blank line ends it
+    assert completed[-1] == []
+
+
+def test_list_items_strip_markers_and_skip_preamble():
+    assert list_items(RESEARCH, limit=2) == ['AI tools draft concept art in minutes.',
+                                             'Musicians use models for stems']
+    assert list_items('No list here at all') == []
+    assert item_text('• 12 tips') == '12 tips'
+
+
+def test_next_stage_starts_once_enough_items_exist():
+    received = []
+    handoff = StreamedHandoff(2, lambda items: received.append(items) or 'plan')
+
+    handoff.feed('1. first\n2. sec')
+    assert not handoff.started
+    handoff.feed('ond\n3. third\n')
+    handoff.close()
+
+    assert handoff.started
+    assert handoff.result() == 'plan'
+    assert received == [['1. first', '2. second']]
+    assert handoff.lead_seconds >= 0
+
+
+def test_nothing_starts_after_close():
+    handoff = StreamedHandoff(1, lambda items: 'plan')
+    handoff.close()
+
+    handoff.feed('1. first\n2. second\n')
+
+    assert not handoff.started
+    assert handoff.result() is None
+    assert handoff.lead_seconds is None
+
+
+def test_a_failed_early_step_yields_no_result():
+    def start(items):
+        raise RuntimeError('planner failed')
+
+    handoff = StreamedHandoff(1, start)
+    handoff.feed('1. first\n\n')
+
+    assert handoff.result() is None
+    assert isinstance(handoff.error, RuntimeError)
+
+
+def test_early_step_runs_on_its_own_thread():
+    release = threading.Event()
+    handoff = StreamedHandoff(1, lambda items: release.wait(5) and 'plan')
+
+    handoff.feed('1. first\n\n')
+    assert handoff.started
+    release.set()
+
+    assert handoff.result() == 'plan'
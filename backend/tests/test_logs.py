@@ -0,0 +1,63 @@
+import io
+import json
+
+from logs import configure, get_logger, log_context, DEBUG, INFO
+
+
+def test_fields_render_as_key_value_pairs(log_output):
+    get_logger('jobs').info("🚀 Job queued", topic='AI art', position=2)
+
+    assert log_output.getvalue().strip().endswith("INFO jobs 🚀 Job queued topic=AI art position=2")
+
+
+def test_context_fields_reach_every_message_in_the_block(log_output):
+    log = get_logger('jobs')
+    with log_context(job_id='job-1', user_id='alice'):
+        log.info("step")
+    log.info("outside")
+
+    inside, outside = log_output.getvalue().splitlines()
+    assert inside.endswith("step job_id=job-1 user_id=alice")
+    assert outside.endswith("outside")
+
+
+def test_messages_below_the_level_are_not_formatted(log_output):
+    configure(level='INFO', stream=log_output)
+
+    class Expensive:
+        def __str__(self):
+            raise AssertionError('formatted a suppressed message')
+
+    log = get_logger('sse')
+    log.debug("update", payload=Expensive())
+
+    assert not log.enabled(DEBUG)
+    assert log_output.getvalue() == ''
+
+
+def test_sampled_messages_log_one_in_every_n(log_output, monkeypatch):
+    monkeypatch.setenv('LOG_SAMPLE_EVERY', '10')
+    log = get_logger('sse')
+
+    for n in range(25):
+        log.sampled('update', INFO, "🔄 Sending update", n=n)
+    log.sampled('token', INFO, "token")
+
+    lines = log_output.getvalue().splitlines()
+    assert [line.split('Sending update ')[1] for line in lines if 'Sending update' in line] == [
+        'n=0 sampled=10', 'n=10 sampled=10', 'n=20 sampled=10']
+    assert len(lines) == 4
+
+
+def test_json_format_puts_fields_at_the_top_level(log_output):
+    stream = io.StringIO()
+    configure(level='INFO', fmt='json', stream=stream)
+
+    with log_context(job_id='job-1'):
+        get_logger('broker').warning("⚠️ Broker: Not subscribed yet", host='localhost', port=6379)
+
+    entry = json.loads(stream.getvalue())
+    assert entry['level'] == 'warning'
+    assert entry['logger'] == 'broker'
+    assert entry['msg'] == "⚠️ Broker: Not subscribed yet"
+    assert (entry['job_id'], entry['host'], entry['port']) == ('job-1', 'localhost', 6379)
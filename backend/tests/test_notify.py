@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+from notify import CLOSED, HEARTBEAT, AsyncMailbox, Mailbox, TimerWheel, fire_due
+
+
+def test_reader_sleeps_until_an_update_arrives():
+    mailbox = Mailbox()
+    received = []
+    reader = threading.Thread(target=lambda: received.append(mailbox.get()))
+    reader.start()
+
+    mailbox.put('update')
+    reader.join(5)
+
+    assert received == ['update']
+
+
+def test_updates_come_before_a_pending_heartbeat():
+    mailbox = Mailbox()
+    mailbox.heartbeat()
+    mailbox.put('update')
+
+    assert mailbox.get() == 'update'
+    assert mailbox.get() is HEARTBEAT
+
+
+def test_close_wakes_the_reader_and_drops_the_backlog():
+    mailbox = Mailbox()
+    mailbox.put('update')
+    mailbox.close()
+
+    assert mailbox.get() is CLOSED
+    assert not mailbox.put('late update')
+
+
+def test_a_full_backlog_closes_the_mailbox():
+    mailbox = Mailbox(limit=2)
+
+    assert mailbox.put(1) and mailbox.put(2)
+    assert not mailbox.put(3)
+    assert mailbox.overflowed
+    assert mailbox.get() is CLOSED
+
+
+def test_async_mailbox_takes_updates_from_other_threads():
+    async def scenario():
+        mailbox = AsyncMailbox(asyncio.get_running_loop(), limit=2)
+        threading.Thread(target=lambda: (mailbox.put('one'), mailbox.put('two'))).start()
+        received = [await asyncio.wait_for(mailbox.get(), 5) for _ in range(2)]
+        mailbox.heartbeat()
+        received.append(await mailbox.get())
+        threading.Thread(target=mailbox.close).start()
+        received.append(await asyncio.wait_for(mailbox.get(), 5))
+        return received
+
+    assert asyncio.run(scenario()) == ['one', 'two', HEARTBEAT, CLOSED]
+
+
+def test_async_mailbox_overflow_closes_it():
+    async def scenario():
+        mailbox = AsyncMailbox(asyncio.get_running_loop(), limit=1)
+        for item in ('one', 'two', 'three'):
+            mailbox.put(item)
+        await asyncio.sleep(0)
+        return mailbox.overflowed, await mailbox.get()
+
+    assert asyncio.run(scenario()) == (True, CLOSED)
+
+
+def test_timer_wheel_fires_each_entry_once_per_interval():
+    wheel = TimerWheel(interval=1.0, slots=4)
+    fired = []
+    wheel.add('a')
+    wheel.advance()
+    wheel.add('b')
+
+    for _ in range(8):
+        fired.append(sorted(wheel.advance()))
+
+    assert fired == [[], [], ['a'], ['b'], [], [], ['a'], ['b']]
+    wheel.remove('a')
+    assert len(wheel) == 1
+
+
+def test_fire_due_calls_every_due_entry_despite_failures():
+    wheel = TimerWheel(interval=1.0, slots=1)
+    calls = []
+
+    def broken():
+        raise RuntimeError('stream gone')
+
+    wheel.add(broken)
+    wheel.add(lambda: calls.append('beat'))
+    fire_due(wheel)
+
+    assert calls == ['beat']
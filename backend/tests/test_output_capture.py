@@ -0,0 +1,60 @@
+import io
+
+from output_capture import CrewAIOutputCapture, TailBuffer, compile_activity_matcher
+from stages import AGENT_NAMES
+
+
+def test_tail_buffer_keeps_only_the_most_recent_text():
+    buffer = TailBuffer(10)
+    for chunk in ('abcd', 'efgh', 'ijkl'):
+        buffer.append(chunk)
+
+    assert buffer.getvalue() == 'cdefghijkl'
+    assert len(buffer) == 10
+    buffer.append('z' * 25)
+    assert buffer.getvalue() == 'z' * 10
+
+
+def test_matcher_prefers_the_longest_marker():
+    matcher, keywords = compile_activity_matcher(['Content Writer'])
+
+    match = matcher.search('# Agent: Content Writer')
+    assert (match.lastgroup, match.group()) == ('start', '# Agent:')
+    assert keywords == {'Content Writer': 0, 'Writer': 0}
+
+
+def capture_for(status):
+    updates = []
+    original = io.StringIO()
+    capture = CrewAIOutputCapture(original, AGENT_NAMES, 'user', lambda user_id: status,
+                                  lambda user_id, data: updates.append(data), buffer_chars=64)
+    return capture, updates, original
+
+
+def test_agent_start_thought_and_completion_are_published():
+    status = {'current_step': 0, 'current_agent': None, 'current_thought': None, 'agent_thoughts': {}}
+    capture, updates, original = capture_for(status)
+    writer = AGENT_NAMES[1]
+
+    capture.write(f"# Agent: {writer}\n")
+    capture.write("Thought: I need an outline first\n")
+    capture.write("Final Answer: A finished article about AI and the creative industries\n")
+
+    assert [update['current_thought'] for update in updates] == [
+        f"{writer} is beginning their task...",
+        f"{writer}: Thought: I need an outline first",
+        f"{writer} has completed their task",
+    ]
+    assert status['current_step'] == 1
+    assert writer in status['agent_thoughts']
+    assert 'Final Answer' in original.getvalue()
+    assert len(capture.buffer) <= 64
+
+
+def test_plain_output_publishes_nothing():
+    status = {'current_step': 0, 'current_agent': None, 'current_thought': None, 'agent_thoughts': {}}
+    capture, updates, _ = capture_for(status)
+
+    capture.write("Loading tools...\n")
+
+    assert updates == []
@@ -0,0 +1,55 @@
+import sys
+
+import pytest
+
+from research import MAP_REDUCE
+from stages import DAG, LONG_FORM, SEQUENTIAL, SPECULATIVE
+
+TOPIC = 'How AI is transforming creative industries'
+
+
+@pytest.mark.parametrize('env', [
+    {'PIPELINE_MODE': SEQUENTIAL},
+    {'PIPELINE_MODE': DAG},
+    {'PIPELINE_MODE': SPECULATIVE},
+    {'RESEARCH_MODE': MAP_REDUCE, 'RESEARCH_SUBQUESTIONS': '2'},
+    {'ARTICLE_MODE': LONG_FORM, 'LONG_FORM_SECTIONS': '2'},
+    {'PROGRESS_SOURCE': 'stdout'},
+], ids=lambda env: '-'.join(value.lower() for value in env.values() if not value.isdigit()))
+def test_every_mode_runs_a_job_to_completion(load_app, monkeypatch, env):
+    app = load_app(**env)
+    monkeypatch.setattr(app.time, 'sleep', lambda seconds: None)
+    status_key = app.job_key('job')
+    job_status, _ = app.user_sessions.get_or_create(status_key)
+    job_status['job_id'] = 'job'
+
+    app.process_crew_ai(TOPIC, status_key)
+
+    status = app.get_user_processing_status(status_key)
+    assert not status['is_processing']
+    assert status['final_result']
+    assert set(status['agent_thoughts']) == set(app.AGENT_NAMES)
+    assert not any('Error' in thought for thought in status['agent_thoughts'].values())
+
+
+def test_stdout_capture_wraps_concurrent_stages_once(load_app, monkeypatch):
+    app = load_app(PIPELINE_MODE=DAG, PROGRESS_SOURCE='stdout')
+    monkeypatch.setattr(app.time, 'sleep', lambda seconds: None)
+    captures = []
+
+    class RecordingCrew(app.Crew):
+        def kickoff(self):
+            captures.append(sys.stdout)
+            return super().kickoff()
+
+    monkeypatch.setattr(app, 'Crew', RecordingCrew)
+    original_stdout = sys.stdout
+    status_key = app.job_key('job')
+    app.user_sessions.get_or_create(status_key)
+
+    app.process_crew_ai(TOPIC, status_key)
+
+    assert sys.stdout is original_stdout
+    assert len(captures) == len(app.EDITORIAL_STAGES)
+    assert len(set(map(id, captures))) == 1
+    assert isinstance(captures[0], app.CrewAIOutputCapture)
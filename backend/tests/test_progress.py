@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from progress import (
+    AGENT_STEP, MAX_STEP_TEXT, STAGE_COMPLETED, STAGE_STARTED, TOKEN,
+    CrewProgressReporter, describe_step, task_output_text,
+)
+
+
+def reporter_with_events():
+    events = []
+    return CrewProgressReporter('job-1', 2, 'Editor', events.append), events
+
+
+def test_callbacks_become_events_for_the_job_and_stage():
+    reporter, events = reporter_with_events()
+
+    reporter.started()
+    reporter.step_callback(SimpleNamespace(thought='Checking the facts\nsecond line'))
+    reporter.token_callback('The ')
+    reporter.task_callback(SimpleNamespace(raw='Edited article'))
+
+    assert [(event.kind, event.text) for event in events] == [
+        (STAGE_STARTED, 'Editor is beginning their task...'),
+        (AGENT_STEP, 'Checking the facts'),
+        (TOKEN, 'The '),
+        (STAGE_COMPLETED, 'Edited article'),
+    ]
+    assert {(event.job_id, event.step, event.agent) for event in events} == {('job-1', 2, 'Editor')}
+
+
+def test_completion_is_reported_once():
+    reporter, events = reporter_with_events()
+
+    reporter.task_callback(SimpleNamespace(raw='from the callback'))
+    reporter.complete('from the cache path')
+
+    assert [event.text for event in events] == ['from the callback']
+
+
+def test_steps_without_text_are_skipped_and_notes_are_truncated():
+    reporter, events = reporter_with_events()
+
+    reporter.step_callback(SimpleNamespace(thought='   '))
+    reporter.note('x' * 500)
+
+    assert [(event.kind, len(event.text)) for event in events] == [(AGENT_STEP, MAX_STEP_TEXT)]
+
+
+def test_a_failing_emit_never_breaks_the_crew():
+    def emit(event):
+        raise RuntimeError('stream gone')
+
+    reporter = CrewProgressReporter('job-1', 0, 'Research Analyst', emit)
+    reporter.started()
+    reporter.complete('done')
+
+    assert reporter.completed
+
+
+def test_describe_step_across_crewai_payloads():
+    assert describe_step(SimpleNamespace(thought='', log='Action: search')) == 'Action: search'
+    assert describe_step(SimpleNamespace(tool='web_search')) == 'Using tool: web_search'
+    assert describe_step([(SimpleNamespace(log='old style'), 'observation')]) == 'old style'
+    assert describe_step(SimpleNamespace()) == ''
+
+
+def test_task_output_text_across_crewai_payloads():
+    assert task_output_text(SimpleNamespace(raw='raw text')) == 'raw text'
+    assert task_output_text(SimpleNamespace(raw='', exported_output='exported')) == 'exported'
+    assert task_output_text('plain') == 'plain'
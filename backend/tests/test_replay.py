@@ -0,0 +1,67 @@
+from replay import EventFilter, ReplayLog, parse_event_id
+
+
+def test_parse_event_id():
+    assert parse_event_id('abc123-7') == ('abc123', 7)
+    assert parse_event_id('a-b-12') == ('a-b', 12)
+    for event_id in (None, '', '42', 'abc-', 'abc-x'):
+        assert parse_event_id(event_id) is None
+
+
+def test_reconnect_replays_exactly_the_missed_events():
+    log = ReplayLog(capacity=10)
+    ids = [log.append('user', {'n': n}) for n in range(5)]
+
+    assert log.since('user', ids[1]) == [(ids[n], {'n': n}) for n in (2, 3, 4)]
+    assert log.since('user', ids[-1]) == []
+    assert log.latest_id('user') == ids[-1]
+
+
+def test_events_that_fell_out_of_the_ring_need_a_snapshot():
+    log = ReplayLog(capacity=3)
+    ids = [log.append('user', {'n': n}) for n in range(6)]
+
+    assert log.since('user', ids[1]) is None
+    assert [data['n'] for _, data in log.since('user', ids[2])] == [3, 4, 5]
+
+
+def test_ids_from_an_earlier_job_or_unknown_stream_are_not_replayed():
+    log = ReplayLog()
+    old_id = log.append('user', {'n': 0})
+    log.reset('user')
+    log.append('user', {'n': 1})
+
+    assert log.since('user', old_id) is None
+    assert log.since('stranger', old_id) is None
+    assert log.since('user', 'garbage') is None
+
+
+def test_events_recorded_from_another_process_replay():
+    log = ReplayLog()
+    log.record('user', 'remote-1', {'n': 1})
+    log.record('user', 'remote-2', {'n': 2})
+    log.record('user', 'remote-2', {'n': 'duplicate'})
+
+    assert log.since('user', 'remote-1') == [('remote-2', {'n': 2})]
+    assert log.latest_id('user') == 'remote-2'
+
+
+def test_oldest_streams_are_dropped_beyond_the_limit():
+    log = ReplayLog(max_streams=2)
+    first = log.append('a', {})
+    log.append('b', {})
+    log.append('c', {})
+
+    assert len(log) == 2
+    assert log.since('a', first) is None
+
+
+def test_event_filter_drops_events_already_sent():
+    seen = EventFilter('s-3')
+
+    assert not seen.accept('s-2')
+    assert not seen.accept('s-3')
+    assert seen.accept('s-4')
+    assert not seen.accept('s-4')
+    assert seen.accept('new-1')
+    assert seen.accept(None)
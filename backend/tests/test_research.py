@@ -0,0 +1,54 @@
+from research import MAP_REDUCE, SINGLE, ResearchTimings, merge_input, parse_subquestions, research_concurrently
+
+
+def test_parse_subquestions_reads_numbered_and_bulleted_lists():
+    text = ("Here are the sub-questions:\n"
+            "1. Which creative jobs use AI today?\n"
+            "2. How do artists feel about it?\n"
+            "- What do the licensing rules say?\n"
+            "3. Who owns generated work?")
+
+    assert parse_subquestions(text, 3) == [
+        'Which creative jobs use AI today?',
+        'How do artists feel about it?',
+        'What do the licensing rules say?',
+    ]
+    assert parse_subquestions('I could not split this topic.', 3) == []
+
+
+def test_a_failed_question_is_reported_not_raised():
+    def run(question):
+        if question == 'bad':
+            raise RuntimeError('agent failed')
+        return question.upper()
+
+    findings = research_concurrently(['one', 'bad', 'two'], run, workers=2)
+
+    assert [finding.question for finding in findings] == ['one', 'bad', 'two']
+    assert [finding.text for finding in findings] == ['ONE', None, 'TWO']
+    assert isinstance(findings[1].error, RuntimeError)
+    assert merge_input(findings) == 'Question: one\nFindings:\nONE\n\nQuestion: two\nFindings:\nTWO'
+
+
+def test_speedup_uses_the_measured_baseline_over_the_configured_one():
+    timings = ResearchTimings(baseline_seconds=90)
+    timings.record(MAP_REDUCE, 30, questions=3, question_seconds=60)
+
+    stats = timings.stats()
+    assert stats['baseline'] == 'configured'
+    assert stats['speedup'] == 3.0
+    assert stats[MAP_REDUCE]['avg_questions'] == 3.0
+
+    timings.record(SINGLE, 60)
+    stats = timings.stats()
+    assert timings.baseline() == 60
+    assert stats['baseline'] == 'measured'
+    assert stats['speedup'] == 2.0
+
+
+def test_no_speedup_without_any_baseline():
+    timings = ResearchTimings()
+    timings.record(MAP_REDUCE, 30)
+
+    assert timings.baseline() is None
+    assert 'speedup' not in timings.stats()
@@ -0,0 +1,44 @@
+import pytest
+
+from research import MAP_REDUCE, SINGLE
+
+TOPIC = 'How AI is transforming creative industries'
+SIMILAR_TOPIC = 'How AI is transforming the creative industries'
+
+
+@pytest.mark.parametrize('research_mode', [SINGLE, MAP_REDUCE])
+def test_similar_topic_reuses_research(load_app, monkeypatch, research_mode):
+    app = load_app(RESEARCH_MODE=research_mode, RESEARCH_SUBQUESTIONS='2')
+    research_stage = app.EDITORIAL_STAGES[0]
+    calls = []
+
+    def run_stage(stage, topic, context=None, reporter=None):
+        calls.append((stage['agent']['role'], topic))
+        # Reads as a two-item list, so map-reduce research can split on it
+        return f"1. {stage['key']} finding one\n2. {stage['key']} finding two"
+
+    monkeypatch.setattr(app, 'run_stage', run_stage)
+    monkeypatch.setattr(app.time, 'sleep', lambda seconds: None)
+
+    def research_calls(topic):
+        return sum(1 for role, called_topic in calls
+                   if role == research_stage['agent']['role'] and called_topic == topic)
+
+    for job_id, topic in (('first', TOPIC), ('second', SIMILAR_TOPIC)):
+        status_key = app.job_key(job_id)
+        job_status, _ = app.user_sessions.get_or_create(status_key)
+        job_status['job_id'] = job_id
+        app.process_crew_ai(topic, status_key)
+
+    assert research_calls(TOPIC) > 0
+    assert research_calls(SIMILAR_TOPIC) == 0
+    assert app.get_user_processing_status(app.job_key('second'))['final_result']
+
+
+def test_research_is_stored_under_the_lookup_key(load_app):
+    app = load_app(RESEARCH_MODE=MAP_REDUCE)
+    research_stage = app.EDITORIAL_STAGES[0]
+
+    assert app.stage_key(research_stage, TOPIC) == app.stage_key(research_stage, TOPIC.upper())
+    assert app.stage_key(research_stage, TOPIC) != app.stage_cache_key(
+        research_stage, app.model_name, app.normalize_topic(TOPIC))
@@ -0,0 +1,56 @@
+from result_cache import ResultCache, make_cache_key, normalize_topic, result_cache_key
+
+
+def test_normalize_topic_ignores_case_spacing_and_edge_punctuation():
+    assert normalize_topic('  How AI is   Transforming\tArt?! ') == 'how ai is transforming art'
+
+
+def test_cache_key_parts_are_unambiguous():
+    assert make_cache_key('ab', 'c') != make_cache_key('a', 'bc')
+    assert result_cache_key('AI art', 'gpt', 'p') == result_cache_key('ai  art.', 'gpt', 'p')
+    assert result_cache_key('AI art', 'gpt', 'p') != result_cache_key('AI art', 'gpt', 'q')
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # b is now the oldest
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['entries'] == 2
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('result_cache.time.time', lambda: now[0])
+    cache = ResultCache(ttl=60)
+    cache.set('default', 'x')
+    cache.set('short', 'y', ttl=5)
+
+    now[0] += 10
+    assert cache.get('short') is None
+    assert cache.get('default') == 'x'
+
+    now[0] += 60
+    assert cache.get('default') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_sqlite_tier_outlives_the_memory_tier(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('result_cache.time.time', lambda: now[0])
+    db_path = str(tmp_path / 'cache.db')
+    ResultCache(db_path=db_path).set('key', {'final_result': 'article'}, ttl=30)
+
+    reopened = ResultCache(db_path=db_path)
+    assert reopened.get('key') == {'final_result': 'article'}
+
+    now[0] += 31
+    assert ResultCache(db_path=db_path).purge_expired() == 1
+    assert ResultCache(db_path=db_path).get('key') is None
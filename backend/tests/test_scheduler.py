@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import DONE, FAILED, QUEUED, RUNNING, JobScheduler, QueueFullError
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_waiting_jobs_report_their_queue_position():
+    release = threading.Event()
+    moves = []
+    scheduler = JobScheduler(lambda job: release.wait(5), workers=1,
+                             on_queue_change=lambda job, position: moves.append((job.job_id, position)))
+
+    for job_id in ('a', 'b', 'c'):
+        scheduler.submit('user', 'topic', job_id=job_id)
+    assert [scheduler.position(job_id) for job_id in ('a', 'b', 'c')] == [1, 2, 3]
+    assert moves == [('a', 1), ('b', 2), ('c', 3)]
+
+    scheduler.start()
+    try:
+        assert wait_for(lambda: scheduler.get('a').state == RUNNING)
+        assert scheduler.position('a') == 0
+        assert [scheduler.position(job_id) for job_id in ('b', 'c')] == [1, 2]
+        assert moves[3:] == [('b', 1), ('c', 2)]
+        assert scheduler.get('b').state == QUEUED
+    finally:
+        release.set()
+        assert wait_for(lambda: scheduler.get('c').state == DONE)
+        scheduler.shutdown()
+
+
+def test_submit_refuses_jobs_beyond_the_queue_limit():
+    scheduler = JobScheduler(lambda job: None, max_queued=2)
+    scheduler.submit('user', 'one')
+    scheduler.submit('user', 'two')
+
+    with pytest.raises(QueueFullError):
+        scheduler.submit('user', 'three')
+    assert scheduler.stats()['queued'] == 2
+
+
+def test_a_failing_runner_marks_the_job_failed():
+    def runner(job):
+        raise RuntimeError('crew crashed')
+
+    scheduler = JobScheduler(runner, workers=1)
+    scheduler.start()
+    try:
+        job = scheduler.submit('user', 'topic')
+        assert wait_for(lambda: job.finished_at is not None)
+        assert job.state == FAILED
+        assert job.error == 'crew crashed'
+    finally:
+        scheduler.shutdown()
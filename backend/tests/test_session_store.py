@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from flask import Flask, session
+
+from session_store import SQLiteSessionInterface
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteSessionInterface(str(tmp_path / 'sessions.db'), ttl=3600)
+
+
+@pytest.fixture
+def client(store):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = store
+
+    @app.route('/login/<user_id>')
+    def login(user_id):
+        session['user_id'] = user_id
+        return 'ok'
+
+    @app.route('/whoami')
+    def whoami():
+        return session.get('user_id', '')
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return app.test_client()
+
+
+def test_session_round_trips_through_sqlite(client, store):
+    response = client.get('/login/alice')
+    assert 'Set-Cookie' in response.headers
+    assert len(store) == 1
+
+    assert client.get('/whoami').get_data(as_text=True) == 'alice'
+
+
+def test_unchanged_session_is_not_rewritten(client, store):
+    client.get('/login/alice')
+    writes = store._writes
+
+    response = client.get('/whoami')
+
+    assert store._writes == writes
+    assert 'Set-Cookie' not in response.headers
+
+
+def test_expiry_is_pushed_back_once_the_refresh_window_passes(client, store, monkeypatch):
+    client.get('/login/alice')
+    writes = store._writes
+    clock = time.time() + store.refresh_after + 1
+    monkeypatch.setattr('session_store.time.time', lambda: clock)
+
+    response = client.get('/whoami')
+
+    assert store._writes == writes + 1
+    assert 'Set-Cookie' in response.headers
+
+
+def test_expired_sessions_are_gone_and_purged(client, store, monkeypatch):
+    client.get('/login/alice')
+    clock = time.time() + store.ttl + 1
+    monkeypatch.setattr('session_store.time.time', lambda: clock)
+
+    assert client.get('/whoami').get_data(as_text=True) == ''
+    assert store.purge_expired() == 1
+    assert len(store) == 0
+
+
+def test_clearing_the_session_deletes_its_row(client, store):
+    client.get('/login/alice')
+
+    client.get('/logout')
+
+    assert len(store) == 0
+    assert client.get('/whoami').get_data(as_text=True) == ''
+
+
+def test_table_name_must_be_an_identifier(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteSessionInterface(str(tmp_path / 'sessions.db'), table='sessions; DROP TABLE x')
@@ -0,0 +1,101 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from sessions import SessionRecord, SessionRegistry
+
+
+def test_idle_sessions_expire_after_the_ttl():
+    registry = SessionRegistry(shards=4, ttl=60)
+    registry.get_or_create('idle', now=0)
+    registry.get_or_create('active', now=0)
+    registry.touch('active', now=50)
+
+    assert registry.expire(now=59) == []
+    assert [user_id for user_id, _ in registry.expire(now=60)] == ['idle']
+    assert registry.ids() == ['active']
+    assert registry.expire(now=109) == []
+    assert [user_id for user_id, _ in registry.expire(now=110)] == ['active']
+    assert len(registry) == 0
+
+
+def test_sessions_with_a_running_job_are_kept():
+    registry = SessionRegistry(ttl=60)
+    record, _ = registry.get_or_create('busy', now=0)
+    record['is_processing'] = True
+
+    assert registry.expire(now=1000) == []
+    record['is_processing'] = False
+    assert registry.expire(now=1059) == []
+    assert [user_id for user_id, _ in registry.expire(now=1060)] == ['busy']
+
+
+def test_a_recreated_session_is_not_expired_by_its_predecessors_deadline():
+    registry = SessionRegistry(shards=1, ttl=60)
+    registry.get_or_create('user', now=0)
+    registry.remove('user')
+    registry.get_or_create('user', now=30)
+
+    assert registry.expire(now=60) == []
+    assert 'user' in registry
+
+
+def test_record_behaves_like_the_status_dict():
+    record = SessionRecord(now=0)
+    record['current_step'] = 2
+    record.update({'topic': 'AI', 'unknown': 'ignored'})
+
+    assert record['current_step'] == 2 and record.get('topic') == 'AI'
+    assert 'final_result' not in record
+    record['final_result'] = 'article'
+    assert record.pop('final_result') == 'article'
+    assert 'final_result' not in record
+    with pytest.raises(KeyError):
+        record['unknown'] = 1
+    assert set(record.to_dict()) >= {'is_processing', 'created_at', 'last_activity'}
+
+
+def test_concurrent_creation_touch_and_expiry_stay_consistent():
+    registry = SessionRegistry(shards=8, ttl=0.001)
+    created = Counter()
+    expired = Counter()
+    lock = threading.Lock()
+    stop = threading.Event()
+    errors = []
+
+    def worker(offset):
+        try:
+            for n in range(2000):
+                user_id = f"user-{(offset + n) % 200}"
+                record, is_new = registry.get_or_create(user_id)
+                registry.touch(user_id)
+                record['current_step'] = n
+                if is_new:
+                    with lock:
+                        created[user_id] += 1
+        except Exception as e:
+            errors.append(e)
+
+    def sweeper():
+        while not stop.is_set():
+            removed = registry.expire()
+            list(registry.items())
+            with lock:
+                expired.update(user_id for user_id, _ in removed)
+
+    threads = [threading.Thread(target=worker, args=(i * 37,)) for i in range(8)]
+    cleanup = threading.Thread(target=sweeper)
+    cleanup.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    cleanup.join()
+
+    assert not errors
+    # Every creation was either expired since or is still registered, exactly once
+    for user_id, count in created.items():
+        assert count - expired[user_id] == (1 if user_id in registry else 0)
+    assert set(registry.ids()) <= set(created)
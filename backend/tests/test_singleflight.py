@@ -0,0 +1,43 @@
+from singleflight import SingleFlight
+
+
+def test_callers_with_the_same_key_follow_the_leader():
+    flights = SingleFlight()
+
+    flight, is_leader = flights.join('topic', 'alice', 'job-1')
+    assert is_leader
+    assert flight.job_id == 'job-1'
+
+    for member, job_id in (('bob', 'job-2'), ('carol', 'job-3'), ('bob', 'job-4'), ('alice', 'job-5')):
+        joined, is_leader = flights.join('topic', member, job_id)
+        assert joined is flight
+        assert not is_leader
+        assert joined.job_id == 'job-1'
+
+    assert flights.followers('topic') == ['bob', 'carol']
+    assert len(flights) == 1
+
+
+def test_other_keys_fly_separately():
+    flights = SingleFlight()
+    flights.join('first', 'alice', 'job-1')
+
+    flight, is_leader = flights.join('second', 'bob', 'job-2')
+    assert is_leader
+    assert flights.followers('first') == []
+    assert len(flights) == 2
+
+
+def test_finish_lets_the_next_caller_lead_again():
+    flights = SingleFlight()
+    flights.join('topic', 'alice', 'job-1')
+    flights.join('topic', 'bob', 'job-2')
+
+    finished = flights.finish('topic')
+    assert finished.followers == ['bob']
+    assert flights.get('topic') is None
+    assert flights.followers('topic') == []
+
+    flight, is_leader = flights.join('topic', 'bob', 'job-3')
+    assert is_leader
+    assert flight.job_id == 'job-3'
@@ -0,0 +1,72 @@
+import pytest
+
+from speculation import SpeculationStats, draft_similarity, latency_saved
+
+
+def test_draft_similarity_compares_content_words():
+    assert draft_similarity('AI is transforming the arts', 'The arts are transforming with AI') == 1.0
+    assert draft_similarity('AI tools for painters', 'AI tools for musicians') == pytest.approx(2 / 4)
+    assert draft_similarity('Painters', 'Quantum computing') == 0.0
+    assert draft_similarity('', 'the of and') == 1.0
+
+
+@pytest.mark.parametrize('input_finished, started, finished, saved', [
+    (10, 2, 6, 4),    # finished before its input: the whole run was saved
+    (10, 8, 14, 2),   # overlapped the input's last two seconds
+    (10, 10, 15, 0),  # started only once the input was done
+])
+def test_latency_saved(input_finished, started, finished, saved):
+    assert latency_saved(input_finished, started, finished) == saved
+
+
+def test_stats_report_hit_rate_and_seconds():
+    stats = SpeculationStats()
+    assert stats.hit_rate() is None
+
+    stats.record(True, saved_seconds=4)
+    stats.record(True, saved_seconds=2)
+    stats.record(False, wasted_seconds=5)
+
+    assert stats.stats() == {'attempts': 3, 'hits': 2, 'misses': 1, 'hit_rate': 0.667,
+                             'saved_seconds': 6.0, 'wasted_seconds': 5.0}
+
+
+def reconcile(app, edited, cached_stages=()):
+    outputs = {'article': 'AI tools are changing how painters work', 'edited': edited, 'tweet': 'draft tweet'}
+    stage_times = {'edited': (0, 10), 'tweet': (2, 6)}
+    reruns = []
+
+    def run_pipeline_stage(key_name, inputs):
+        reruns.append((key_name, inputs))
+        return 'tweet from the edit'
+
+    outcomes = app.reconcile_speculation(outputs, stage_times, set(cached_stages), run_pipeline_stage)
+    return outcomes['tweet'], outputs['tweet'], reruns
+
+
+def test_a_close_edit_keeps_the_speculative_stage(load_app):
+    app = load_app(PIPELINE_MODE='speculative')
+
+    outcome, tweet, reruns = reconcile(app, 'AI tools are changing how painters work today')
+
+    assert outcome['hit'] and outcome['saved_seconds'] == 4
+    assert (tweet, reruns) == ('draft tweet', [])
+    assert app.speculation_stats.stats()['hits'] == 1
+
+
+def test_a_distant_edit_reruns_the_stage_from_it(load_app):
+    app = load_app(PIPELINE_MODE='speculative')
+
+    outcome, tweet, reruns = reconcile(app, 'Quantum computing reshapes drug discovery')
+
+    assert not outcome['hit'] and outcome['wasted_seconds'] == 4
+    assert tweet == 'tweet from the edit'
+    assert reruns == [('tweet', {'edited': 'Quantum computing reshapes drug discovery'})]
+
+
+def test_cached_stages_stay_out_of_the_stats(load_app):
+    app = load_app(PIPELINE_MODE='speculative')
+
+    reconcile(app, 'AI tools are changing how painters work', cached_stages=['tweet'])
+
+    assert app.speculation_stats.stats()['attempts'] == 0
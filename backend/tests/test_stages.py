@@ -0,0 +1,68 @@
+import pytest
+
+from stages import (
+    DAG, EDITORIAL_STAGES, SEQUENTIAL, SPECULATIVE, handoff_stage, map_reduce_stage, prompts_fingerprint, stage_cache_key, stage_graph,
+)
+
+RESEARCH, ARTICLE = EDITORIAL_STAGES[0], EDITORIAL_STAGES[1]
+TOPIC = 'ai in art'
+
+
+def with_prompt(stage, description):
+    return dict(stage, task=dict(stage['task'], description=description))
+
+
+def test_stage_key_depends_on_topic_model_and_prompts():
+    key = stage_cache_key(RESEARCH, 'gpt', TOPIC)
+
+    assert key == stage_cache_key(RESEARCH, 'gpt', TOPIC)
+    assert key != stage_cache_key(RESEARCH, 'gpt', 'ai in music')
+    assert key != stage_cache_key(RESEARCH, 'other-model', TOPIC)
+    assert key != stage_cache_key(with_prompt(RESEARCH, 'Research {topic} briefly'), 'gpt', TOPIC)
+
+
+def test_later_stages_are_keyed_by_their_upstream_output():
+    key = stage_cache_key(ARTICLE, 'gpt', TOPIC, 'insights')
+
+    assert key == stage_cache_key(ARTICLE, 'gpt', 'another topic', 'insights')
+    assert key != stage_cache_key(ARTICLE, 'gpt', TOPIC, 'other insights')
+    # An empty upstream output is still an output, not the topic
+    assert stage_cache_key(ARTICLE, 'gpt', TOPIC, '') != stage_cache_key(ARTICLE, 'gpt', TOPIC)
+
+
+def test_a_later_prompt_change_leaves_earlier_keys_alone():
+    changed = [RESEARCH, with_prompt(ARTICLE, 'Write about {topic}')] + EDITORIAL_STAGES[2:]
+
+    assert stage_cache_key(changed[0], 'gpt', TOPIC) == stage_cache_key(RESEARCH, 'gpt', TOPIC)
+    assert stage_cache_key(changed[1], 'gpt', TOPIC, 'x') != stage_cache_key(ARTICLE, 'gpt', TOPIC, 'x')
+    assert prompts_fingerprint(changed) != prompts_fingerprint()
+
+
+def test_stage_graphs():
+    keys = [stage['key'] for stage in EDITORIAL_STAGES]
+    sequential = stage_graph(SEQUENTIAL)
+
+    assert list(sequential) == keys
+    assert sequential[keys[0]] == []
+    assert all(sequential[key] == [previous] for previous, key in zip(keys, keys[1:]))
+    assert stage_graph(DAG) == {stage['key']: stage['inputs'] for stage in EDITORIAL_STAGES}
+    assert stage_graph(SPECULATIVE)['tweet'] == ['article']
+
+
+def test_speculative_graph_rejects_building_on_a_speculative_stage():
+    draft = dict(ARTICLE, speculate_from=RESEARCH['key'])
+    reader = dict(EDITORIAL_STAGES[2], inputs=[ARTICLE['key']])
+
+    with pytest.raises(ValueError, match='speculative'):
+        stage_graph(SPECULATIVE, [RESEARCH, draft, reader])
+
+
+def test_handoff_stage_is_keyed_apart_from_the_plain_one():
+    assert stage_cache_key(handoff_stage(ARTICLE), 'gpt', TOPIC, 'x') != stage_cache_key(ARTICLE, 'gpt', TOPIC, 'x')
+
+
+def test_map_reduce_research_is_keyed_by_its_question_count():
+    map_reduce = stage_cache_key(map_reduce_stage(RESEARCH, 3), 'gpt', TOPIC)
+
+    assert map_reduce != stage_cache_key(RESEARCH, 'gpt', TOPIC)
+    assert map_reduce != stage_cache_key(map_reduce_stage(RESEARCH, 4), 'gpt', TOPIC)
@@ -0,0 +1,89 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+from streaming import TokenStreamRouter
+
+
+class FakeEventBus:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event_type):
+        def register(handler):
+            self.handlers.setdefault(event_type, []).append(handler)
+            return handler
+        return register
+
+    def emit(self, source, event):
+        for handler in self.handlers.get(type(event), []):
+            handler(source, event)
+
+
+class LLMStreamChunkEvent(SimpleNamespace):
+    pass
+
+
+def installed_router(monkeypatch):
+    bus = FakeEventBus()
+    events = ModuleType('crewai.events')
+    events.crewai_event_bus = bus
+    events.LLMStreamChunkEvent = LLMStreamChunkEvent
+    monkeypatch.setitem(sys.modules, 'crewai', ModuleType('crewai'))
+    monkeypatch.setitem(sys.modules, 'crewai.events', events)
+    router = TokenStreamRouter()
+    assert router.install()
+    return router, bus
+
+
+def test_chunks_go_to_the_sink_of_the_llm_that_produced_them(monkeypatch):
+    router, bus = installed_router(monkeypatch)
+    writer_llm, editor_llm = object(), object()
+    writer, editor = [], []
+    router.register(writer.append, writer_llm)
+    router.register(editor.append, editor_llm)
+
+    bus.emit(writer_llm, LLMStreamChunkEvent(chunk='Once '))
+    bus.emit(editor_llm, LLMStreamChunkEvent(chunk='Edited '))
+    bus.emit(writer_llm, LLMStreamChunkEvent(chunk='upon'))
+    bus.emit(object(), LLMStreamChunkEvent(chunk='someone else'))
+
+    assert writer == ['Once ', 'upon']
+    assert editor == ['Edited ']
+
+
+def test_chunks_emitted_by_the_agent_are_routed_too(monkeypatch):
+    router, bus = installed_router(monkeypatch)
+    llm, agent = object(), object()
+    received = []
+    router.register(received.append, llm, agent)
+
+    bus.emit(object(), LLMStreamChunkEvent(chunk='via agent', from_agent=agent))
+    router.unregister(llm, agent)
+    bus.emit(llm, LLMStreamChunkEvent(chunk='after unregister'))
+
+    assert received == ['via agent']
+
+
+def test_empty_chunks_and_failing_sinks_are_ignored(monkeypatch):
+    router, bus = installed_router(monkeypatch)
+    llm = object()
+    received = []
+
+    def sink(chunk):
+        received.append(chunk)
+        raise RuntimeError('stream closed')
+
+    router.register(sink, llm)
+    bus.emit(llm, LLMStreamChunkEvent(chunk=''))
+    bus.emit(llm, LLMStreamChunkEvent(chunk='text'))
+
+    assert received == ['text']
+
+
+def test_install_reports_a_crewai_without_streaming(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'crewai', None)
+
+    router = TokenStreamRouter()
+
+    assert not router.install()
+    assert not router.installed
@@ -0,0 +1,85 @@
+import contextvars
+import threading
+
+import pytest
+
+from taskgraph import run_each, run_task_graph, topological_order
+
+GRAPH = {'research': [], 'article': ['research'], 'tweet': ['research'], 'edited': ['article', 'tweet']}
+
+
+def test_topological_order_puts_inputs_first():
+    assert topological_order({'c': ['b'], 'b': ['a'], 'a': []}) == ['a', 'b', 'c']
+    assert topological_order(GRAPH) == ['research', 'article', 'tweet', 'edited']
+
+
+@pytest.mark.parametrize('graph, message', [
+    ({'a': ['missing']}, 'unknown'),
+    ({'a': ['b'], 'b': ['a']}, 'cycle'),
+])
+def test_invalid_graphs_are_rejected(graph, message):
+    with pytest.raises(ValueError, match=message):
+        run_task_graph(graph, lambda key, inputs: key)
+
+
+def test_each_task_runs_after_its_inputs_with_their_outputs():
+    started = []
+    lock = threading.Lock()
+
+    def run(key, inputs):
+        with lock:
+            started.append(key)
+        return key + '(' + ','.join(inputs[name] for name in GRAPH[key]) + ')'
+
+    outputs = run_task_graph(GRAPH, run)
+
+    assert outputs['edited'] == 'edited(article(research()),tweet(research()))'
+    assert started[0] == 'research' and started[-1] == 'edited'
+
+
+def test_independent_tasks_run_concurrently():
+    both_running = threading.Barrier(2, timeout=5)
+
+    def run(key, inputs):
+        if key in ('article', 'tweet'):
+            both_running.wait()
+        return key
+
+    assert set(run_task_graph(GRAPH, run)) == set(GRAPH)
+
+
+def test_a_failing_task_stops_the_graph():
+    ran = []
+
+    def run(key, inputs):
+        ran.append(key)
+        if key == 'research':
+            raise RuntimeError('research failed')
+        return key
+
+    with pytest.raises(RuntimeError, match='research failed'):
+        run_task_graph(GRAPH, run)
+    assert ran == ['research']
+
+
+def test_tasks_see_the_callers_context_variables():
+    job_id = contextvars.ContextVar('job_id')
+    job_id.set('job-1')
+
+    assert run_task_graph({'a': [], 'b': ['a']}, lambda key, inputs: job_id.get()) == {'a': 'job-1', 'b': 'job-1'}
+    assert run_each([1, 2], lambda item: (item, job_id.get()), max_workers=2) == [(1, 'job-1'), (2, 'job-1')]
+
+
+def test_run_each_returns_results_in_item_order_and_raises_after_all_finish():
+    assert run_each([3, 1, 2], lambda item: item * 10, max_workers=3) == [30, 10, 20]
+
+    finished = []
+
+    def run(item):
+        if item == 0:
+            raise ValueError('bad item')
+        finished.append(item)
+
+    with pytest.raises(ValueError):
+        run_each([0, 1, 2], run, max_workers=1)
+    assert finished == [1, 2]
@@ -0,0 +1,47 @@
+import pytest
+
+from topic_index import TopicIndex, content_words
+
+TOPIC = 'How AI is transforming creative industries'
+
+
+def test_content_words_drop_stopwords_and_stem():
+    assert content_words(TOPIC) == ['ai', 'transform', 'creative', 'industr']
+
+
+def test_rewordings_match_and_unrelated_topics_do_not():
+    index = TopicIndex(threshold=0.8)
+    index.add(TOPIC)
+
+    assert index.nearest('How AI is transforming the creative industries') == (TOPIC, 1.0)
+    assert index.nearest('AI transforming the creative industry') == (TOPIC, 1.0)
+    assert index.nearest('Quantum computing for drug discovery') is None
+    assert index.similar(TOPIC) == []  # Never matches itself
+
+
+def test_threshold_decides_borderline_matches():
+    loose, strict = TopicIndex(threshold=0.7), TopicIndex(threshold=0.8)
+    for index in (loose, strict):
+        index.add(TOPIC)
+
+    match = loose.nearest('creative industries and AI')
+    assert match is not None and 0.7 <= match[1] < 0.8
+    assert strict.nearest('creative industries and AI') is None
+
+
+def test_oldest_topics_are_evicted():
+    index = TopicIndex(max_topics=2)
+    for topic in ('solar power storage', 'deep sea mining', 'urban beekeeping'):
+        index.add(topic)
+
+    assert len(index) == 2
+    assert index.nearest('solar power storage!') is None
+    assert index.nearest('urban beekeeping!') == ('urban beekeeping', 1.0)
+
+    index.discard('urban beekeeping')
+    assert index.nearest('urban beekeeping!') is None
+
+
+def test_bands_must_divide_the_signature():
+    with pytest.raises(ValueError):
+        TopicIndex(num_perm=30, bands=8)
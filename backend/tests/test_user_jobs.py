@@ -0,0 +1,44 @@
+import time
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_each_request_is_its_own_job_with_its_own_status(load_app):
+    app = load_app(MAX_CONCURRENT_JOBS='2')
+    client, stranger = app.app.test_client(), app.app.test_client()
+    topics = ['AI in music', 'AI in film']
+
+    job_ids = [client.post('/api/generate-content', json={'topic': topic}).get_json()['job_id']
+               for topic in topics]
+
+    def finished():
+        jobs = client.get('/api/jobs').get_json()['jobs']
+        return len(jobs) == 2 and not any(job['is_processing'] for job in jobs)
+
+    assert len(set(job_ids)) == 2
+    assert wait_for(finished)
+    for job_id, topic in zip(job_ids, topics):
+        status = client.get(f'/api/jobs/{job_id}/status').get_json()
+        assert status['topic'] == topic
+        assert status['final_result']
+        assert stranger.get(f'/api/jobs/{job_id}/status').status_code == 404
+    assert stranger.get('/api/jobs').get_json()['jobs'] == []
+
+
+def test_a_user_may_only_run_so_many_jobs_at_once(load_app):
+    app = load_app(MAX_JOBS_PER_USER='1')
+    client = app.app.test_client()
+
+    first = client.post('/api/generate-content', json={'topic': 'AI in music'})
+    second = client.post('/api/generate-content', json={'topic': 'AI in film'})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.get_json()['active_jobs'] == [first.get_json()['job_id']]
@@ -0,0 +1,154 @@
+"""Near-duplicate index over previously processed topics.
+
+Topics are reduced to a set of shingles (stemmed words plus their character
+trigrams), sketched with one-permutation MinHash and bucketed with LSH
+banding, so "How AI is transforming creative industries" and "AI
+transforming the creative industry" land on the same candidates without
+comparing against every stored topic. Everything is local; no network or
+embedding model is involved.
+"""
+import hashlib
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+_WORD = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(
+    'a an and are about as at be by for from how in into is it its of on or '
+    'the their this to what when why with will'.split()
+)
+_SUFFIXES = ('ies', 'ing', 'es', 'ed', 's', 'y')
+_MAX_HASH = (1 << 64) - 1
+
+
+def _stem(word):
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def content_words(text: str) -> List[str]:
+    """Stemmed words of ``text`` without stopwords, in order"""
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def topic_shingles(topic: str) -> set:
+    """Order-insensitive shingles: stemmed content words and their trigrams"""
+    shingles = set()
+    for word in content_words(topic):
+        shingles.add(word)
+        padded = f'#{word}#'
+        shingles.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return shingles
+
+
+class TopicIndex:
+    """Bounded MinHash/LSH index mapping topics to their nearest stored neighbours.
+
+    ``num_perm`` must be divisible by ``bands``; with the defaults (32 slots,
+    8 bands of 4 rows) pairs above roughly 0.6 Jaccard similarity almost
+    always share a bucket. Candidates are then ranked by signature agreement
+    and filtered by ``threshold``. The oldest topics are evicted once
+    ``max_topics`` is reached.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_topics: int = 10000,
+                 num_perm: int = 32, bands: int = 8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.max_topics = max_topics
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._topics = OrderedDict()  # topic -> signature (array of uint32)
+        self._buckets = [{} for _ in range(bands)]  # band -> {band hash: set(topics)}
+        self._lock = threading.Lock()
+
+    def signature(self, topic: str) -> array:
+        """One-permutation MinHash sketch of a topic, densified by rotation"""
+        slots = [_MAX_HASH] * self.num_perm
+        for shingle in topic_shingles(topic):
+            value = int.from_bytes(
+                hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little'
+            )
+            slot = value % self.num_perm
+            if value < slots[slot]:
+                slots[slot] = value
+
+        # Fill empty slots from the next non-empty one so every band is usable
+        filled = [i for i, value in enumerate(slots) if value != _MAX_HASH]
+        if filled and len(filled) < self.num_perm:
+            for i in range(self.num_perm):
+                if slots[i] == _MAX_HASH:
+                    donor = next((j for j in filled if j > i), filled[0])
+                    offset = (donor - i) % self.num_perm
+                    slots[i] = (slots[donor] + (offset << 40)) & _MAX_HASH
+        return array('I', (value >> 32 for value in slots))
+
+    def add(self, topic: str):
+        """Index a topic, evicting the oldest ones beyond ``max_topics``"""
+        signature = self.signature(topic)
+        with self._lock:
+            if topic in self._topics:
+                self._topics.move_to_end(topic)
+                return
+            self._topics[topic] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(topic)
+            while len(self._topics) > self.max_topics:
+                self._evict_oldest()
+
+    def discard(self, topic: str):
+        """Remove a topic from the index if present"""
+        with self._lock:
+            signature = self._topics.pop(topic, None)
+            if signature is not None:
+                self._unbucket(topic, signature)
+
+    def similar(self, topic: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Stored topics at or above ``threshold``, best first, excluding ``topic`` itself"""
+        signature = self.signature(topic)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(topic)
+            scored = []
+            for candidate in candidates:
+                other = self._topics[candidate]
+                score = sum(a == b for a, b in zip(signature, other)) / self.num_perm
+                if score >= self.threshold:
+                    scored.append((candidate, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def nearest(self, topic: str) -> Optional[Tuple[str, float]]:
+        """The single most similar stored topic, or None"""
+        matches = self.similar(topic, limit=1)
+        return matches[0] if matches else None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._topics)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [hash(signature[band * rows:(band + 1) * rows].tobytes())
+                for band in range(self.bands)]
+
+    def _evict_oldest(self):
+        # Called with the lock held
+        topic, signature = self._topics.popitem(last=False)
+        self._unbucket(topic, signature)
+
+    def _unbucket(self, topic, signature):
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(topic)
+                if not bucket:
+                    del self._buckets[band][key]
@@ -4,6 +4,7 @@ import TopicInput from './components/TopicInput'
 import AgentGrid from './components/AgentGrid'
 import ProcessFlow from './components/ProcessFlow'
 import { aiService } from './api/aiService'
+import { applyStreamMessage } from './api/streamDelta'
 
 function App() {
   const [topic, setTopic] = useState('How AI is transforming creative industries')
@@ -17,6 +18,8 @@ function App() {
   const [agentThoughts, setAgentThoughts] = useState({})
 
   const eventSourceRef = useRef(null)
+  const streamedTextRef = useRef({}) // Text streamed so far, keyed by step and agent
+  const streamStateRef = useRef({}) // Status rebuilt from delta-encoded stream messages
 
   // Handle Server-Sent Events for real-time updates
   useEffect(() => {
@@ -42,7 +45,7 @@ function App() {
       
       // Create EventSource URL using the same base URL logic as aiService
       const baseUrl = window.location.hostname === 'localhost' ? 'http://localhost:5001' : 'https://ai-editorial-team.onrender.com'
-      const streamUrl = `${baseUrl}/api/stream?user_id=${userId}`
+      const streamUrl = `${baseUrl}/api/stream?user_id=${userId}&delta=1`
       console.log('📡 EventSource URL:', streamUrl)
       
       // Create EventSource directly
@@ -55,7 +58,19 @@ function App() {
         
         eventSourceRef.current.onmessage = (event) => {
           try {
-            const data = JSON.parse(event.data)
+            const data = applyStreamMessage(streamStateRef.current, JSON.parse(event.data))
+            
+            // Token chunks: show the tail of the agent's live output
+            if (data.event === 'token') {
+              const key = `${data.current_step}:${data.current_agent}`
+              const streamed = (streamedTextRef.current[key] || '') + data.token
+              streamedTextRef.current[key] = streamed
+              setCurrentStep(data.current_step)
+              setCurrentAgent(data.current_agent)
+              setCurrentThought(`${data.current_agent}: ${streamed.slice(-150)}`)
+              return
+            }
+            
             console.log('🔴 Received SSE data:', data)  // Debug log
             
             if (data.current_step !== undefined) {
@@ -118,6 +133,8 @@ function App() {
     setCurrentAgent(null)
     setCurrentThought(null)
     setAgentThoughts({})
+    streamedTextRef.current = {}
+    streamStateRef.current = {}
     
     // Set processing to true IMMEDIATELY for visual feedback
     setIsProcessing(true)
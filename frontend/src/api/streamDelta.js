@@ -0,0 +1,36 @@
+// Decoder for the delta SSE protocol (/api/stream?delta=1)
+// The server sends one snapshot, then patches with only the fields that changed
+
+// Apply one stream message to the running state and return the full update
+export const applyStreamMessage = (state, message) => {
+  const { snapshot, delta, ...flags } = message
+
+  if (snapshot) {
+    for (const field of Object.keys(state)) delete state[field]
+    Object.assign(state, snapshot)
+  }
+
+  if (delta) {
+    Object.assign(state, delta.set || {})
+
+    for (const [field, suffix] of Object.entries(delta.append || {})) {
+      state[field] = (state[field] || '') + suffix
+    }
+
+    for (const [field, changes] of Object.entries(delta.merge || {})) {
+      const merged = { ...(state[field] || {}) }
+      for (const [key, value] of Object.entries(changes)) {
+        if (value === null) {
+          delete merged[key]
+        } else {
+          merged[key] = value
+        }
+      }
+      state[field] = merged
+    }
+  }
+
+  return { ...state, ...flags }
+}
+
+export default applyStreamMessage
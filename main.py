@@ -2,6 +2,11 @@ from crewai import Agent, Task, Crew
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 import os
+import sys
+
+# The backend's task graph runner schedules the dag mode's stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from taskgraph import run_task_graph
 
 # Load environment variables
 load_dotenv()
@@ -50,6 +55,12 @@ tweeter = Agent(
 # Choose a topic
 topic = "How AI is transforming creative industries"
 
+# 'dag' writes the tweet from the draft while the Editor works. One Crew runs
+# its tasks one at a time, so in dag mode each task runs as its own crew and
+# the task graph starts the edit and the tweet together once the draft exists
+pipeline_mode = os.getenv("PIPELINE_MODE", "sequential").lower()
+dag = pipeline_mode == "dag"
+
 # Define tasks with expected outputs
 task1 = Task(
     description=f"Research the topic: {topic}",
@@ -60,29 +71,44 @@ task1 = Task(
 task2 = Task(
     description="Write a 400-word article based on the research",
     expected_output="A complete article, written in natural language, based on the research insights.",
-    agent=writer
+    agent=writer,
+    **({"context": [task1]} if dag else {})
 )
 
 task3 = Task(
     description="Edit the article so it's twice as clear in terms of tone and structure",
     expected_output="A refined version of the article with improved tone and readability.",
-    agent=editor
+    agent=editor,
+    # Without an explicit context CrewAI hands each task the previous task's output
+    **({"context": [task2]} if dag else {})
 )
 
 task4 = Task(
     description="Summarise the article in a single tweet (max 280 characters)",
     expected_output="A concise, engaging tweet that captures the article's core idea.",
-    agent=tweeter
+    agent=tweeter,
+    **({"context": [task2]} if dag else {})
 )
 
-# Create the Crew
-crew = Crew(
-    agents=[researcher, writer, editor, tweeter],
-    tasks=[task1, task2, task3, task4],
-    verbose=True
-)
+if dag:
+    # Each task reads its context from the earlier tasks' outputs, so they can run as separate crews
+    tasks = {"research": task1, "article": task2, "edited": task3, "tweet": task4}
+    graph = {"research": [], "article": ["research"], "edited": ["article"], "tweet": ["article"]}
+    outputs = run_task_graph(graph, lambda key, inputs: Crew(
+        agents=[tasks[key].agent], tasks=[tasks[key]], verbose=True).kickoff())
+    print("\n\n✅ Edited Article:\n")
+    print(outputs["edited"])
+    print("\n\n✅ Tweet:\n")
+    print(outputs["tweet"])
+else:
+    # Create the Crew
+    crew = Crew(
+        agents=[researcher, writer, editor, tweeter],
+        tasks=[task1, task2, task3, task4],
+        verbose=True
+    )
 
-# Run the crew
-result = crew.kickoff()
-print("\n\n✅ Final Output:\n")
-print(result)
+    # Run the crew
+    result = crew.kickoff()
+    print("\n\n✅ Final Output:\n")
+    print(result)